@@ -11,6 +11,7 @@ TRANSACTION_SERVICE_SUBSCRIPTION_KEY = "your_transaction_service_key_here"
 TRANSACTION_DELETE_URL = f"{TRANSACTION_SERVICE_BASE_URL}/Transactions"
 TRANSACTION_ADD_URL = f"{TRANSACTION_SERVICE_BASE_URL}/Transactions/add"
 TRANSACTION_USER_URL = f"{TRANSACTION_SERVICE_BASE_URL}/Transactions/user/{{user_id}}"
+TRANSACTION_GET_URL = f"{TRANSACTION_SERVICE_BASE_URL}/Transactions"
 
 # For Report Service
 REPORT_MONTHLY_SUMMARY_URL = f"{REPORT_SERVICE_BASE_URL}/Report/monthly-summary"
@@ -18,4 +19,81 @@ REPORT_CUSTOM_RANGE_URL = f"{REPORT_SERVICE_BASE_URL}/Report/custom-date-range"
 
 # For User Profile
 USER_PROFILE_URL = f"{USER_BASE_API_URL}/Users/profile"
-USER_PASSWORD_CHANGE_URL = f"{USER_BASE_API_URL}/Users/change-password"
\ No newline at end of file
+USER_PASSWORD_CHANGE_URL = f"{USER_BASE_API_URL}/Users/change-password"
+USER_PROFILE_UPDATE_URL = f"{USER_BASE_API_URL}/Users/update-profile"
+
+# HTTP connection pooling (optional)
+HTTP_POOL_CONNECTIONS = 4  # Number of per-host pools kept by the shared session
+HTTP_POOL_MAXSIZE = 8  # Keep-alive connections retained per host
+PREWARM_CONNECTIONS_PER_HOST = 2  # Connections opened to each service host at app start
+
+# Background work (optional)
+MAX_WORKER_THREADS = 6  # Upper bound on threads used for API calls and other background tasks
+
+# Request timeouts (optional)
+DEFAULT_REQUEST_TIMEOUT = (3.05, 15)  # (connect, read) seconds
+REQUEST_TIMEOUTS = {  # Per-endpoint overrides, keyed by name in services/endpoints.py
+    "transactions_user": (3.05, 30),
+    "report_custom": (3.05, 30),
+}
+ACTION_DEADLINE_SECONDS = 30  # Overall budget of one user action, including retries
+
+# Retries and circuit breaker (optional)
+RETRY_MAX_ATTEMPTS = 3  # Attempts per request, including the first
+RETRY_BASE_DELAY = 0.5  # Seconds; doubled per retry, with full jitter
+RETRY_MAX_DELAY = 8.0  # Upper bound of a single backoff delay
+BREAKER_FAILURE_THRESHOLD = 5  # Consecutive failures before a host is short-circuited
+BREAKER_RECOVERY_SECONDS = 30.0  # How long a host fails fast before a trial request
+
+# Client-side rate limiting per subscription key (optional)
+RATE_LIMIT_DEFAULT = (5.0, 10)  # (requests per second, burst size)
+RATE_LIMITS = {  # Overrides keyed by subscription key, e.g. to match the API gateway quota
+    # TRANSACTION_SERVICE_SUBSCRIPTION_KEY: (10.0, 20),
+}
+
+# Request scheduling (optional): interactive requests are admitted before queued background ones
+MAX_CONCURRENT_REQUESTS = 6  # Requests in flight across all lanes
+REQUEST_LANE_LIMITS = {"interactive": 4, "normal": 3, "background": 2}  # Per-lane concurrency caps
+BULK_REQUEST_THREADS = 6  # Threads shared by bulk deletes and statement imports to send their requests
+
+# Change event batching (optional): a burst of changes within the debounce window causes one refresh
+EVENT_DEBOUNCE_MS = 150  # Quiet period before a batch of change events is delivered
+EVENT_MAX_DELAY_MS = 1000  # Upper bound on how long a change event may be held back
+
+# Offline outbox for new transactions (optional)
+OUTBOX_PATH = "outbox.jsonl"  # Journal of transactions not yet stored on the server
+OUTBOX_BATCH_SIZE = 10  # Transactions sent per background flush
+OUTBOX_RETRY_SECONDS = 5  # First retry delay while the service is unreachable; doubled per retry
+OUTBOX_MAX_RETRY_SECONDS = 300
+
+# Bulk delete (optional)
+BULK_DELETE_CONCURRENCY = 4  # DELETE requests in flight at once when deleting selected transactions
+BULK_DELETE_DEADLINE_SECONDS = 120  # Budget of one bulk delete; deletes not sent by then fail with a timeout
+
+# Statement import (optional)
+IMPORT_BATCH_SIZE = 25  # Rows per upload batch; the checkpoint is saved after each batch
+IMPORT_CONCURRENCY = 3  # Batches uploaded at once
+IMPORT_CHECKPOINT_DIR = "import_checkpoints"  # Progress of unfinished imports, for resuming
+
+# Export (optional)
+EXPORT_PAGE_SIZE = 500  # Transactions fetched per page when exporting the full history
+
+# Transaction memory budget (optional)
+STORE_MAX_ROWS = 50000  # Rows of the newest months kept in memory; older months keep only their totals
+
+# Month-scoped fetching (optional): the dashboard fetches only the selected month instead of the full history
+FETCH_TRANSACTIONS_BY_MONTH = False  # Send the month filter to the server as a date range
+MONTH_PAGE_SIZE = 200  # Transactions fetched per page of a month
+MONTH_CACHE_MAX_ROWS = 20000  # Transactions kept in memory across fetched months; least recently used go first
+MONTH_CACHE_RECENT_MONTHS = 3  # Most recent months that are never evicted
+
+# Lean transaction list (optional): the list endpoint returns only the fields the dashboard shows
+# Descriptions are then fetched when a transaction is opened. Unless TRANSACTION_LIST_FIELDS
+# includes "description", search only matches categories and duplicate checks are turned off.
+LEAN_TRANSACTION_LIST = False
+TRANSACTION_LIST_FIELDS = ("id", "transactionType", "amount", "date", "category")  # Sent as the fields parameter
+
+# Streaming transaction fetch (optional): the history is parsed and shown while it downloads
+STREAM_TRANSACTIONS = True  # Set to False to parse the whole response at once
+STREAM_FIRST_CHUNK_ROWS = 50  # Rows shown before the rest of the history has arrived
+STREAM_CHUNK_ROWS = 1000  # Rows added to the dashboard per update after the first chunk
@@ -1,8 +1,10 @@
 import logging
-from PySide6.QtWidgets import QApplication, QMainWindow, QStackedWidget
+from PySide6.QtCore import Signal
+from PySide6.QtWidgets import QApplication, QMainWindow, QStackedWidget, QMessageBox
 from views.Transaction_Details_View import TransactionDetailsView
 from views.add_transaction_view import AddTransactionView
 from views.forget_password_view import ForgotPasswordView
+from views.import_view import ImportTransactionsView
 from views.main_page import MainPage
 from views.register_view import RegisterView
 from views.message_view import MessageView
@@ -11,6 +13,15 @@ from views.report_view import ReportView
 from views.user_profile_view import UserProfileView
 from utils.storage_utils import save_token, load_token, delete_token
 from utils.jwt_utils import is_token_valid
+from services.http_client import prewarm_connections
+from services.request_scheduler import get_scheduler
+from services.resilience import add_state_listener, CircuitBreaker
+from utils.cache_utils import data_cache, month_cache
+from utils.event_bus import get_event_bus
+from utils.outbox import Outbox
+from utils.post_login_warmup import PostLoginWarmup
+from utils.transaction_store import TransactionStore
+from utils.task_executor import get_executor, TaskPriority
 from appconfig import TRANSACTION_SERVICE_SUBSCRIPTION_KEY
 import logging_config
 
@@ -20,6 +31,8 @@ logger = logging.getLogger(__name__)
 
 
 class MainWindow(QMainWindow):
+    breaker_state_changed = Signal(str, str)  # host, circuit breaker state
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Expense Tracker")
@@ -30,6 +43,12 @@ class MainWindow(QMainWindow):
         self.username = None
         self.subscription_key = TRANSACTION_SERVICE_SUBSCRIPTION_KEY
 
+        # Transactions shared by the dashboard and the views that add or delete them
+        self.transaction_store = TransactionStore(self)
+        # New transactions are journaled and sent in the background, surviving outages and restarts
+        self.outbox = Outbox(self.transaction_store, parent=self)
+        self.outbox.rejected.connect(self.on_outbox_rejected)
+
         # Initialize QStackedWidget for managing multiple views
         self.stacked_widget = QStackedWidget(self)
         self.setCentralWidget(self.stacked_widget)
@@ -42,6 +61,7 @@ class MainWindow(QMainWindow):
             "forgot_password_view": ForgotPasswordView(self),
             "content_view": ContentView(self),
             "add_transaction_view": AddTransactionView(self),
+            "import_view": None,
             "transaction_details_view": None,
             "report_view": ReportView(self),
             "user_profile_view": None,
@@ -50,8 +70,19 @@ class MainWindow(QMainWindow):
         # Add pre-initialized views to the stacked widget
         for view_name, view_instance in self.views.items():
             if view_instance:
-                self.stacked_widget.addWidget(view_instance)
-                logger.debug(f"Added view '{view_name}' to the stacked widget.")
+                self.add_view(view_name, view_instance)
+
+        # Post-login warm-up loads dashboard, profile and report data concurrently
+        self.warmup = PostLoginWarmup(self)
+        self.warmup.transactions_ready.connect(self.views["content_view"].load_transactions)
+        self.warmup.transactions_streamed.connect(self.views["content_view"].append_transactions)
+        self.warmup.profile_ready.connect(self.on_profile_warmed)
+        self.warmup.load_failed.connect(self.on_warmup_failed)
+
+        # Circuit breaker changes arrive on worker threads; the signal hands them to the GUI thread
+        self.unavailable_hosts = {}
+        self.breaker_state_changed.connect(self.on_breaker_state_changed)
+        add_state_listener(self.breaker_state_changed.emit)
 
         self.jwt_token = load_token()
 
@@ -78,20 +109,44 @@ class MainWindow(QMainWindow):
     def logout_user(self):
         logger.info("Logging out user by deleting token.")
         delete_token()
+        self.warmup.cancel()
+        self.outbox.stop()
+        get_event_bus().discard_pending()
+        data_cache.clear()
+        month_cache.clear()
+        self.transaction_store.clear()
         self.jwt_token = None
         self.show_main_page()
 
+    def add_view(self, view_name, view):
+        """Register a view, add it to the stacked widget and wire its signals."""
+        self.views[view_name] = view
+        self.stacked_widget.addWidget(view)
+        self.connect_view_signals(view_name, view)
+        logger.debug(f"Added view '{view_name}' to the stacked widget.")
+
+    def connect_view_signals(self, view_name, view):
+        """
+        Connect the refresh triggers of a view.
+
+        This is the only place view signals and event bus subscriptions are wired, and it
+        runs once per view instance, so each change causes exactly one refresh however
+        often the view is shown. Mutating views publish ChangeEvents on the bus instead.
+        """
+        if view_name == "content_view":
+            logger.debug("Subscribing ContentView to transaction changes.")
+            get_event_bus().subscribe("transactions", view.on_transactions_changed)
+            self.outbox.pending_changed.connect(view.show_outbox_count)
+        elif view_name == "report_view":
+            logger.debug("Subscribing ReportView to transaction changes.")
+            get_event_bus().subscribe("transactions", view.on_transactions_changed)
+
     def switch_to_view(self, view_name):
-        """Switch to a specific view and connect signals dynamically."""
+        """Switch to a specific view."""
         logger.debug(f"Attempting to switch to view '{view_name}'.")
         if view_name in self.views:
             view = self.views[view_name]
             if view:
-                # Dynamically connect signals for specific views
-                if view_name == "add_transaction_view" and isinstance(view, AddTransactionView):
-                    logger.debug("Connecting 'transaction_added' signal to 'fetch_all_transactions'.")
-                    view.transaction_added.connect(self.views["content_view"].fetch_all_transactions)
-
                 self.stacked_widget.setCurrentWidget(view)
                 logger.info(f"Switched to view '{view_name}'.")
             else:
@@ -104,8 +159,7 @@ class MainWindow(QMainWindow):
         logger.debug("Displaying the main page.")
         if not self.views["main_page"]:
             logger.info("Initializing MainPage view.")
-            self.views["main_page"] = MainPage(self)
-            self.stacked_widget.addWidget(self.views["main_page"])
+            self.add_view("main_page", MainPage(self))
             logger.debug("MainPage view initialized and added to the stacked widget.")
         self.switch_to_view("main_page")
 
@@ -119,8 +173,7 @@ class MainWindow(QMainWindow):
         logger.debug("Displaying the message view.")
         if not self.views["message_view"]:
             logger.info("Initializing MessageView.")
-            self.views["message_view"] = MessageView(message, self)
-            self.stacked_widget.addWidget(self.views["message_view"])
+            self.add_view("message_view", MessageView(message, self))
             logger.debug("MessageView initialized and added to the stacked widget.")
         self.views["message_view"].set_message(message)
         logger.debug("Message updated in MessageView.")
@@ -136,8 +189,7 @@ class MainWindow(QMainWindow):
         logger.debug("Displaying the content view.")
         if not self.views["content_view"]:
             logger.info("Initializing ContentView with user details.")
-            self.views["content_view"] = ContentView(self, user_id=self.user_id, username=self.username)
-            self.stacked_widget.addWidget(self.views["content_view"])
+            self.add_view("content_view", ContentView(self, user_id=self.user_id, username=self.username))
             logger.debug("ContentView initialized and added to the stacked widget.")
         self.stacked_widget.setCurrentWidget(self.views["content_view"])
         logger.info("Switched to content view.")
@@ -152,32 +204,73 @@ class MainWindow(QMainWindow):
 
         if self.views["content_view"] is None:
             logger.info("Creating ContentView after login.")
-            self.views["content_view"] = ContentView(self, user_id=self.user_id, username=self.username)
-            self.stacked_widget.addWidget(self.views["content_view"])
+            self.add_view("content_view", ContentView(self, user_id=self.user_id, username=self.username))
             logger.debug("ContentView created and added successfully.")
         else:
             logger.info("Updating existing ContentView with new user info.")
-            self.views["content_view"].update_user_info(user_id, jwt_token)
+            self.views["content_view"].update_user_info(user_id, jwt_token, fetch=False)
             logger.debug("ContentView user info updated.")
 
-        # Switch to ContentView
+        # Switch to ContentView and load its data together with profile and report data
         self.show_content_view()
+        self.warmup.start(user_id, username, jwt_token, self.subscription_key)
+        self.outbox.start(user_id, jwt_token, self.subscription_key)
+
+    def on_profile_warmed(self, profile):
+        """Refresh an already created profile view with the warmed-up profile."""
+        profile_view = self.views["user_profile_view"]
+        if profile_view and profile.get("username") == self.username:
+            logger.debug("Populating UserProfileView from warm-up result.")
+            profile_view.populate_fields(profile)
+
+    def on_warmup_failed(self, resource, message):
+        """Handle a failed warm-up fetch; only the dashboard data is shown to the user."""
+        logger.warning(f"Warm-up of '{resource}' failed: {message}")
+        if resource == "transactions":
+            self.views["content_view"].show_fetch_error(message)
+
+    def on_outbox_rejected(self, message):
+        """Tell the user a queued transaction was refused by the server and removed."""
+        logger.warning(f"Queued transaction rejected: {message}")
+        QMessageBox.warning(self, "Transaction not saved", message)
+
+    def on_breaker_state_changed(self, host, state):
+        """Show which backends are failing fast in the status bar."""
+        if state == CircuitBreaker.CLOSED:
+            self.unavailable_hosts.pop(host, None)
+            self.outbox.flush()  # connectivity is back; send queued transactions now
+        else:
+            self.unavailable_hosts[host] = state
+        if self.unavailable_hosts:
+            hosts = ", ".join(
+                f"{h} ({'checking' if st == CircuitBreaker.HALF_OPEN else 'unavailable'})"
+                for h, st in self.unavailable_hosts.items()
+            )
+            self.statusBar().showMessage(f"Service problems: {hosts}")
+            self.statusBar().setStyleSheet("color: #d9534f;")
+        else:
+            self.statusBar().clearMessage()
+            logger.info("All services reachable again.")
 
     def show_add_transaction_view(self):
         """Display the add transaction view."""
         logger.debug("Displaying the add transaction view.")
         self.switch_to_view("add_transaction_view")
 
+    def show_import_view(self):
+        """Display the statement import view."""
+        logger.debug("Displaying the import view.")
+        if not self.views["import_view"]:
+            logger.info("Initializing ImportTransactionsView.")
+            self.add_view("import_view", ImportTransactionsView(self))
+        self.switch_to_view("import_view")
+
     def show_transaction_details_view(self, transaction_data):
         """Display details of a specific transaction."""
         logger.debug("Displaying the transaction details view.")
         if not self.views["transaction_details_view"]:
             logger.info("Initializing TransactionDetailsView.")
-            self.views["transaction_details_view"] = TransactionDetailsView(self, transaction_data)
-            self.views["transaction_details_view"].transaction_deleted.connect(
-                self.views["content_view"].fetch_all_transactions
-            )
-            self.stacked_widget.addWidget(self.views["transaction_details_view"])
+            self.add_view("transaction_details_view", TransactionDetailsView(self, transaction_data))
             logger.debug("TransactionDetailsView initialized and added to the stacked widget.")
         else:
             logger.info("Updating existing TransactionDetailsView with new data.")
@@ -196,19 +289,20 @@ class MainWindow(QMainWindow):
         logger.debug("Displaying the user profile view.")
         if not self.views["user_profile_view"]:
             logger.info("Initializing UserProfileView.")
-            self.views["user_profile_view"] = UserProfileView(self, user_id=self.user_id, username=self.username)
-            self.stacked_widget.addWidget(self.views["user_profile_view"])
+            self.add_view("user_profile_view", UserProfileView(self, user_id=self.user_id, username=self.username))
             logger.debug("UserProfileView initialized and added to the stacked widget.")
         else:
             # Reset fields state each time the view is reopened
             logger.info("Resetting UserProfileView fields.")
-            self.views["user_profile_view"].reset_fields_state()
+            self.views["user_profile_view"].load_profile()
             logger.debug("UserProfileView fields reset.")
         self.switch_to_view("user_profile_view")
 
 def main():
     logger.info("Starting the Expense Tracker application.")
     app = QApplication([])
+    # Open connections to the backend hosts while the user is typing credentials
+    get_executor().submit("prewarm_connections", prewarm_connections, priority=TaskPriority.BACKGROUND)
     app.setStyleSheet("""
         /* Global styles */
         QMainWindow {
@@ -256,6 +350,9 @@ def main():
     window.show()
     logger.info("Application window displayed.")
     app.exec()
+    get_executor().shutdown()
+    get_scheduler().log_stats()
+    month_cache.log_stats(store_rows=len(window.transaction_store.transactions))
     logger.info("Expense Tracker application has exited.")
 
 
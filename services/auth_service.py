@@ -1,15 +1,14 @@
 import logging
-import requests
-from appconfig import USER_BASE_API_URL, USER_SERVICE_SUBSCRIPTION_KEY
+from services.http_client import api_request
+from appconfig import USER_SERVICE_SUBSCRIPTION_KEY
 
 logger = logging.getLogger(__name__)
 
 
-def login_user(username, password):
+def login_user(username, password, deadline=None):
     """
     Perform user login and return success status, message, and token.
     """
-    api_url = f"{USER_BASE_API_URL}/Users/login"
     headers = {
         "Content-Type": "application/json",
         "Ocp-Apim-Subscription-Key": USER_SERVICE_SUBSCRIPTION_KEY
@@ -17,8 +16,8 @@ def login_user(username, password):
     payload = {"username": username, "password": password}
 
     try:
-        logger.debug(f"Sending login request to {api_url} with username: {username}")
-        response = requests.post(api_url, headers=headers, json=payload)
+        logger.debug(f"Sending login request with username: {username}")
+        response = api_request("login", "POST", deadline=deadline, headers=headers, json=payload)
         if response.status_code == 200:
             logger.info("Login successful.")
             try:
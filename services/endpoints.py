@@ -0,0 +1,59 @@
+import logging
+
+import appconfig
+
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeouts in seconds; override per endpoint with appconfig.REQUEST_TIMEOUTS
+DEFAULT_TIMEOUT = getattr(appconfig, "DEFAULT_REQUEST_TIMEOUT", (3.05, 15))
+REQUEST_TIMEOUTS = getattr(appconfig, "REQUEST_TIMEOUTS", {})
+
+# Overall time budget of one user action, including any retries
+ACTION_DEADLINE_SECONDS = getattr(appconfig, "ACTION_DEADLINE_SECONDS", 30)
+
+
+class Endpoint:
+    """A backend API endpoint with its URL template and timeouts."""
+
+    def __init__(self, name, url, service, timeout=None):
+        self.name = name
+        self.url = url
+        self.service = service
+        self.timeout = tuple(REQUEST_TIMEOUTS.get(name, timeout or DEFAULT_TIMEOUT))
+
+    def format_url(self, **path_params):
+        """Fill the path parameters of the URL template, e.g. {user_id}."""
+        return self.url.format(**path_params)
+
+    def __repr__(self):
+        return f"Endpoint({self.name!r}, {self.url!r}, timeout={self.timeout})"
+
+
+_USER_BASE = appconfig.USER_BASE_API_URL
+
+ENDPOINTS = {endpoint.name: endpoint for endpoint in [
+    Endpoint("login", f"{_USER_BASE}/Users/login", "user service", timeout=(3.05, 10)),
+    Endpoint("register", f"{_USER_BASE}/Users/register", "user service"),
+    Endpoint("password_reset", f"{_USER_BASE}/Users/request-password-reset", "user service"),
+    Endpoint("user_profile", appconfig.USER_PROFILE_URL, "user service", timeout=(3.05, 10)),
+    Endpoint("user_profile_update",
+             getattr(appconfig, "USER_PROFILE_UPDATE_URL", f"{_USER_BASE}/Users/update-profile"), "user service"),
+    Endpoint("password_change", appconfig.USER_PASSWORD_CHANGE_URL, "user service"),
+    Endpoint("transactions_user", appconfig.TRANSACTION_USER_URL, "transaction service", timeout=(3.05, 30)),
+    Endpoint("transaction_get",
+             f"{getattr(appconfig, 'TRANSACTION_GET_URL', appconfig.TRANSACTION_DELETE_URL)}/{{transaction_id}}",
+             "transaction service", timeout=(3.05, 10)),
+    Endpoint("transaction_add", appconfig.TRANSACTION_ADD_URL, "transaction service"),
+    Endpoint("transaction_delete", f"{appconfig.TRANSACTION_DELETE_URL}/{{transaction_id}}", "transaction service"),
+    Endpoint("report_monthly", appconfig.REPORT_MONTHLY_SUMMARY_URL, "report service"),
+    Endpoint("report_custom", appconfig.REPORT_CUSTOM_RANGE_URL, "report service", timeout=(3.05, 30)),
+]}
+
+
+def get_endpoint(name):
+    """Look up a registered endpoint by name."""
+    try:
+        return ENDPOINTS[name]
+    except KeyError:
+        logger.error(f"Unknown API endpoint '{name}'")
+        raise
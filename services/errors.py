@@ -0,0 +1,27 @@
+import requests
+
+
+class ApiError(requests.exceptions.RequestException):
+    """Base class for errors raised by the client layer."""
+
+
+class RequestTimeoutError(ApiError):
+    """A request or the user action it belongs to ran out of time."""
+
+    def __init__(self, endpoint, detail=""):
+        self.endpoint = endpoint
+        super().__init__(
+            f"The {endpoint.service} did not respond in time. Please try again."
+            + (f" ({detail})" if detail else "")
+        )
+
+
+class CircuitOpenError(ApiError):
+    """Requests to a host are short-circuited because it keeps failing."""
+
+    def __init__(self, endpoint, retry_in):
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+        super().__init__(
+            f"The {endpoint.service} is currently unavailable. Please try again in {int(retry_in) + 1}s."
+        )
@@ -0,0 +1,343 @@
+import copy
+import json
+import logging
+import select
+import socket
+import ssl
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import appconfig
+from services.endpoints import get_endpoint, ACTION_DEADLINE_SECONDS
+from services.errors import RequestTimeoutError, CircuitOpenError
+from services import rate_limiter
+from services.request_scheduler import get_scheduler, current_lane
+from services.resilience import RetryPolicy, IDEMPOTENT_METHODS, UNAVAILABLE_STATUSES, get_breaker, retry_after_seconds
+
+logger = logging.getLogger(__name__)
+
+POOL_CONNECTIONS = getattr(appconfig, "HTTP_POOL_CONNECTIONS", 4)
+POOL_MAXSIZE = getattr(appconfig, "HTTP_POOL_MAXSIZE", 8)
+PREWARM_CONNECTIONS_PER_HOST = getattr(appconfig, "PREWARM_CONNECTIONS_PER_HOST", 2)
+PREWARM_CONNECT_TIMEOUT = 5
+
+_session = None
+_session_lock = threading.Lock()
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+class Deadline:
+    """Overall time budget of a user action, shared by all requests made for it."""
+
+    def __init__(self, seconds=ACTION_DEADLINE_SECONDS):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        """Seconds left before the deadline (never negative)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+
+def get_session():
+    """Return the process-wide requests session with pooled keep-alive connections."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+            logger.debug(f"Created shared HTTP session (pools={POOL_CONNECTIONS}, maxsize={POOL_MAXSIZE}).")
+        return _session
+
+
+def api_request(endpoint_name, method="GET", path_params=None, deadline=None, idempotent=None,
+                retry_policy=None, lane=None, idempotency_key=None, **kwargs):
+    """
+    Send a request to a registered endpoint through the resilience layer.
+
+    Every attempt first takes a token from the rate limiter of its subscription key, so
+    bursts are spread out instead of exceeding the API gateway quota, and then waits for
+    a slot in its request scheduler lane so interactive requests go ahead of background
+    ones. Each attempt uses the endpoint's connect/read timeouts capped by the remaining
+    time of the action deadline. Transient failures are retried with jittered
+    exponential backoff (honouring Retry-After), and a per-host circuit breaker fails
+    fast while a backend is down. Identical idempotent requests, or mutations sent with
+    the same idempotency key, issued while one is already in flight (same method, URL,
+    parameters, body, credentials and key) wait for it and receive a copy of its
+    response instead of hitting the backend again. Mutations without a key are always
+    sent, since two of them may be meant to take effect twice.
+
+    Args:
+        endpoint_name (str): Name of the endpoint in services.endpoints.ENDPOINTS.
+        method (str): HTTP method.
+        path_params (dict): Values for the URL template placeholders.
+        deadline (Deadline): Budget of the user action; a fresh one is used if omitted.
+        idempotent (bool): Whether the request may be resent after an ambiguous failure.
+            Defaults to True for GET, HEAD, OPTIONS, PUT and DELETE.
+        retry_policy (RetryPolicy): Retry settings; the configured defaults if omitted.
+        lane (str): Scheduler lane; defaults to the lane of the calling thread.
+        idempotency_key (str): Client-generated key sent as the Idempotency-Key header, so
+            the server applies a mutation once however often it is resent. Requests with
+            a key are retried like idempotent ones.
+        **kwargs: Passed to requests (headers, params, json, ...).
+
+    Returns:
+        requests.Response: The final response, whatever its status code.
+
+    Raises:
+        RequestTimeoutError: If the endpoint or the deadline timed out.
+        CircuitOpenError: If the host's circuit breaker is open.
+        requests.exceptions.RequestException: For other transport errors.
+    """
+    endpoint = get_endpoint(endpoint_name)
+    deadline = deadline or Deadline()
+    method = method.upper()
+    url = endpoint.format_url(**(path_params or {}))
+    if idempotency_key is not None:
+        kwargs["headers"] = {**(kwargs.get("headers") or {}), "Idempotency-Key": idempotency_key}
+        if idempotent is None:
+            idempotent = True
+    if kwargs.get("stream") or (method not in IDEMPOTENT_METHODS and idempotency_key is None):
+        return _send(endpoint, method, url, deadline, idempotent, retry_policy, lane, kwargs)
+
+    # Identical concurrent requests share one round trip
+    key = _coalescing_key(method, url, kwargs)
+    with _in_flight_lock:
+        flight = _in_flight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _in_flight[key] = _InFlight()
+    if not leader:
+        logger.debug(f"{method} {endpoint.name} joined an identical in-flight request.")
+        if not flight.done.wait(deadline.remaining()):
+            raise RequestTimeoutError(endpoint, "shared request did not finish before the action deadline")
+        if flight.error is not None:
+            raise flight.error
+        return copy.copy(flight.response)
+
+    try:
+        flight.response = _send(endpoint, method, url, deadline, idempotent, retry_policy, lane, kwargs)
+        return flight.response
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _in_flight_lock:
+            del _in_flight[key]
+        flight.done.set()
+
+
+class _InFlight:
+    """Outcome of a request that concurrent identical callers wait for."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+def _coalescing_key(method, url, kwargs):
+    """Identify a request by method, URL, query, body and the credentials it is sent with."""
+    headers = kwargs.get("headers") or {}
+    params = kwargs.get("params") or {}
+    return (
+        method,
+        url,
+        tuple(sorted((str(k), str(v)) for k, v in dict(params).items())),
+        json.dumps(kwargs.get("json"), sort_keys=True, default=str),
+        repr(kwargs.get("data")),
+        headers.get("Authorization"),
+        headers.get("Ocp-Apim-Subscription-Key"),
+        headers.get("Idempotency-Key"),
+    )
+
+
+def _send(endpoint, method, url, deadline, idempotent, retry_policy, lane, kwargs):
+    """Send one logical request with rate limiting, scheduling, retries and circuit breaking."""
+    policy = retry_policy or RetryPolicy()
+    if idempotent is None:
+        idempotent = method in IDEMPOTENT_METHODS
+    breaker = get_breaker(urlsplit(url).netloc)
+    subscription_key = (kwargs.get("headers") or {}).get("Ocp-Apim-Subscription-Key")
+    scheduler = get_scheduler()
+    lane = lane or current_lane()
+
+    attempt = 0
+    while True:
+        if breaker.retry_in() > 0:
+            raise CircuitOpenError(endpoint, breaker.retry_in())
+        if subscription_key and not rate_limiter.acquire(subscription_key, timeout=deadline.remaining()):
+            raise RequestTimeoutError(endpoint, "request quota exhausted")
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            raise RequestTimeoutError(endpoint, "action deadline exceeded")
+        if not scheduler.acquire(lane, timeout=remaining):
+            raise RequestTimeoutError(endpoint, "no request slot before the action deadline")
+        # Asked only once a slot is held, so a half-open trial is never lost to a quota or slot timeout
+        if not breaker.allow_request():
+            scheduler.release(lane)
+            raise CircuitOpenError(endpoint, breaker.retry_in())
+        remaining = deadline.remaining()
+        connect_timeout, read_timeout = endpoint.timeout
+        timeout = (min(connect_timeout, remaining), min(read_timeout, remaining))
+
+        try:
+            response = get_session().request(method, url, timeout=timeout, **kwargs)
+        except requests.exceptions.RequestException as e:
+            scheduler.release(lane)
+            breaker.record_failure()
+            delay = policy.backoff(attempt)
+            if attempt + 1 < policy.max_attempts and policy.should_retry_error(e, idempotent) \
+                    and delay < deadline.remaining():
+                logger.warning(f"{method} {endpoint.name} failed ({e}); retry {attempt + 1} in {delay:.2f}s.")
+                time.sleep(delay)
+                attempt += 1
+                continue
+            if isinstance(e, requests.exceptions.Timeout):
+                logger.warning(f"{method} {endpoint.name} timed out after {timeout}: {e}")
+                raise RequestTimeoutError(endpoint) from e
+            raise
+        except Exception:
+            scheduler.release(lane)
+            breaker.release_trial()
+            raise
+        scheduler.release(lane)
+
+        if response.status_code in UNAVAILABLE_STATUSES:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+        if attempt + 1 < policy.max_attempts and policy.should_retry_status(response.status_code, idempotent):
+            retry_after = retry_after_seconds(response)
+            delay = retry_after if retry_after is not None else policy.backoff(attempt)
+            if delay < deadline.remaining():
+                logger.warning(f"{method} {endpoint.name} returned {response.status_code}; "
+                               f"retry {attempt + 1} in {delay:.2f}s.")
+                response.close()
+                time.sleep(delay)
+                attempt += 1
+                continue
+        return response
+
+
+def service_base_urls():
+    """Return the distinct base URLs of the backend services configured in appconfig."""
+    urls = []
+    for name in ("USER_BASE_API_URL", "TRANSACTION_SERVICE_BASE_URL", "REPORT_SERVICE_BASE_URL"):
+        url = getattr(appconfig, name, None)
+        if url and url not in urls:
+            urls.append(url)
+    return urls
+
+
+def _origin(url):
+    """Reduce a URL to scheme://host[:port]/ so one pool is warmed per origin."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}/"
+
+
+def prewarm_connections(urls=None, connections_per_host=PREWARM_CONNECTIONS_PER_HOST, session=None):
+    """
+    Resolve DNS and open idle keep-alive connections to each backend host.
+
+    The connections are placed in the same urllib3 pools the shared session uses for
+    real requests, so the first login POST and dashboard fetch skip the TCP/TLS handshake.
+
+    Args:
+        urls (list): URLs whose hosts should be warmed. Defaults to the service base URLs.
+        connections_per_host (int): Number of idle connections to open per host.
+        session (requests.Session): Session to warm. Defaults to the shared session.
+
+    Returns:
+        dict: Mapping of origin to the number of connections opened.
+    """
+    session = session or get_session()
+    origins = []
+    for url in urls if urls is not None else service_base_urls():
+        origin = _origin(url)
+        if origin not in origins:
+            origins.append(origin)
+
+    warmed = {}
+    for origin in origins:
+        parts = urlsplit(origin)
+        try:
+            socket.getaddrinfo(parts.hostname, parts.port or (443 if parts.scheme == "https" else 80),
+                               type=socket.SOCK_STREAM)
+        except OSError as e:
+            logger.warning(f"DNS pre-resolution failed for {parts.hostname}: {e}")
+            warmed[origin] = 0
+            continue
+
+        try:
+            pool = _connection_pool_for(session, origin)
+            # HTTPConnectionPool._get_conn/_put_conn are private urllib3 API (stable across
+            # 1.26 and 2.x); test_prewarmed_*_connections_are_reused catch a change
+            connections = [pool._get_conn() for _ in range(connections_per_host)]
+            opened = 0
+            for conn in connections:
+                try:
+                    if not getattr(conn, "is_connected", False):
+                        conn.timeout = PREWARM_CONNECT_TIMEOUT
+                        conn.connect()
+                        _drain_post_handshake(conn)
+                    opened += 1
+                except OSError as e:
+                    logger.warning(f"Could not pre-open connection to {origin}: {e}")
+                finally:
+                    pool._put_conn(conn)
+            warmed[origin] = opened
+            logger.info(f"Pre-warmed {opened} connection(s) to {origin}")
+        except Exception as e:
+            logger.warning(f"Connection pre-warming failed for {origin}: {e}")
+            warmed[origin] = 0
+    return warmed
+
+
+def _drain_post_handshake(conn, wait=0.05):
+    """
+    Consume TLS 1.3 session tickets the server sends right after the handshake.
+
+    urllib3 treats a readable idle socket as dropped and discards it on checkout, so an
+    unread ticket would make the pre-warmed connection useless.
+    """
+    sock = conn.sock
+    if not isinstance(sock, ssl.SSLSocket):
+        return
+    timeout = sock.gettimeout()
+    try:
+        while select.select([sock], [], [], wait)[0]:
+            sock.setblocking(False)
+            try:
+                if not sock.recv(1):
+                    raise ConnectionResetError("Connection closed by server after handshake")
+            except (ssl.SSLWantReadError, BlockingIOError):
+                pass
+    finally:
+        sock.settimeout(timeout)
+
+
+def _connection_pool_for(session, url):
+    """Return the urllib3 pool the session would use for a request to the given URL."""
+    adapter = session.get_adapter(url)
+    # Resolve verify/proxies exactly as a real request would (REQUESTS_CA_BUNDLE etc.),
+    # otherwise the warmed pool has a different key and is never reused
+    settings = session.merge_environment_settings(url, {}, None, None, None)
+    request = requests.Request("GET", url).prepare()
+    if hasattr(adapter, "get_connection_with_tls_context"):
+        return adapter.get_connection_with_tls_context(
+            request, settings["verify"], settings["proxies"], settings["cert"]
+        )
+    return adapter.get_connection(url, settings["proxies"])
@@ -0,0 +1,195 @@
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import wait, FIRST_COMPLETED
+
+import appconfig
+from services.http_client import Deadline
+from services.request_scheduler import current_lane, lane_context, get_bulk_pool
+from services.transaction_service import submit_transaction
+from utils.statement_parser import iter_statement, count_rows
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = getattr(appconfig, "IMPORT_BATCH_SIZE", 25)
+IMPORT_CONCURRENCY = getattr(appconfig, "IMPORT_CONCURRENCY", 3)
+IMPORT_CHECKPOINT_DIR = getattr(appconfig, "IMPORT_CHECKPOINT_DIR", "import_checkpoints")
+
+
+def file_fingerprint(path):
+    """SHA-256 of the statement contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ImportCheckpoint:
+    """
+    On-disk record of the statement rows that were already sent.
+
+    Rows are tracked as a watermark (every row below it is done) plus the set of done
+    rows above it, so the file stays small while batches complete out of order.
+    """
+
+    def __init__(self, fingerprint, user_id, directory=IMPORT_CHECKPOINT_DIR):
+        self.path = os.path.join(directory, f"{fingerprint}.json")
+        self.fingerprint = fingerprint
+        self.user_id = user_id
+        self.watermark = 0
+        self.done = set()
+        self.failed = {}
+        self.load()
+
+    def load(self):
+        """Read a checkpoint left by an earlier run of the same import, if any."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable import checkpoint {self.path}: {e}")
+            return
+        if data.get("user_id") != self.user_id:
+            return
+        self.watermark = data.get("watermark", 0)
+        self.done = set(data.get("done", []))
+        self.failed = data.get("failed", {})
+
+    @property
+    def completed(self):
+        """Number of rows already handled."""
+        return self.watermark + len(self.done)
+
+    def is_done(self, index):
+        return index < self.watermark or index in self.done
+
+    def mark(self, index, error=None):
+        """Record a handled row; rejected rows are kept with their error and not sent again."""
+        if error:
+            self.failed[str(index)] = error
+        self.done.add(index)
+        while self.watermark in self.done:
+            self.done.remove(self.watermark)
+            self.watermark += 1
+
+    def save(self):
+        """Write the checkpoint atomically."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = {"fingerprint": self.fingerprint, "user_id": self.user_id, "watermark": self.watermark,
+                "done": sorted(self.done), "failed": self.failed}
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.path)
+
+    def remove(self):
+        """Delete the checkpoint once the import is complete."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def resume_count(path, user_id):
+    """Number of rows of the statement already sent by an earlier, unfinished import."""
+    return ImportCheckpoint(file_fingerprint(path), user_id).completed
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_statement(path, mapping, user_id, jwt_token, subscription_key, batch_size=IMPORT_BATCH_SIZE,
+                     max_workers=IMPORT_CONCURRENCY, is_duplicate=None, on_progress=None, cancelled=None):
+    """
+    Stream a CSV/OFX statement and upload its rows in concurrent batches on the shared
+    bulk request pool.
+
+    The file is read lazily and at most max_workers batches are held in memory.
+    Requests go through api_request, so the subscription rate limit applies. Each row is
+    sent with an idempotency key derived from the file contents and row number, and
+    the checkpoint is saved after every batch: running the import again after an
+    interruption skips the rows that were already sent.
+
+    Args:
+        mapping (dict): For CSV files, transaction field -> column name.
+        is_duplicate (callable): Returns True for a row that matches an existing
+            transaction; such rows are not sent.
+        on_progress (callable): Called as on_progress(done, total) after each batch.
+        cancelled (callable): Returns True once the remaining rows should be left for later.
+
+    Returns:
+        dict: Counts of "imported", "skipped" (sent earlier), "duplicates" and "pending"
+            (left for a later run) rows, plus "failed": dict of row number -> message.
+    """
+    fingerprint = file_fingerprint(path)
+    checkpoint = ImportCheckpoint(fingerprint, user_id)
+    total = count_rows(path)
+    lane = current_lane()  # pool threads send through the lane of the caller
+    summary = {"imported": 0, "skipped": checkpoint.completed, "duplicates": 0}
+    logger.info(f"Importing {total} rows from {path} ({summary['skipped']} already sent).")
+
+    def send(batch):
+        results = []
+        deadline = Deadline()  # one budget per batch; rows not sent in time stay pending
+        with lane_context(lane):
+            for index, transaction, error in batch:
+                if error or (cancelled and cancelled()):
+                    results.append((index, "invalid" if error else "cancelled", error))
+                    continue
+                if is_duplicate and is_duplicate(transaction):
+                    results.append((index, "duplicate", None))
+                    continue
+                transaction["userId"] = user_id
+                outcome, payload = submit_transaction(transaction, jwt_token, subscription_key, deadline=deadline,
+                                                      idempotency_key=f"import-{fingerprint}-{index}")
+                results.append((index, outcome, payload))
+        return results
+
+    def collect(future):
+        for index, outcome, payload in future.result():
+            if outcome == "created":
+                checkpoint.mark(index)
+                summary["imported"] += 1
+            elif outcome == "duplicate":
+                checkpoint.mark(index)
+                summary["duplicates"] += 1
+            elif outcome in ("rejected", "invalid"):
+                checkpoint.mark(index, payload)
+        checkpoint.save()
+        if on_progress:
+            on_progress(checkpoint.completed, total)
+
+    rows = (row for row in iter_statement(path, mapping) if not checkpoint.is_done(row[0]))
+    pool = get_bulk_pool()
+    in_flight = set()
+    for batch in _batches(rows, batch_size):
+        if cancelled and cancelled():
+            break
+        while len(in_flight) >= max_workers:
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                collect(future)
+        in_flight.add(pool.submit(send, batch))
+    for future in in_flight:
+        collect(future)
+
+    summary["pending"] = total - checkpoint.completed
+    summary["failed"] = {int(index) + 1: message for index, message in checkpoint.failed.items()}
+    if summary["pending"] == 0:
+        checkpoint.remove()
+    logger.info(f"Import finished: {summary['imported']} imported, {summary['skipped']} skipped, "
+                f"{summary['duplicates']} duplicates, {len(summary['failed'])} failed, "
+                f"{summary['pending']} left for later.")
+    return summary
@@ -0,0 +1,76 @@
+import logging
+import threading
+import time
+
+import appconfig
+
+logger = logging.getLogger(__name__)
+
+# (requests per second, burst size); RATE_LIMITS overrides it per subscription key
+RATE_LIMIT_DEFAULT = getattr(appconfig, "RATE_LIMIT_DEFAULT", (5.0, 10))
+RATE_LIMITS = getattr(appconfig, "RATE_LIMITS", {})
+
+
+class TokenBucket:
+    """
+    Token bucket that smooths bursts instead of rejecting them.
+
+    A caller that finds the bucket empty reserves the next token (the balance goes
+    negative) and sleeps until it is due, so concurrent callers are spaced out at
+    `rate` per second in arrival order.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.throttled = 0
+        self.total_wait = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, timeout=None):
+        """
+        Take one token, waiting for it if necessary.
+
+        Args:
+            timeout (float): Maximum seconds to wait; None waits as long as needed.
+
+        Returns:
+            bool: True once a token was taken, False if it would take longer than timeout.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+            if timeout is not None and wait > timeout:
+                return False
+            self.tokens -= 1
+            if wait:
+                self.throttled += 1
+                self.total_wait += wait
+        if wait:
+            logger.debug(f"Rate limiter delaying request by {wait:.3f}s.")
+            time.sleep(wait)
+        return True
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(subscription_key):
+    """Return the token bucket of a subscription key, creating it from config on first use."""
+    with _buckets_lock:
+        if subscription_key not in _buckets:
+            rate, burst = RATE_LIMITS.get(subscription_key, RATE_LIMIT_DEFAULT)
+            _buckets[subscription_key] = TokenBucket(rate, burst)
+        return _buckets[subscription_key]
+
+
+def acquire(subscription_key, timeout=None):
+    """Wait for permission to send one request on a subscription key."""
+    return get_bucket(subscription_key).acquire(timeout)
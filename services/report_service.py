@@ -0,0 +1,61 @@
+import logging
+import requests
+from services.http_client import api_request
+
+logger = logging.getLogger(__name__)
+
+
+def fetch_monthly_summary(user_id, jwt_token, subscription_key, year, month, deadline=None):
+    """
+    Fetch the income/expense totals of a user for one month.
+
+    Returns:
+        tuple: (success: bool, report_data: list | message: str)
+    """
+    headers = {
+        "Authorization": f"Bearer {jwt_token}",
+        "Ocp-Apim-Subscription-Key": subscription_key
+    }
+    params = {
+        "userId": user_id,
+        "year": year,
+        "month": month
+    }
+
+    logger.debug(f"Fetching monthly report for user_id={user_id}, year={year}, month={month}")
+    try:
+        response = api_request("report_monthly", deadline=deadline, headers=headers, params=params)
+        if response.status_code == 200:
+            return True, response.json()
+        return False, f"Error fetching monthly report: {response.status_code}\n{response.text}"
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.error(f"An error occurred while fetching the monthly report: {e}")
+        return False, f"Error: {str(e)}"
+
+
+def fetch_custom_range_report(user_id, jwt_token, subscription_key, start_date, end_date, deadline=None):
+    """
+    Fetch the transactions of a user between two dates (inclusive, 'yyyy-MM-dd').
+
+    Returns:
+        tuple: (success: bool, report_data: list | message: str)
+    """
+    headers = {
+        "Authorization": f"Bearer {jwt_token}",
+        "Ocp-Apim-Subscription-Key": subscription_key
+    }
+    params = {
+        "userId": user_id,
+        "startDate": start_date,
+        "endDate": end_date
+    }
+
+    logger.debug(f"Fetching custom report from {start_date} to {end_date}")
+    try:
+        response = api_request("report_custom", deadline=deadline, headers=headers, params=params)
+        if response.status_code == 200:
+            return True, response.json()
+        return False, f"Error fetching custom report: {response.status_code}\n{response.text}"
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.error(f"An error occurred while fetching the custom report: {e}")
+        return False, f"Error: {str(e)}"
@@ -0,0 +1,180 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import appconfig
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+NORMAL = "normal"
+BACKGROUND = "background"
+LANES = (INTERACTIVE, NORMAL, BACKGROUND)  # highest priority first
+
+LANE_LIMITS = getattr(appconfig, "REQUEST_LANE_LIMITS", {INTERACTIVE: 4, NORMAL: 3, BACKGROUND: 2})
+MAX_CONCURRENT_REQUESTS = getattr(appconfig, "MAX_CONCURRENT_REQUESTS", 6)
+BULK_REQUEST_THREADS = getattr(appconfig, "BULK_REQUEST_THREADS", MAX_CONCURRENT_REQUESTS)
+SLOW_GRANT_SECONDS = 0.5  # waits longer than this are logged
+
+_context = threading.local()
+
+
+class _Lane:
+    """Queue, concurrency counter and wait-time statistics of one priority lane."""
+
+    def __init__(self, name, limit):
+        self.name = name
+        self.limit = limit
+        self.active = 0
+        self.waiting = deque()
+        self.granted = 0
+        self.max_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class RequestScheduler:
+    """
+    Admits outbound requests through interactive, normal and background lanes.
+
+    Each lane has its own concurrency cap and the scheduler has a global one. When a
+    slot frees up it goes to the oldest waiter of the highest-priority lane that is
+    under its cap, so a click never queues behind bulk background downloads.
+    """
+
+    def __init__(self, lane_limits=None, max_concurrent=MAX_CONCURRENT_REQUESTS):
+        limits = lane_limits or LANE_LIMITS
+        self.max_concurrent = max_concurrent
+        self.active = 0
+        self._lanes = {name: _Lane(name, limits.get(name, max_concurrent)) for name in LANES}
+        self._cond = threading.Condition()
+
+    def _can_start(self, lane, ticket):
+        if self.active >= self.max_concurrent or lane.active >= lane.limit or lane.waiting[0] is not ticket:
+            return False
+        for name in LANES:
+            other = self._lanes[name]
+            if other is lane:
+                return True
+            if other.waiting and other.active < other.limit:
+                return False  # a higher-priority lane is waiting for the same slot
+        return True
+
+    def acquire(self, lane=None, timeout=None):
+        """
+        Wait for a request slot in a lane.
+
+        Args:
+            lane (str): One of LANES; the calling thread's lane if omitted.
+            timeout (float): Maximum seconds to wait; None waits as long as needed.
+
+        Returns:
+            bool: True once the slot was granted, False if the timeout expired first.
+        """
+        lane = self._lanes[lane or current_lane()]
+        ticket = object()
+        queued_at = time.monotonic()
+        with self._cond:
+            lane.waiting.append(ticket)
+            lane.max_depth = max(lane.max_depth, len(lane.waiting))
+            try:
+                granted = self._cond.wait_for(lambda: self._can_start(lane, ticket), timeout)
+            finally:
+                lane.waiting.remove(ticket)
+            if not granted:
+                self._cond.notify_all()
+                logger.warning(f"No {lane.name} request slot within {timeout:.2f}s "
+                               f"(queued={len(lane.waiting)}, active={lane.active}).")
+                return False
+            waited = time.monotonic() - queued_at
+            lane.active += 1
+            self.active += 1
+            lane.granted += 1
+            lane.total_wait += waited
+            lane.max_wait = max(lane.max_wait, waited)
+            self._cond.notify_all()
+        if waited > SLOW_GRANT_SECONDS:
+            logger.info(f"{lane.name.capitalize()} request waited {waited:.2f}s for a slot.")
+        return True
+
+    def release(self, lane=None):
+        """Free a slot previously granted in a lane."""
+        lane = self._lanes[lane or current_lane()]
+        with self._cond:
+            lane.active -= 1
+            self.active -= 1
+            self._cond.notify_all()
+
+    def stats(self):
+        """
+        Per-lane queue depth and wait-time metrics.
+
+        Returns:
+            dict: lane name -> {queued, active, max_depth, granted, avg_wait, max_wait}.
+        """
+        with self._cond:
+            return {
+                lane.name: {
+                    "queued": len(lane.waiting),
+                    "active": lane.active,
+                    "max_depth": lane.max_depth,
+                    "granted": lane.granted,
+                    "avg_wait": lane.total_wait / lane.granted if lane.granted else 0.0,
+                    "max_wait": lane.max_wait,
+                }
+                for lane in self._lanes.values()
+            }
+
+    def log_stats(self):
+        """Write the per-lane metrics to the log."""
+        for name, s in self.stats().items():
+            logger.info(f"Request lane '{name}': granted={s['granted']}, queued={s['queued']}, "
+                        f"max_depth={s['max_depth']}, avg_wait={s['avg_wait']:.3f}s, max_wait={s['max_wait']:.3f}s")
+
+
+def current_lane():
+    """Lane of requests made on this thread; threads without one (the GUI) are interactive."""
+    return getattr(_context, "lane", INTERACTIVE)
+
+
+@contextmanager
+def lane_context(lane):
+    """Send requests made inside the block through the given lane."""
+    previous = getattr(_context, "lane", None)
+    _context.lane = lane
+    try:
+        yield
+    finally:
+        if previous is None:
+            del _context.lane
+        else:
+            _context.lane = previous
+
+
+_scheduler = RequestScheduler()
+
+
+def get_scheduler():
+    """Return the application-wide request scheduler."""
+    return _scheduler
+
+
+_bulk_pool = None
+_bulk_pool_lock = threading.Lock()
+
+
+def get_bulk_pool():
+    """
+    Return the thread pool shared by operations that send many requests at once.
+
+    Bulk deletes and statement imports fan their requests out here instead of starting
+    pools of their own, so together they never use more than BULK_REQUEST_THREADS threads.
+    """
+    global _bulk_pool
+    with _bulk_pool_lock:
+        if _bulk_pool is None:
+            _bulk_pool = ThreadPoolExecutor(max_workers=BULK_REQUEST_THREADS, thread_name_prefix="bulk-request")
+        return _bulk_pool
@@ -0,0 +1,158 @@
+import email.utils
+import logging
+import random
+import threading
+import time
+
+import requests
+
+import appconfig
+
+logger = logging.getLogger(__name__)
+
+RETRY_MAX_ATTEMPTS = getattr(appconfig, "RETRY_MAX_ATTEMPTS", 3)
+RETRY_BASE_DELAY = getattr(appconfig, "RETRY_BASE_DELAY", 0.5)
+RETRY_MAX_DELAY = getattr(appconfig, "RETRY_MAX_DELAY", 8.0)
+BREAKER_FAILURE_THRESHOLD = getattr(appconfig, "BREAKER_FAILURE_THRESHOLD", 5)
+BREAKER_RECOVERY_SECONDS = getattr(appconfig, "BREAKER_RECOVERY_SECONDS", 30.0)
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+# The gateway rejected the request before the backend processed it; safe to resend any method
+REJECTED_STATUSES = {429}
+# The backend may be down or overloaded; only idempotent requests are resent
+UNAVAILABLE_STATUSES = {502, 503, 504}
+
+
+class RetryPolicy:
+    """Bounded retries with exponential backoff and full jitter."""
+
+    def __init__(self, max_attempts=RETRY_MAX_ATTEMPTS, base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt):
+        """Delay before retry number `attempt` (0-based), drawn uniformly from [0, cap]."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def should_retry_status(self, status_code, idempotent):
+        """Return True if a response with this status may be retried."""
+        return status_code in REJECTED_STATUSES or (idempotent and status_code in UNAVAILABLE_STATUSES)
+
+    def should_retry_error(self, error, idempotent):
+        """Return True if a transport error may be retried."""
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True  # Nothing was sent
+        return idempotent and isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+def retry_after_seconds(response):
+    """Parse a Retry-After header (delta-seconds or HTTP date); None if absent or invalid."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and requests fail
+    fast; after `recovery_seconds` one trial request is let through (half-open), and its
+    outcome closes or reopens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, host, failure_threshold=BREAKER_FAILURE_THRESHOLD, recovery_seconds=BREAKER_RECOVERY_SECONDS):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        """Return True if a request may be sent now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.recovery_seconds:
+                self._set_state(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def retry_in(self):
+        """Seconds until the breaker lets a trial request through."""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.recovery_seconds - (time.monotonic() - self.opened_at))
+
+    def release_trial(self):
+        """Give up a half-open trial that was never sent, so the next request can be the trial."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._trial_in_flight = False
+            if self.state != self.CLOSED:
+                self._set_state(self.CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                self._set_state(self.OPEN)
+
+    def _set_state(self, state):
+        self.state = state
+        logger.warning(f"Circuit breaker for {self.host} is now {state} (failures={self.failures}).")
+        for listener in list(_state_listeners):
+            try:
+                listener(self.host, state)
+            except Exception:
+                logger.exception("Circuit breaker state listener failed.")
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+_state_listeners = []
+
+
+def get_breaker(host):
+    """Return the circuit breaker of a host, creating it on first use."""
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker(host)
+        return _breakers[host]
+
+
+def breaker_states():
+    """Return a {host: state} snapshot of all circuit breakers."""
+    with _breakers_lock:
+        return {host: breaker.state for host, breaker in _breakers.items()}
+
+
+def add_state_listener(callback):
+    """Register callback(host, state), called from the requesting thread on every state change."""
+    _state_listeners.append(callback)
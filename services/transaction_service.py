@@ -0,0 +1,356 @@
+import calendar
+import itertools
+import logging
+import uuid
+from concurrent.futures import wait, FIRST_COMPLETED
+
+import requests
+
+import appconfig
+from services.http_client import api_request, Deadline
+from services.request_scheduler import current_lane, lane_context, get_bulk_pool
+from utils.json_stream import iter_array_items
+
+logger = logging.getLogger(__name__)
+
+BULK_DELETE_CONCURRENCY = getattr(appconfig, "BULK_DELETE_CONCURRENCY", 4)
+# One bulk delete is one user action, so all of its requests share this budget
+BULK_DELETE_DEADLINE_SECONDS = getattr(appconfig, "BULK_DELETE_DEADLINE_SECONDS", 120)
+EXPORT_PAGE_SIZE = getattr(appconfig, "EXPORT_PAGE_SIZE", 500)
+FETCH_TRANSACTIONS_BY_MONTH = getattr(appconfig, "FETCH_TRANSACTIONS_BY_MONTH", False)
+MONTH_PAGE_SIZE = getattr(appconfig, "MONTH_PAGE_SIZE", 200)
+LEAN_TRANSACTION_LIST = getattr(appconfig, "LEAN_TRANSACTION_LIST", False)
+# Fields the dashboard needs in lean mode; the details view fetches the rest per transaction
+TRANSACTION_LIST_FIELDS = getattr(appconfig, "TRANSACTION_LIST_FIELDS",
+                                  ("id", "transactionType", "amount", "date", "category"))
+# Lean rows without descriptions cannot be searched or duplicate-checked by description
+LIST_HAS_DESCRIPTIONS = not LEAN_TRANSACTION_LIST or "description" in TRANSACTION_LIST_FIELDS
+STREAM_TRANSACTIONS = getattr(appconfig, "STREAM_TRANSACTIONS", True)
+STREAM_FIRST_CHUNK_ROWS = getattr(appconfig, "STREAM_FIRST_CHUNK_ROWS", 50)
+STREAM_CHUNK_ROWS = getattr(appconfig, "STREAM_CHUNK_ROWS", 1000)
+STREAM_READ_BYTES = 64 * 1024
+
+
+def _headers(jwt_token, subscription_key):
+    return {
+        "Authorization": f"Bearer {jwt_token}",
+        "Ocp-Apim-Subscription-Key": subscription_key
+    }
+
+
+def _history_params():
+    """Query parameters of a full-history fetch."""
+    params = {
+        "page": 1,
+        "pageSize": 10000,
+        "sortBy": "date",
+        "sortOrder": "desc"
+    }
+    if LEAN_TRANSACTION_LIST:
+        params["fields"] = ",".join(TRANSACTION_LIST_FIELDS)
+    return params
+
+
+def fetch_user_transactions(user_id, jwt_token, subscription_key, deadline=None):
+    """
+    Fetch the full transaction history of a user, newest first.
+
+    With LEAN_TRANSACTION_LIST only TRANSACTION_LIST_FIELDS are requested.
+
+    Returns:
+        tuple: (success: bool, transactions: list | message: str)
+    """
+    params = _history_params()
+
+    logger.debug(f"Fetching transactions for user_id={user_id} with params {params}")
+    try:
+        response = api_request("transactions_user", path_params={"user_id": user_id}, deadline=deadline,
+                               headers=_headers(jwt_token, subscription_key), params=params)
+        if response.status_code == 200:
+            transactions = response.json().get('transactions', [])
+            logger.debug(f"Fetched {len(transactions)} transactions.")
+            return True, transactions
+        logger.warning(f"Failed to fetch transactions: {response.status_code}")
+        return False, f"Error fetching transactions: {response.status_code}"
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.error(f"An error occurred while fetching transactions: {e}")
+        return False, f"Error: {str(e)}"
+
+
+def stream_user_transactions(user_id, jwt_token, subscription_key, on_rows, cancelled=None, deadline=None):
+    """
+    Fetch the full transaction history, parsing the response while it downloads.
+
+    Parsed rows are passed to on_rows(rows, first, last) on the calling thread: first a
+    small chunk of STREAM_FIRST_CHUNK_ROWS so the dashboard can paint, then
+    STREAM_CHUNK_ROWS at a time. The history is never collected here, so only the chunk
+    being parsed is held; the last call may have no rows.
+
+    Args:
+        on_rows (callable): Receives each chunk and whether it is the first and the last one.
+        cancelled (callable): Returns True once the rest of the download is not wanted.
+
+    Returns:
+        tuple: (success: bool, number of rows streamed: int | message: str)
+    """
+    params = _history_params()
+    logger.debug(f"Streaming transactions for user_id={user_id} with params {params}")
+    count = 0
+    try:
+        response = api_request("transactions_user", path_params={"user_id": user_id}, deadline=deadline,
+                               headers=_headers(jwt_token, subscription_key), params=params, stream=True)
+        with response:
+            if response.status_code != 200:
+                logger.warning(f"Failed to fetch transactions: {response.status_code}")
+                return False, f"Error fetching transactions: {response.status_code}"
+            chunk, limit = [], STREAM_FIRST_CHUNK_ROWS
+            for row in iter_array_items(response.iter_content(STREAM_READ_BYTES), "transactions"):
+                chunk.append(row)
+                if len(chunk) >= limit:
+                    if cancelled and cancelled():
+                        return False, "Cancelled."
+                    on_rows(chunk, not count, False)
+                    count += len(chunk)
+                    chunk, limit = [], STREAM_CHUNK_ROWS
+            on_rows(chunk, not count, True)
+            count += len(chunk)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.error(f"An error occurred while streaming transactions: {e}")
+        return False, f"Error: {str(e)}"
+    logger.debug(f"Streamed {count} transactions.")
+    return True, count
+
+
+def iter_user_transactions(user_id, jwt_token, subscription_key, page_size=EXPORT_PAGE_SIZE, on_total=None,
+                           start_date=None, end_date=None, fields=None, deadline=None):
+    """
+    Yield the transactions of a user newest first, fetching one page at a time.
+
+    Only the current page is held in memory. Errors are raised, not returned, since
+    they can happen after rows were already yielded.
+
+    Args:
+        on_total (callable): Called with the total row count if the server reports it.
+        start_date, end_date (str): Inclusive 'yyyy-MM-dd' bounds applied by the server.
+        fields (iterable): Field names to request; all fields if omitted.
+
+    Raises:
+        requests.exceptions.RequestException: A page could not be fetched.
+    """
+    page = 1
+    while True:
+        params = {"page": page, "pageSize": page_size, "sortBy": "date", "sortOrder": "desc"}
+        if start_date and end_date:
+            params.update(startDate=start_date, endDate=end_date)
+        if fields:
+            params["fields"] = ",".join(fields)
+        response = api_request("transactions_user", path_params={"user_id": user_id}, deadline=deadline,
+                               headers=_headers(jwt_token, subscription_key), params=params)
+        if response.status_code != 200:
+            raise requests.exceptions.HTTPError(
+                f"Error fetching transactions: {response.status_code}", response=response
+            )
+        try:
+            body = response.json()
+        except ValueError as e:
+            raise requests.exceptions.InvalidJSONError(f"Invalid transactions page: {e}", response=response)
+        if page == 1 and on_total and body.get("totalCount") is not None:
+            on_total(body["totalCount"])
+        rows = body.get("transactions", [])
+        logger.debug(f"Fetched transactions page {page} ({len(rows)} rows).")
+        yield from rows
+        if len(rows) < page_size:
+            return
+        page += 1
+
+
+def fetch_month_transactions(user_id, jwt_token, subscription_key, month, deadline=None):
+    """
+    Fetch the transactions of one month only, letting the server filter by date range.
+
+    With LEAN_TRANSACTION_LIST only TRANSACTION_LIST_FIELDS are requested. All pages
+    share one action deadline.
+
+    Args:
+        month (str): Month as "YYYY-MM".
+        deadline (Deadline): Budget of the whole fetch; a fresh one is used if omitted.
+
+    Returns:
+        tuple: (success: bool, transactions: list | message: str)
+    """
+    year, month_number = (int(part) for part in month.split("-"))
+    start_date = f"{month}-01"
+    end_date = f"{month}-{calendar.monthrange(year, month_number)[1]:02d}"
+    logger.debug(f"Fetching transactions for user_id={user_id} from {start_date} to {end_date}")
+    deadline = deadline or Deadline()
+    try:
+        transactions = list(iter_user_transactions(user_id, jwt_token, subscription_key, page_size=MONTH_PAGE_SIZE,
+                                                   start_date=start_date, end_date=end_date, deadline=deadline,
+                                                   fields=TRANSACTION_LIST_FIELDS if LEAN_TRANSACTION_LIST else None))
+    except requests.exceptions.RequestException as e:
+        logger.error(f"An error occurred while fetching transactions of {month}: {e}")
+        return False, f"Error: {str(e)}"
+    logger.debug(f"Fetched {len(transactions)} transactions of {month}.")
+    return True, transactions
+
+
+def fetch_transaction(transaction_id, jwt_token, subscription_key, deadline=None):
+    """
+    Fetch a single transaction with all of its fields.
+
+    Returns:
+        tuple: (success: bool, transaction: dict | message: str)
+    """
+    logger.debug(f"Fetching transaction {transaction_id}")
+    try:
+        response = api_request("transaction_get", path_params={"transaction_id": transaction_id}, deadline=deadline,
+                               headers=_headers(jwt_token, subscription_key))
+        if response.status_code == 200:
+            transaction = response.json()
+            if isinstance(transaction, dict):
+                return True, transaction
+            return False, "Unexpected transaction response."
+        logger.warning(f"Failed to fetch transaction {transaction_id}: {response.status_code}")
+        return False, f"Error fetching transaction: {response.status_code}"
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.error(f"An error occurred while fetching transaction {transaction_id}: {e}")
+        return False, f"Error: {str(e)}"
+
+
+def add_transaction(transaction_data, jwt_token, subscription_key, deadline=None, idempotency_key=None):
+    """
+    Create a transaction.
+
+    Args:
+        idempotency_key (str): Client-generated key that makes resending the request safe.
+
+    Returns:
+        tuple: (success: bool, created transaction: dict | message: str)
+    """
+    logger.debug(f"Sending transaction data: {transaction_data}")
+    try:
+        response = api_request("transaction_add", "POST", deadline=deadline, idempotency_key=idempotency_key,
+                               headers=_headers(jwt_token, subscription_key), json=transaction_data)
+        if response.status_code == 200:
+            logger.info("Transaction added successfully.")
+            try:
+                created = response.json()
+            except ValueError:
+                created = {}
+            return True, created if isinstance(created, dict) else {}
+        logger.warning(f"Failed to add transaction: {response.status_code} - {response.text}")
+        return False, f"Failed to add transaction: {response.status_code}"
+    except requests.exceptions.RequestException as e:
+        logger.error(f"An error occurred while adding transaction: {e}")
+        return False, f"An error occurred: {str(e)}"
+
+
+# Statuses after which an outbox entry is kept and sent again later
+TRANSIENT_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+def submit_transaction(transaction_data, jwt_token, subscription_key, deadline=None, idempotency_key=None):
+    """
+    Create a transaction queued in the outbox, telling outages apart from rejections.
+
+    Args:
+        idempotency_key (str): Client-generated key that makes resending the request safe.
+
+    Returns:
+        tuple: (outcome: "created" | "retry" | "rejected", created transaction: dict | message: str)
+    """
+    try:
+        response = api_request("transaction_add", "POST", deadline=deadline, idempotency_key=idempotency_key,
+                               headers=_headers(jwt_token, subscription_key), json=transaction_data)
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Transaction service unreachable, keeping transaction queued: {e}")
+        return "retry", str(e)
+    if response.status_code == 200:
+        try:
+            created = response.json()
+        except ValueError:
+            created = {}
+        return "created", created if isinstance(created, dict) else {}
+    if response.status_code in TRANSIENT_STATUSES:
+        logger.warning(f"Transaction service returned {response.status_code}, keeping transaction queued.")
+        return "retry", f"Transaction service returned {response.status_code}"
+    logger.warning(f"Transaction rejected: {response.status_code} - {response.text}")
+    return "rejected", f"Failed to add transaction: {response.status_code}"
+
+
+def delete_transaction(transaction_id, jwt_token, subscription_key, deadline=None, idempotency_key=None):
+    """
+    Delete a transaction by id.
+
+    Args:
+        idempotency_key (str): Client-generated key that makes resending the request safe.
+
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    logger.debug(f"Deleting transaction {transaction_id}")
+    try:
+        response = api_request("transaction_delete", "DELETE", path_params={"transaction_id": transaction_id},
+                               deadline=deadline, idempotency_key=idempotency_key,
+                               headers=_headers(jwt_token, subscription_key))
+        if response.status_code == 200:
+            logger.info(f"Transaction {transaction_id} deleted.")
+            return True, "Transaction deleted successfully."
+        logger.warning(f"Failed to delete transaction {transaction_id}: {response.status_code} - {response.text}")
+        return False, f"Failed to delete transaction: {response.text}"
+    except requests.exceptions.RequestException as e:
+        logger.error(f"An error occurred while deleting transaction {transaction_id}: {e}")
+        return False, f"An error occurred: {str(e)}"
+
+
+def delete_transactions(transaction_ids, jwt_token, subscription_key, max_workers=BULK_DELETE_CONCURRENCY,
+                        on_progress=None, cancelled=None, deadline=None):
+    """
+    Delete many transactions concurrently on the shared bulk request pool.
+
+    Args:
+        transaction_ids (list): Ids of the transactions to delete.
+        max_workers (int): Maximum number of DELETE requests in flight at once.
+        on_progress (callable): Called as on_progress(done, total) after each request.
+        cancelled (callable): Returns True once the remaining deletes should be skipped.
+        deadline (Deadline): Budget shared by all the deletes; BULK_DELETE_DEADLINE_SECONDS
+            from now if omitted. Deletes not sent in time fail with a timeout.
+
+    Returns:
+        tuple: (deleted ids: list, failures: dict of id -> message)
+    """
+    lane = current_lane()  # pool threads send through the lane of the caller
+    deadline = deadline or Deadline(BULK_DELETE_DEADLINE_SECONDS)
+
+    def delete_one(transaction_id):
+        if cancelled and cancelled():
+            return transaction_id, None
+        with lane_context(lane):
+            return transaction_id, delete_transaction(transaction_id, jwt_token, subscription_key, deadline=deadline,
+                                                      idempotency_key=uuid.uuid4().hex)
+
+    deleted, failures = [], {}
+    total = len(transaction_ids)
+    pool = get_bulk_pool()
+    remaining = iter(transaction_ids)
+    in_flight = set()
+    done = 0
+    while True:
+        for transaction_id in itertools.islice(remaining, max_workers - len(in_flight)):
+            in_flight.add(pool.submit(delete_one, transaction_id))
+        if not in_flight:
+            break
+        finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in finished:
+            transaction_id, result = future.result()
+            if result is None:
+                failures[transaction_id] = "Cancelled."
+            elif result[0]:
+                deleted.append(transaction_id)
+            else:
+                failures[transaction_id] = result[1]
+            done += 1
+            if on_progress:
+                on_progress(done, total)
+    logger.info(f"Bulk delete finished: {len(deleted)} deleted, {len(failures)} failed or skipped.")
+    return deleted, failures
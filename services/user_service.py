@@ -1,11 +1,12 @@
 import logging
 import requests
-from appconfig import USER_BASE_API_URL, USER_SERVICE_SUBSCRIPTION_KEY
+from services.http_client import api_request
+from appconfig import USER_SERVICE_SUBSCRIPTION_KEY
 
 logger = logging.getLogger(__name__)
 
 
-def register_user(data):
+def register_user(data, deadline=None):
     """
     Register a new user using the provided data.
 
@@ -15,15 +16,14 @@ def register_user(data):
     Returns:
         tuple: (success: bool, message: str)
     """
-    api_url = f"{USER_BASE_API_URL}/Users/register"
     headers = {
         "Content-Type": "application/json",
         "Ocp-Apim-Subscription-Key": USER_SERVICE_SUBSCRIPTION_KEY
     }
 
     try:
-        logger.debug(f"Sending registration request to {api_url} with data: {data}")
-        response = requests.post(api_url, headers=headers, json=data)
+        logger.debug(f"Sending registration request with data: {data}")
+        response = api_request("register", "POST", deadline=deadline, headers=headers, json=data)
         if response.status_code == 200:
             logger.info("User registration successful.")
             return True, "Registration Successful"
@@ -32,3 +32,108 @@ def register_user(data):
     except requests.exceptions.RequestException as e:
         logger.error(f"An error occurred during user registration: {e}")
         return False, f"Error: {e}"
+
+
+def request_password_reset(username, email, deadline=None):
+    """
+    Ask the user service to send a password reset email.
+
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    headers = {
+        "Content-Type": "application/json",
+        "Ocp-Apim-Subscription-Key": USER_SERVICE_SUBSCRIPTION_KEY
+    }
+    payload = {
+        "username": username,
+        "email": email
+    }
+
+    logger.debug(f"Sending password reset request with payload: {payload}")
+    try:
+        response = api_request("password_reset", "POST", deadline=deadline, headers=headers, json=payload)
+        if response.status_code == 200:
+            logger.info("Password reset request successful.")
+            return True, "Password reset request successful. Please check your email."
+        logger.warning(f"Password reset request failed with status code {response.status_code}: {response.text}")
+        return False, f"Error: {response.text}"
+    except requests.exceptions.RequestException as e:
+        logger.error(f"An error occurred during password reset request: {e}")
+        return False, f"Error: {e}"
+
+
+def fetch_user_profile(username, jwt_token, deadline=None):
+    """
+    Fetch the profile of the given user.
+
+    Returns:
+        tuple: (success: bool, profile: dict | message: str)
+    """
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    params = {"username": username}
+
+    logger.debug(f"Fetching profile for username={username}")
+    try:
+        response = api_request("user_profile", deadline=deadline, headers=headers, params=params)
+        if response.status_code == 200:
+            logger.info("User profile fetched successfully.")
+            return True, response.json()
+        logger.error(f"Failed to fetch profile: {response.status_code} - {response.text}")
+        return False, f"Failed to fetch profile: {response.text}"
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.exception("Exception occurred while fetching profile.")
+        return False, str(e)
+
+
+def update_user_profile(jwt_token, updated_data, deadline=None, idempotency_key=None):
+    """
+    Save changes to the user's profile.
+
+    Args:
+        idempotency_key (str): Client-generated key that makes resending the request safe.
+
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+
+    logger.debug("Submitting profile changes.")
+    try:
+        response = api_request("user_profile_update", "PUT", deadline=deadline, idempotency_key=idempotency_key,
+                               headers=headers, json=updated_data)
+        if response.status_code == 200:
+            logger.info("Profile updated successfully.")
+            return True, "Profile updated successfully!"
+        logger.error(f"Failed to update profile: {response.status_code} - {response.text}")
+        return False, f"Failed to update profile: {response.text}"
+    except requests.exceptions.RequestException as e:
+        logger.exception("Exception occurred while updating profile.")
+        return False, str(e)
+
+
+def change_password(jwt_token, username, new_password, deadline=None, idempotency_key=None):
+    """
+    Change the password of the given user.
+
+    Args:
+        idempotency_key (str): Client-generated key that makes resending the request safe.
+
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    payload = {"username": username, "newPassword": new_password}
+
+    logger.debug("Submitting password change.")
+    try:
+        response = api_request("password_change", "POST", deadline=deadline, idempotency_key=idempotency_key,
+                               headers=headers, json=payload)
+        if response.status_code == 200:
+            logger.info("Password changed successfully.")
+            return True, "Password changed successfully!"
+        logger.error(f"Failed to change password: {response.status_code} - {response.text}")
+        return False, f"Failed to change password: {response.text}"
+    except requests.exceptions.RequestException as e:
+        logger.exception("Exception occurred while changing password.")
+        return False, str(e)
@@ -0,0 +1,167 @@
+import importlib.util
+import json
+import os
+import socket
+import ssl
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Self-signed certificate and key for 127.0.0.1, valid until 2126
+CERT = os.path.join(ROOT, "tests", "certs", "localhost.pem")
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    import appconfig  # noqa: F401
+except ImportError:
+    # Without a local appconfig.py the tests run against the example settings
+    spec = importlib.util.spec_from_file_location("appconfig", os.path.join(ROOT, "appconfig.example.py"))
+    appconfig = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(appconfig)
+    sys.modules["appconfig"] = appconfig
+
+
+class StandIn:
+    """
+    Backend stand-in served by http.server on a local port.
+
+    Each request gets the next reply queued with reply(), then whatever respond(request)
+    returns (200 {"ok": true} by default). Requests are recorded as dicts with their
+    method, path, query params, headers and JSON body. stop() takes the backend down and
+    start() brings it back on the same port.
+    """
+
+    def __init__(self, monkeypatch, ssl_context=None):
+        self.monkeypatch = monkeypatch
+        self.replies = []
+        self.requests = []
+        self.respond = lambda request: (200, {"ok": True}, {})
+        self.connections = 0
+        self.lock = threading.Lock()
+        self.ssl_context = ssl_context
+        self.server = None
+        self.port = 0
+        self.url = None
+        self._sockets = []
+
+    def start(self):
+        """Listen on the stand-in's port again, or on a free port the first time."""
+        server = ThreadingHTTPServer(("127.0.0.1", self.port), _standin_handler(self))
+        if self.ssl_context:
+            # The handshake runs in the handler thread, on the first read
+            server.socket = self.ssl_context.wrap_socket(server.socket, server_side=True,
+                                                         do_handshake_on_connect=False)
+        accept = server.get_request
+
+        def get_request():
+            request, address = accept()
+            with self.lock:
+                self.connections += 1
+                self._sockets.append(request)
+            return request, address
+
+        server.get_request = get_request
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.server = server
+        self.port = server.server_address[1]
+        self.url = f"{'https' if self.ssl_context else 'http'}://127.0.0.1:{self.port}"
+
+    def stop(self):
+        """Stop listening and drop open keep-alive connections, as if the backend went down."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.server = None
+        with self.lock:
+            sockets, self._sockets = self._sockets, []
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass  # already closed by its handler
+
+    def reply(self, status=200, body=None, headers=None, delay=0.0):
+        """Queue the reply to the next request."""
+        self.replies.append((status, body if body is not None else {"ok": True}, headers or {}, delay))
+
+    def route(self, endpoint_name, path):
+        """Point a registered endpoint at a path of the stand-in for the current test."""
+        from services import endpoints
+        endpoint = endpoints.ENDPOINTS[endpoint_name]
+        self.monkeypatch.setitem(endpoints.ENDPOINTS, endpoint_name, endpoints.Endpoint(
+            endpoint_name, self.url + path, endpoint.service, timeout=(1, 2)))
+
+    def _next_reply(self, request):
+        with self.lock:
+            self.requests.append(request)
+            if self.replies:
+                return self.replies.pop(0)
+        status, body, headers = self.respond(request)
+        return status, body, headers, 0.0
+
+
+def _standin_handler(backend):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _answer(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length)) if length else None
+            parts = urlsplit(self.path)
+            status, reply, headers, delay = backend._next_reply({
+                "method": self.command, "path": parts.path, "params": dict(parse_qsl(parts.query)),
+                "headers": dict(self.headers), "body": body,
+            })
+            time.sleep(delay)
+            payload = json.dumps(reply).encode()
+            try:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+            except OSError:
+                pass  # the client gave up waiting
+
+        do_GET = do_POST = do_PUT = do_DELETE = _answer
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def _serve(monkeypatch, ssl_context=None):
+    """Run a StandIn in a thread for one test; its host gets a fresh circuit breaker."""
+    from services import resilience
+
+    backend = StandIn(monkeypatch, ssl_context)
+    backend.start()
+    host = f"127.0.0.1:{backend.port}"
+    backend.breaker = resilience.get_breaker(host)
+    yield backend
+    if backend.server:
+        backend.stop()
+    with resilience._breakers_lock:
+        resilience._breakers.pop(host, None)
+
+
+@pytest.fixture
+def standin(monkeypatch):
+    """A StandIn speaking plain HTTP."""
+    yield from _serve(monkeypatch)
+
+
+@pytest.fixture
+def tls_standin(monkeypatch):
+    """A StandIn speaking HTTPS with the self-signed CERT; clients must verify against CERT."""
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(CERT)
+    yield from _serve(monkeypatch, context)
@@ -0,0 +1,205 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from conftest import CERT
+from services import endpoints, resilience
+from services.errors import CircuitOpenError, RequestTimeoutError
+from services.http_client import Deadline, api_request, prewarm_connections
+from services.resilience import CircuitBreaker, RetryPolicy
+
+FAST_RETRIES = RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.05)
+
+
+@pytest.fixture
+def items(standin):
+    """The stand-in with an 'items' endpoint registered on it."""
+    standin.monkeypatch.setitem(endpoints.ENDPOINTS, "items", endpoints.Endpoint(
+        "items", f"{standin.url}/items/{{item_id}}", "test service", timeout=(1, 1)))
+    return standin
+
+
+def get(item_id=1, **kwargs):
+    kwargs.setdefault("retry_policy", FAST_RETRIES)
+    return api_request("items", path_params={"item_id": item_id}, **kwargs)
+
+
+def open_breaker(breaker, recovery_seconds):
+    breaker.failure_threshold = 2
+    breaker.recovery_seconds = recovery_seconds
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_get_is_retried_on_5xx(items):
+    items.reply(503)
+    items.reply(502)
+    response = get()
+    assert response.status_code == 200
+    assert len(items.requests) == 3
+
+
+def test_retries_stop_after_max_attempts(items):
+    for _ in range(3):
+        items.reply(503)
+    assert get().status_code == 503
+    assert len(items.requests) == 3
+
+
+def test_post_is_only_retried_with_an_idempotency_key(items):
+    items.reply(503)
+    assert get(method="POST", json={"a": 1}).status_code == 503
+    assert len(items.requests) == 1
+
+    items.reply(503)
+    assert get(method="POST", json={"a": 1}, idempotency_key="key-1").status_code == 200
+    assert [r["headers"].get("Idempotency-Key") for r in items.requests[1:]] == ["key-1", "key-1"]
+
+
+def test_retry_after_is_honoured(items):
+    items.reply(429, headers={"Retry-After": "1"})
+    start = time.monotonic()
+    assert get().status_code == 200
+    assert time.monotonic() - start >= 1
+    assert len(items.requests) == 2
+
+
+def test_retry_after_beyond_the_deadline_returns_the_response(items):
+    items.reply(429, headers={"Retry-After": "30"})
+    start = time.monotonic()
+    assert get(deadline=Deadline(2)).status_code == 429
+    assert time.monotonic() - start < 1
+    assert len(items.requests) == 1
+
+
+def test_breaker_opens_then_half_opens_then_closes(items):
+    states = []
+    items.monkeypatch.setattr(resilience, "_state_listeners", [lambda host, state: states.append(state)])
+    items.breaker.failure_threshold = 2
+    items.breaker.recovery_seconds = 0.2
+    single = RetryPolicy(max_attempts=1)
+    items.reply(503)
+    items.reply(503)
+    assert get(retry_policy=single).status_code == 503
+    assert get(retry_policy=single).status_code == 503
+    assert items.breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        get()
+    assert len(items.requests) == 2
+
+    time.sleep(0.25)
+    assert get().status_code == 200
+    assert states == [CircuitBreaker.OPEN, CircuitBreaker.HALF_OPEN, CircuitBreaker.CLOSED]
+
+
+def test_failed_trial_reopens_the_breaker(items):
+    open_breaker(items.breaker, 0.1)
+    time.sleep(0.15)
+    items.reply(503)
+    assert get(retry_policy=RetryPolicy(max_attempts=1)).status_code == 503
+    assert items.breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        get()
+
+
+def test_half_open_trial_survives_a_request_that_times_out_before_sending(items):
+    open_breaker(items.breaker, 0.05)
+    time.sleep(0.1)
+
+    with pytest.raises(RequestTimeoutError):
+        get(deadline=Deadline(0))
+    assert items.requests == []
+
+    assert get().status_code == 200
+    assert items.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_slow_response_fails_at_the_deadline(items):
+    items.reply(delay=1.5)
+    start = time.monotonic()
+    with pytest.raises(RequestTimeoutError):
+        get(deadline=Deadline(0.3))
+    assert time.monotonic() - start < 1
+
+
+def test_deadline_is_shared_by_retries(items):
+    items.reply(503, delay=0.2)
+    items.reply(503, delay=0.2)
+    items.reply(503, delay=0.2)
+    start = time.monotonic()
+    with pytest.raises(RequestTimeoutError):
+        get(deadline=Deadline(0.3), retry_policy=RetryPolicy(max_attempts=5, base_delay=0.01))
+    assert time.monotonic() - start < 1
+
+
+def concurrently(count, **kwargs):
+    """Send count identical requests at once and return their status codes."""
+    statuses = []
+    threads = [threading.Thread(target=lambda: statuses.append(get(**kwargs).status_code)) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return statuses
+
+
+def test_identical_gets_in_flight_are_coalesced(items):
+    items.reply(delay=0.3)
+    assert concurrently(3) == [200, 200, 200]
+    assert len(items.requests) == 1
+
+
+def test_identical_posts_without_a_key_are_all_sent(items):
+    items.reply(delay=0.3)
+    assert concurrently(2, method="POST", json={"amount": 5}) == [200, 200]
+    assert len(items.requests) == 2
+
+
+def test_identical_posts_with_the_same_key_are_sent_once(items):
+    items.reply(delay=0.3)
+    assert concurrently(2, method="POST", json={"amount": 5}, idempotency_key="key-1") == [200, 200]
+    assert len(items.requests) == 1
+
+
+def test_prewarmed_connections_are_reused(standin):
+    session = requests.Session()
+    assert prewarm_connections([f"{standin.url}/api/Users"], connections_per_host=2, session=session) == {
+        f"{standin.url}/": 2}
+    for _ in range(100):
+        if standin.connections == 2:
+            break
+        time.sleep(0.01)
+    assert standin.connections == 2
+
+    assert session.get(f"{standin.url}/items/1").status_code == 200
+    assert session.get(f"{standin.url}/items/2").status_code == 200
+    assert standin.connections == 2
+
+
+def test_prewarmed_tls_connections_are_reused(tls_standin, monkeypatch):
+    # Trusted through the environment, so warming must resolve verify the way requests does
+    monkeypatch.setenv("REQUESTS_CA_BUNDLE", CERT)
+    monkeypatch.delenv("CURL_CA_BUNDLE", raising=False)
+    session = requests.Session()
+    assert prewarm_connections([f"{tls_standin.url}/api/Users"], connections_per_host=2, session=session) == {
+        f"{tls_standin.url}/": 2}
+    for _ in range(100):
+        if tls_standin.connections == 2:
+            break
+        time.sleep(0.01)
+    assert tls_standin.connections == 2
+    time.sleep(0.2)  # let the TLS 1.3 session tickets reach the idle sockets
+
+    assert session.get(f"{tls_standin.url}/items/1").status_code == 200
+    assert session.get(f"{tls_standin.url}/items/2").status_code == 200
+    assert tls_standin.connections == 2
+    assert len(tls_standin.requests) == 2
+
+
+def test_prewarming_an_unresolvable_host_opens_nothing():
+    assert prewarm_connections(["http://unresolvable.invalid/api"], session=requests.Session()) == {
+        "http://unresolvable.invalid/": 0}
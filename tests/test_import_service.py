@@ -0,0 +1,45 @@
+import pytest
+
+from services import import_service, transaction_service
+from services.http_client import Deadline
+from services.import_service import import_statement
+
+
+@pytest.fixture
+def statement(tmp_path, monkeypatch):
+    """A five-row CSV statement, imported with checkpoints under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "statement.csv"
+    path.write_text("Date,Amount,Description\n" + "".join(
+        f"2026-03-0{day},-{day}.50,shop {day}\n" for day in range(1, 6)), encoding="utf-8")
+    return str(path)
+
+
+MAPPING = {"date": "Date", "amount": "Amount", "description": "Description"}
+
+
+def test_rows_of_a_batch_share_one_deadline(standin, statement, monkeypatch):
+    standin.route("transaction_add", "/transactions")
+    deadlines = []
+    send = transaction_service.api_request
+
+    def api_request(*args, **kwargs):
+        deadlines.append(kwargs.get("deadline"))
+        return send(*args, **kwargs)
+
+    monkeypatch.setattr(transaction_service, "api_request", api_request)
+    summary = import_statement(statement, MAPPING, "u1", "jwt", None, batch_size=3, max_workers=1)
+    assert summary["imported"] == 5
+    assert len(deadlines) == 5
+    assert all(isinstance(deadline, Deadline) for deadline in deadlines)
+    assert deadlines[0] is deadlines[1] is deadlines[2]
+    assert deadlines[3] is deadlines[4]
+    assert deadlines[0] is not deadlines[3]
+
+
+def test_rows_not_sent_before_the_deadline_stay_pending(standin, statement, monkeypatch):
+    standin.route("transaction_add", "/transactions")
+    monkeypatch.setattr(import_service, "Deadline", lambda: Deadline(0))
+    summary = import_statement(statement, MAPPING, "u1", "jwt", None, batch_size=3)
+    assert (summary["imported"], summary["pending"]) == (0, 5)
+    assert standin.requests == []
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from utils.json_stream import iter_array_items
+
+ITEMS = [
+    {"id": 1, "amount": 12.5, "rate": -1.25e-3, "note": "café €5 [x], {y}", "tags": ["a", "b"]},
+    {"id": 22, "amount": 1234567.0, "escaped": "quote \" and \\\\ slash", "nested": {"deep": [1, 2.5, None]}},
+    7,
+    -3.75,
+    1e21,
+    True,
+    None,
+    "plain",
+]
+DOCUMENT = json.dumps({"balance": 12.5, "count": 10, "transactions": ITEMS, "after": [1.5, 2]},
+                      ensure_ascii=False).encode()
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(DOCUMENT)])
+def test_items_are_decoded_at_any_chunk_size(size):
+    assert list(iter_array_items(chunked(DOCUMENT, size), "transactions")) == ITEMS
+
+
+@pytest.mark.parametrize("size", [1, 3])
+def test_number_split_across_chunks_is_read_whole(size):
+    document = b'{"balance": 12.5, "transactions": [1.5e+3, -0.25, 10]}'
+    assert list(iter_array_items(chunked(document, size), "transactions")) == [1500.0, -0.25, 10]
+
+
+def test_document_split_inside_a_number():
+    chunks = [b'{"balance": 12.', b'5, "transactions": [3', b'4.0', b'1, 2]}']
+    assert list(iter_array_items(chunks, "transactions")) == [34.01, 2]
+
+
+@pytest.mark.parametrize("document", [b'{}', b'{"transactions": []}', b'{"other": [1, 2]}'])
+def test_missing_or_empty_array_yields_nothing(document):
+    assert list(iter_array_items(chunked(document, 1), "transactions")) == []
+
+
+@pytest.mark.parametrize("document", [b'{"transactions": [1, 2', b'{"transactions": [1 2]}', b'[1, 2]'])
+def test_invalid_or_truncated_document_raises(document):
+    with pytest.raises(ValueError):
+        list(iter_array_items(chunked(document, 1), "transactions"))
@@ -0,0 +1,117 @@
+import functools
+import json
+import time
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from services import http_client
+from services.resilience import RetryPolicy
+from utils import outbox as outbox_module
+from utils.outbox import Outbox, send_batch
+from utils.transaction_store import TransactionStore
+
+
+def entries(count):
+    return [{"entry_id": f"entry-{i}", "user_id": "u1", "queued_at": 0.0,
+             "transaction": {"amount": float(i), "date": "2026-10-01", "transactionType": "Expense"}}
+            for i in range(count)]
+
+
+def test_batch_is_sent_in_order_with_entry_ids_as_idempotency_keys(standin):
+    standin.route("transaction_add", "/transactions")
+    standin.respond = lambda request: (200, dict(request["body"], id=int(request["body"]["amount"]) + 100), {})
+    results = send_batch(entries(3), "jwt", None)
+    assert [(entry_id, outcome) for entry_id, outcome, _ in results] == [
+        ("entry-0", "created"), ("entry-1", "created"), ("entry-2", "created")]
+    assert results[2][2]["id"] == 102
+    assert [r["headers"]["Idempotency-Key"] for r in standin.requests] == ["entry-0", "entry-1", "entry-2"]
+
+
+def test_batch_stops_at_the_first_entry_to_retry(standin):
+    standin.route("transaction_add", "/transactions")
+    standin.reply(200, {"id": 1})
+    for _ in range(3):  # every attempt of the second entry
+        standin.reply(503)
+    results = send_batch(entries(3), "jwt", None)
+    assert [outcome for _, outcome, _ in results] == ["created", "retry"]
+    assert {r["body"]["amount"] for r in standin.requests} == {0.0, 1.0}
+
+
+def test_rejected_entry_does_not_stop_the_batch(standin):
+    standin.route("transaction_add", "/transactions")
+    standin.reply(400, {"message": "invalid"})
+    results = send_batch(entries(2), "jwt", None)
+    assert [outcome for _, outcome, _ in results] == ["rejected", "created"]
+
+
+@pytest.fixture
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def wait_until(app, condition, timeout=10):
+    """Run the event loop until condition() holds."""
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end, "timed out"
+        app.processEvents()
+        time.sleep(0.01)
+
+
+def journal(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_outbox_keeps_transactions_through_an_outage_and_a_restart(app, standin, tmp_path, monkeypatch):
+    standin.route("transaction_add", "/transactions")
+    standin.respond = lambda request: (200, dict(request["body"], id=int(request["body"]["amount"]) + 100), {})
+    standin.breaker.recovery_seconds = 0.2
+    monkeypatch.setattr(http_client, "RetryPolicy", functools.partial(RetryPolicy, base_delay=0.01, max_delay=0.02))
+    monkeypatch.setattr(outbox_module, "OUTBOX_RETRY_SECONDS", 0.05)
+    monkeypatch.setattr(outbox_module, "OUTBOX_MAX_RETRY_SECONDS", 0.2)
+    outcomes = []
+    submit = outbox_module.submit_transaction
+
+    def record(*args, **kwargs):
+        outcomes.append(submit(*args, **kwargs))
+        return outcomes[-1]
+
+    monkeypatch.setattr(outbox_module, "submit_transaction", record)
+    path = str(tmp_path / "outbox.jsonl")
+    standin.stop()
+
+    # Queued while the backend is down: journaled, shown as pending, retried with backoff
+    store = TransactionStore()
+    outbox = Outbox(store, path=path)
+    outbox.start("u1", "jwt", None)
+    for entry in entries(3):
+        assert outbox.enqueue(entry["transaction"])
+    queued = [entry["entry_id"] for entry in journal(path)]
+    assert len(queued) == 3
+    assert sorted(txn["amount"] for txn in store.transactions if txn.get("pending")) == [0.0, 1.0, 2.0]
+    wait_until(app, lambda: outbox._retry_delay == 0.2 and not outbox._flushing)
+    assert outcomes and all(outcome == "retry" for outcome, _ in outcomes)
+    assert "Connection" in outcomes[0][1]
+    assert [entry["entry_id"] for entry in journal(path)] == queued
+    outbox.stop()
+
+    # After a restart the journal is replayed, a torn last line skipped, and the
+    # entries sent in order once the backend is back
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"entry_id": "torn')
+    store = TransactionStore()
+    outbox = Outbox(store, path=path)
+    assert [entry["entry_id"] for entry in outbox.entries] == queued
+    standin.start()
+    outbox.start("u1", "jwt", None)
+    repaints = []
+    store.changed.connect(lambda: repaints.append(True))
+    wait_until(app, lambda: not outbox.entries)
+    assert repaints == [True]  # the batch is confirmed in one store update
+
+    assert [r["headers"]["Idempotency-Key"] for r in standin.requests] == queued
+    assert sorted(txn["id"] for txn in store.transactions) == [100, 101, 102]
+    assert not any(txn.get("pending") for txn in store.transactions)
+    assert journal(path) == []
@@ -0,0 +1,194 @@
+import functools
+import json
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from services import transaction_service
+from services.http_client import Deadline
+from services.transaction_service import (
+    delete_transactions, fetch_month_transactions, fetch_transaction, fetch_user_transactions,
+    stream_user_transactions
+)
+
+HISTORY = [
+    {"id": i, "transactionType": "Expense", "amount": float(i), "category": "Food",
+     "date": f"{date(2026, 3, 31) - timedelta(days=i // 4)}T00:00:00", "description": f"item {i}"}
+    for i in range(400)
+]
+
+
+def serve_history(request, history=HISTORY):
+    """Filter, project and page the history the way the transaction service does."""
+    params = request["params"]
+    rows = [txn for txn in history
+            if params.get("startDate", "") <= txn["date"][:10] <= params.get("endDate", "9999")]
+    if "fields" in params:
+        rows = [{field: txn[field] for field in params["fields"].split(",")} for txn in rows]
+    size = int(params["pageSize"])
+    start = (int(params["page"]) - 1) * size
+    return 200, {"transactions": rows[start:start + size], "totalCount": len(rows)}, {}
+
+
+@pytest.fixture
+def history(standin):
+    standin.route("transactions_user", "/transactions/user/{user_id}")
+    standin.respond = serve_history
+    return standin
+
+
+def test_month_fetch_sends_the_date_range_and_pages_through(history, monkeypatch):
+    monkeypatch.setattr(transaction_service, "MONTH_PAGE_SIZE", 25)
+    success, rows = fetch_month_transactions("u1", "jwt", None, "2026-02")
+    assert success
+    assert [txn["id"] for txn in rows] == [txn["id"] for txn in HISTORY if txn["date"].startswith("2026-02")]
+    assert len(rows) == 4 * 28
+    params = [request["params"] for request in history.requests]
+    assert {(p["startDate"], p["endDate"]) for p in params} == {("2026-02-01", "2026-02-28")}
+    assert [int(p["page"]) for p in params] == [1, 2, 3, 4, 5]
+    assert all("fields" not in p for p in params)
+
+
+def record_deadlines(monkeypatch, module=transaction_service):
+    """Record the deadline every api_request call of module is given."""
+    deadlines = []
+    send = module.api_request
+
+    def api_request(*args, **kwargs):
+        deadlines.append(kwargs.get("deadline"))
+        return send(*args, **kwargs)
+
+    monkeypatch.setattr(module, "api_request", api_request)
+    return deadlines
+
+
+def test_month_pages_share_one_deadline(history, monkeypatch):
+    monkeypatch.setattr(transaction_service, "MONTH_PAGE_SIZE", 25)
+    deadlines = record_deadlines(monkeypatch)
+    assert fetch_month_transactions("u1", "jwt", None, "2026-02")[0]
+    assert len(deadlines) == 5
+    assert isinstance(deadlines[0], Deadline)
+    assert all(deadline is deadlines[0] for deadline in deadlines)
+
+
+def test_month_fetch_fails_once_its_deadline_has_passed(history):
+    success, message = fetch_month_transactions("u1", "jwt", None, "2026-02", deadline=Deadline(0))
+    assert not success
+    assert history.requests == []
+
+
+def test_month_fetch_reports_errors(history):
+    history.respond = lambda request: (400, {"message": "bad range"}, {})
+    success, message = fetch_month_transactions("u1", "jwt", None, "2026-02")
+    assert not success
+    assert "400" in message
+
+
+def test_lean_list_requests_only_the_list_fields(history, monkeypatch):
+    monkeypatch.setattr(transaction_service, "LEAN_TRANSACTION_LIST", True)
+    fields = transaction_service.TRANSACTION_LIST_FIELDS
+    for success, rows in (fetch_month_transactions("u1", "jwt", None, "2026-03"),
+                          fetch_user_transactions("u1", "jwt", None)):
+        assert success
+        assert rows and all(set(txn) == set(fields) for txn in rows)
+    assert {request["params"]["fields"] for request in history.requests} == {",".join(fields)}
+
+
+def test_lean_list_payload_is_smaller_and_faster_to_parse(history, monkeypatch):
+    # Rows shaped like the service's, whose descriptions are most of each row
+    history.respond = functools.partial(serve_history, history=[
+        dict(txn, userId="5f0c2a9e-4b7d-4c1e-9a3f-2d8e6b1c7f40", createdAt=txn["date"],
+             description=f"Card payment {txn['id']} at a grocery store near the office")
+        for txn in HISTORY * 10])
+    payloads = []
+    send = transaction_service.api_request
+
+    def api_request(*args, **kwargs):
+        response = send(*args, **kwargs)
+        payloads.append(response.content)
+        return response
+
+    monkeypatch.setattr(transaction_service, "api_request", api_request)
+    assert fetch_user_transactions("u1", "jwt", None)[0]
+    monkeypatch.setattr(transaction_service, "LEAN_TRANSACTION_LIST", True)
+    assert fetch_user_transactions("u1", "jwt", None)[0]
+    full, lean = payloads
+
+    def parse_seconds(payload):
+        best = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            json.loads(payload)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    assert len(lean) < len(full) / 2
+    assert parse_seconds(lean) < parse_seconds(full)
+
+
+def test_full_list_requests_every_field(history):
+    success, rows = fetch_user_transactions("u1", "jwt", None)
+    assert success
+    assert rows == HISTORY
+    assert "fields" not in history.requests[0]["params"]
+
+
+def test_details_are_fetched_per_transaction(standin):
+    standin.route("transaction_get", "/transactions/{transaction_id}")
+    standin.respond = lambda request: (200, HISTORY[int(request["path"].rsplit("/", 1)[1])], {})
+    assert fetch_transaction(7, "jwt", None) == (True, HISTORY[7])
+    assert standin.requests[0]["path"] == "/transactions/7"
+
+    standin.reply(200, ["not", "a", "transaction"])
+    assert fetch_transaction(8, "jwt", None) == (False, "Unexpected transaction response.")
+    standin.reply(404, {"message": "not found"})
+    assert fetch_transaction(9, "jwt", None)[0] is False
+
+
+@pytest.mark.parametrize("read_bytes", [1, 7, 4096])
+def test_streamed_history_arrives_in_chunks(history, monkeypatch, read_bytes):
+    monkeypatch.setattr(transaction_service, "STREAM_READ_BYTES", read_bytes)
+    monkeypatch.setattr(transaction_service, "STREAM_FIRST_CHUNK_ROWS", 10)
+    monkeypatch.setattr(transaction_service, "STREAM_CHUNK_ROWS", 100)
+    chunks = []
+    success, count = stream_user_transactions("u1", "jwt", None, lambda rows, first, last: chunks.append(
+        (list(rows), first, last)))
+    assert (success, count) == (True, len(HISTORY))
+    assert [len(rows) for rows, _, _ in chunks] == [10, 100, 100, 100, 90]
+    assert [(first, last) for _, first, last in chunks] == [(True, False)] + [(False, False)] * 3 + [(False, True)]
+    assert [txn for rows, _, _ in chunks for txn in rows] == HISTORY
+
+
+def test_streamed_empty_history_reports_one_last_chunk(history):
+    history.respond = lambda request: (200, {"transactions": [], "totalCount": 0}, {})
+    chunks = []
+    assert stream_user_transactions("u1", "jwt", None, lambda *chunk: chunks.append(chunk)) == (True, 0)
+    assert chunks == [([], True, True)]
+
+
+def test_stream_stops_when_cancelled(history, monkeypatch):
+    monkeypatch.setattr(transaction_service, "STREAM_FIRST_CHUNK_ROWS", 10)
+    monkeypatch.setattr(transaction_service, "STREAM_CHUNK_ROWS", 100)
+    chunks = []
+    success, message = stream_user_transactions("u1", "jwt", None, lambda *chunk: chunks.append(chunk),
+                                                cancelled=lambda: bool(chunks))
+    assert not success
+    assert len(chunks) == 1
+
+
+def test_bulk_delete_shares_one_deadline(standin, monkeypatch):
+    standin.route("transaction_delete", "/transactions/{transaction_id}")
+    deadlines = record_deadlines(monkeypatch)
+    assert delete_transactions(list(range(6)), "jwt", None, max_workers=3)[1] == {}
+    assert len(deadlines) == 6
+    assert isinstance(deadlines[0], Deadline)
+    assert all(deadline is deadlines[0] for deadline in deadlines)
+
+
+def test_bulk_delete_past_its_deadline_sends_nothing(standin):
+    standin.route("transaction_delete", "/transactions/{transaction_id}")
+    deleted, failures = delete_transactions(list(range(4)), "jwt", None, deadline=Deadline(0))
+    assert deleted == []
+    assert sorted(failures) == [0, 1, 2, 3]
+    assert standin.requests == []
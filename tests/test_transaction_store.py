@@ -0,0 +1,207 @@
+from datetime import date, timedelta
+
+import pytest
+
+from utils.transaction_store import TransactionStore, month_label
+
+
+def make_rows(count, first_id=1, newest=date(2026, 10, 1)):
+    """Server-ordered (newest first) transactions, about 30 per day."""
+    return [
+        {
+            "id": first_id + i,
+            "transactionType": "Income" if i % 3 == 0 else "Expense",
+            "amount": float(i % 500),
+            "date": f"{newest - timedelta(days=i // 30)}T00:00:00",
+            "category": ("Food", "Rent", "Salary")[i % 3],
+            "description": f"item {i}",
+        }
+        for i in range(count)
+    ]
+
+
+def snapshot(store):
+    """Everything a diff and a rebuild must agree on; rows of the same date may come in any order."""
+    dates = [txn["date"][:10] for txn in store.transactions]
+    assert dates == sorted(dates, reverse=True)
+    return {
+        "ids": sorted(txn["id"] for txn in store.transactions),
+        "groups": {label: sorted(txn["id"] for txn in rows) for label, rows in store.groups.items()},
+        "totals": {label: (round(t["income"], 2), round(t["expense"], 2), t["count"])
+                   for label, t in store.totals.items()},
+        "search": sorted(txn["id"] for txn in store.search_index.search("item 1") or []),
+        "filter": sorted(txn["id"] for txn in store.filter_index.rows(store.filter_index.query(category="Food"))),
+        "by_amount": [txn["amount"] for txn in store.filter_index.sorted_rows("amount")],
+    }
+
+
+def rebuilt(transactions):
+    store = TransactionStore()
+    store.load(transactions)
+    return store
+
+
+@pytest.fixture
+def rows():
+    return make_rows(3000)
+
+
+def test_unchanged_refresh_is_not_applied(rows):
+    store = rebuilt(rows)
+    emitted = []
+    store.changed.connect(lambda: emitted.append(True))
+    assert store.load([dict(txn) for txn in rows]) is False
+    assert emitted == []
+
+
+def test_diff_matches_rebuild(rows):
+    store = rebuilt(rows)
+    store.filter_index.sorted_rows("amount")  # keep a sort permutation live during the patch
+    refreshed = [dict(txn) for txn in rows[:-40] if txn["id"] % 97]
+    refreshed[10]["amount"] = 12345.0
+    refreshed[500]["date"] = "2026-09-01T00:00:00"  # moves to another month
+    refreshed.sort(key=lambda txn: txn["date"][:10], reverse=True)
+    refreshed = make_rows(25, first_id=10_000, newest=date(2026, 10, 2)) + refreshed
+    assert store.load(refreshed) is True
+    assert snapshot(store) == snapshot(rebuilt(refreshed))
+
+
+def test_diff_keeps_pending_changes(rows):
+    store = rebuilt(rows)
+    temp_id = store.add_pending({"date": "2026-09-15", "amount": 1.0, "transactionType": "Expense"})
+    store.delete_pending(rows[5]["id"])
+    store.load(rows[:-10])
+    assert store.find(temp_id)["pending"]
+    assert store.find(rows[5]["id"]) is None
+    snapshot(store)
+
+
+def test_remove_many_matches_rebuild(rows):
+    store = rebuilt(rows)
+    removed = [txn["id"] for txn in rows[::7]]
+    assert len(store.remove_many(removed + [-999])) == len(removed)
+    assert snapshot(store) == snapshot(rebuilt([txn for txn in rows if txn["id"] not in set(removed)]))
+
+
+def test_settled_batch_matches_rebuild_and_repaints_once(rows):
+    store = rebuilt(rows)
+    new = make_rows(4, first_id=10_000, newest=date(2026, 9, 15))
+    temp_ids = [store.add_pending({k: v for k, v in txn.items() if k != "id"}) for txn in new]
+    emitted = []
+    store.changed.connect(lambda: emitted.append(True))
+    store.settle_adds(confirmed=[(temp_id, {"id": txn["id"]}) for temp_id, txn in zip(temp_ids[:2], new)]
+                      + [(temp_ids[2], {"id": rows[0]["id"]})],  # already brought by a refresh
+                      rolled_back=[temp_ids[3], -999])
+    assert emitted == [True]
+    assert snapshot(store) == snapshot(rebuilt(sorted(rows + new[:2], key=lambda txn: txn["date"][:10],
+                                                      reverse=True)))
+
+
+def stream(store, transactions, first_size=50, size=1000, token=None):
+    """Merge transactions into the store in chunks, as stream_user_transactions hands them over."""
+    token = token or object()
+    chunks = [transactions[:first_size]] + [transactions[i:i + size] for i in range(first_size, len(transactions), size)]
+    for i, chunk in enumerate(chunks):
+        store.merge_chunk(token, chunk, i == 0, i == len(chunks) - 1)
+
+
+@pytest.mark.parametrize("first_size, size", [(50, 1000), (7, 401), (30, 300)])
+def test_streamed_first_load_matches_rebuild(rows, first_size, size):
+    store = TransactionStore()
+    stream(store, rows, first_size, size)
+    assert snapshot(store) == snapshot(rebuilt(rows))
+
+
+@pytest.mark.parametrize("first_size, size", [(50, 1000), (7, 401), (30, 300)])
+def test_streamed_refresh_matches_rebuild(rows, first_size, size):
+    store = rebuilt(rows)
+    refreshed = [dict(txn) for txn in rows[:-40] if txn["id"] % 97]
+    refreshed[10]["amount"] = 12345.0
+    refreshed[20]["date"] = "2026-06-01T00:00:00"  # moves to an older month
+    refreshed[2500]["date"] = "2026-09-01T00:00:00"  # moves to a newer month
+    refreshed.sort(key=lambda txn: txn["date"][:10], reverse=True)
+    refreshed = make_rows(25, first_id=10_000, newest=date(2026, 10, 2)) + refreshed
+    stream(store, refreshed, first_size, size)
+    assert snapshot(store) == snapshot(rebuilt(refreshed))
+
+
+def test_superseded_stream_is_ignored(rows):
+    store = TransactionStore()
+    old, new = object(), object()
+    store.merge_chunk(old, rows[:50], True, False)
+    stream(store, rows[:100], token=new)
+    assert store.merge_chunk(old, rows[50:], False, True) is False
+    assert snapshot(store) == snapshot(rebuilt(rows[:100]))
+
+
+def test_diff_only_touches_changed_rows():
+    rows = make_rows(30000)
+    store = rebuilt(rows)
+    refreshed = make_rows(300, first_id=100_000, newest=date(2026, 10, 2)) + rows[:-300]
+    refreshed.sort(key=lambda txn: txn["date"][:10], reverse=True)
+    indexed, emitted = [], []
+    index = store._index
+    store._index = lambda txn, sign, totals=True: (indexed.append(txn["id"]), index(txn, sign, totals))
+    store.changed.connect(lambda: emitted.append(True))
+
+    assert store.load(refreshed) is True
+    assert len(indexed) == 600  # 300 inserted and 300 removed rows, not the 30,000 kept ones
+    assert emitted == [True]
+    assert snapshot(store) == snapshot(rebuilt(refreshed))
+
+
+def newest_months(transactions, max_rows):
+    """The rows of the newest whole months that hold at least max_rows rows."""
+    months, kept = set(), 0
+    for txn in transactions:
+        if txn["date"][:7] not in months:
+            if kept >= max_rows:
+                break
+            months.add(txn["date"][:7])
+        kept += 1
+    return [txn for txn in transactions if txn["date"][:7] in months]
+
+
+def month_totals(store):
+    """Totals of every month, trimmed ones included, as the dashboard shows them."""
+    totals = {label: store.month_totals(label) for label in store.months()}
+    return {label: (round(t["income"], 2), round(t["expense"], 2), t["count"]) for label, t in totals.items()}
+
+
+def test_only_the_newest_months_within_the_budget_are_kept(rows):
+    loaded, streamed = TransactionStore(max_rows=1000), TransactionStore(max_rows=1000)
+    loaded.load(rows)
+    stream(streamed, rows)
+    full = rebuilt(rows)
+    assert len(loaded.transactions) < 2000
+    assert snapshot(loaded) == snapshot(streamed) == snapshot(rebuilt(newest_months(rows, 1000)))
+    assert month_totals(loaded) == month_totals(streamed) == month_totals(full)
+    assert loaded.month_totals() == pytest.approx(full.month_totals())
+
+    # A refresh that now fits drops the trimmed totals
+    stream(streamed, rows[:500], 500)
+    assert streamed.trimmed == {}
+    assert sorted(txn["id"] for txn in streamed.transactions) == sorted(txn["id"] for txn in rows[:500])
+
+
+def test_restored_month_is_trimmed_again_when_released(rows):
+    store = TransactionStore(max_rows=1000)
+    store.load(rows)
+    before, trimmed = snapshot(store), month_totals(store)
+    old_months = [label for label in store.months() if label in store.trimmed]
+    for label in old_months[:2]:
+        store.restore_month(label, [txn for txn in rows if month_label(txn["date"]) == label])
+        assert label not in store.trimmed
+        assert sorted(txn["id"] for txn in store.groups[label]) == sorted(
+            txn["id"] for txn in rows if month_label(txn["date"]) == label)
+        assert month_totals(store) == trimmed
+    assert old_months[0] in store.trimmed  # only one month is restored at a time
+    store.release_month()
+    assert snapshot(store) == before
+    assert month_totals(store) == trimmed
+
+    # A pending add to a trimmed month counts on top of the month's trimmed totals
+    label = old_months[-1]
+    expected = store.month_totals(label)
+    store.add_pending({"date": rows[-1]["date"], "amount": 10.0, "transactionType": "Expense"})
+    assert store.month_totals(label) == dict(expected, expense=expected["expense"] + 10.0, count=expected["count"] + 1)
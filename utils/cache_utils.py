@@ -0,0 +1,167 @@
+import threading
+import logging
+from collections import OrderedDict
+from datetime import date
+
+import appconfig
+
+logger = logging.getLogger(__name__)
+
+MONTH_CACHE_MAX_ROWS = getattr(appconfig, "MONTH_CACHE_MAX_ROWS", 20000)
+MONTH_CACHE_RECENT_MONTHS = getattr(appconfig, "MONTH_CACHE_RECENT_MONTHS", 3)
+
+
+class DataCache:
+    """Thread-safe in-memory cache for API data, keyed by tuples like ("profile", username)."""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if it is not cached."""
+        with self._lock:
+            return self._entries.get(key, default)
+
+    def set(self, key, value):
+        """Store a value under key."""
+        with self._lock:
+            self._entries[key] = value
+        logger.debug(f"Cached {key[0] if isinstance(key, tuple) else key}.")
+
+    def delete(self, key):
+        """Drop a single entry if it is cached."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate(self, namespace):
+        """Drop every entry whose key starts with the given namespace."""
+        with self._lock:
+            stale = [k for k in self._entries if k == namespace or (isinstance(k, tuple) and k[0] == namespace)]
+            for key in stale:
+                del self._entries[key]
+        if stale:
+            logger.debug(f"Invalidated {len(stale)} cached '{namespace}' entries.")
+
+    def clear(self):
+        """Drop all cached data, e.g. on logout."""
+        with self._lock:
+            self._entries.clear()
+        logger.debug("Cleared data cache.")
+
+
+class MonthCache:
+    """
+    Thread-safe cache of fetched transaction months, bounded by a total row budget.
+
+    When the budget is exceeded the least recently used months are evicted, except the
+    most recent months and the month on screen, which stay resident. An evicted month
+    is fetched from the server again when it is selected.
+    """
+
+    def __init__(self, max_rows=MONTH_CACHE_MAX_ROWS, recent_months=MONTH_CACHE_RECENT_MONTHS):
+        self.max_rows = max_rows
+        self.recent_months = recent_months
+        self._months = OrderedDict()  # (user_id, "YYYY-MM") -> transactions, least recently used first
+        self._active = None
+        self._lock = threading.Lock()
+        self.resident_rows = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_rows = 0
+
+    def get(self, user_id, month):
+        """Return the cached transactions of a "YYYY-MM" month, or None if it is not resident."""
+        key = (user_id, month)
+        with self._lock:
+            transactions = self._months.get(key)
+            if transactions is None:
+                self.misses += 1
+                return None
+            self._months.move_to_end(key)
+            self.hits += 1
+            return transactions
+
+    def set(self, user_id, month, transactions):
+        """Store the transactions of a month, evicting old months beyond the budget."""
+        key = (user_id, month)
+        with self._lock:
+            previous = self._months.pop(key, None)
+            if previous is not None:
+                self.resident_rows -= len(previous)
+            self._months[key] = transactions
+            self.resident_rows += len(transactions)
+            self._evict()
+
+    def set_active(self, user_id, month):
+        """Keep the month on screen resident; None when no single month is shown."""
+        with self._lock:
+            self._active = (user_id, month) if month else None
+
+    def delete(self, user_id, month):
+        """Drop one month, e.g. after it changed on the server."""
+        with self._lock:
+            transactions = self._months.pop((user_id, month), None)
+            if transactions is not None:
+                self.resident_rows -= len(transactions)
+
+    def clear(self):
+        """Drop every month, e.g. on logout."""
+        with self._lock:
+            self._months.clear()
+            self.resident_rows = 0
+
+    def _evict(self):
+        """Evict least recently used months until the budget is met; caller holds the lock."""
+        today = date.today()
+        index = today.year * 12 + today.month - 1 - self.recent_months
+        last_old_month = f"{index // 12:04d}-{index % 12 + 1:02d}"
+        for key in list(self._months):
+            if self.resident_rows <= self.max_rows:
+                break
+            if key == self._active or key[1] > last_old_month:
+                continue
+            transactions = self._months.pop(key)
+            self.resident_rows -= len(transactions)
+            self.evictions += 1
+            self.evicted_rows += len(transactions)
+            logger.debug(f"Evicted transactions of {key[1]} ({len(transactions)} rows); "
+                         f"{self.resident_rows}/{self.max_rows} rows resident.")
+
+    def stats(self, store_rows=0):
+        """
+        Resident size and eviction metrics.
+
+        Args:
+            store_rows (int): Rows held by the TransactionStore, counted into total_rows.
+
+        Returns:
+            dict: months, resident_rows, max_rows, store_rows, total_rows, hits, misses,
+                evictions, evicted_rows.
+        """
+        with self._lock:
+            return {
+                "months": len(self._months),
+                "resident_rows": self.resident_rows,
+                "store_rows": store_rows,
+                "total_rows": self.resident_rows + store_rows,
+                "max_rows": self.max_rows,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "evicted_rows": self.evicted_rows,
+            }
+
+    def log_stats(self, store_rows=0):
+        """Write the month cache metrics to the log, with the store's rows in the resident total."""
+        s = self.stats(store_rows)
+        logger.info(f"Month cache: {s['months']} month(s), {s['resident_rows']}/{s['max_rows']} rows resident, "
+                    f"hits={s['hits']}, misses={s['misses']}, evictions={s['evictions']} "
+                    f"({s['evicted_rows']} rows); {s['store_rows']} rows in the transaction store, "
+                    f"{s['total_rows']} resident in total")
+
+
+# Shared caches used by the views and the post-login warm-up
+data_cache = DataCache()
+month_cache = MonthCache()
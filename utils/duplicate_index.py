@@ -0,0 +1,46 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def duplicate_key(transaction):
+    """Normalized (date, amount, type, category, description) tuple of a transaction."""
+    return (
+        str(transaction.get("date") or "")[:10],
+        round(float(transaction.get("amount") or 0), 2),
+        str(transaction.get("transactionType") or "").strip().lower(),
+        str(transaction.get("category") or "").strip().lower(),
+        " ".join(str(transaction.get("description") or "").lower().split()),
+    )
+
+
+class DuplicateIndex:
+    """
+    Hash index of the transactions a user already has, for spotting likely duplicates.
+
+    Keys are counted rather than stored in a set, so removing one of two identical
+    transactions keeps the other indexed. Lookups are a single dict access and safe to
+    make from worker threads while the GUI thread updates the index.
+    """
+
+    def __init__(self):
+        self._counts = {}
+
+    def __len__(self):
+        return len(self._counts)
+
+    def update(self, transaction, sign):
+        """Add (sign=1) or remove (sign=-1) a transaction."""
+        key = duplicate_key(transaction)
+        count = self._counts.get(key, 0) + sign
+        if count > 0:
+            self._counts[key] = count
+        else:
+            self._counts.pop(key, None)
+
+    def contains(self, transaction):
+        """Return True if an equivalent transaction is already indexed."""
+        return duplicate_key(transaction) in self._counts
+
+    def clear(self):
+        self._counts.clear()
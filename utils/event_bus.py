@@ -0,0 +1,124 @@
+import logging
+import time
+from collections import defaultdict
+
+from PySide6.QtCore import QObject, QTimer, Qt, Signal
+
+import appconfig
+
+logger = logging.getLogger(__name__)
+
+EVENT_DEBOUNCE_MS = getattr(appconfig, "EVENT_DEBOUNCE_MS", 150)
+EVENT_MAX_DELAY_MS = getattr(appconfig, "EVENT_MAX_DELAY_MS", 1000)
+
+
+class ChangeEvent:
+    """
+    A data change published by a mutation.
+
+    Args:
+        topic (str): Kind of data that changed, e.g. "transactions".
+        action (str): What happened, e.g. "added" or "deleted".
+        entity_id: Id of the changed record, if known.
+        month (str): Month the record belongs to as "YYYY-MM", if known.
+        local (bool): True if the change was already applied to the local data, so
+            subscribers holding that data need not reload it.
+    """
+
+    def __init__(self, topic, action, entity_id=None, month=None, local=False):
+        self.topic = topic
+        self.action = action
+        self.entity_id = entity_id
+        self.month = month
+        self.local = local
+
+    def __repr__(self):
+        return f"ChangeEvent({self.topic!r}, {self.action!r}, {self.entity_id!r}, {self.month!r}, local={self.local})"
+
+
+def month_of(date_str):
+    """Return the "YYYY-MM" month of an ISO date string such as "2024-05-17T00:00:00"."""
+    return date_str[:7] if date_str and len(date_str) >= 7 else None
+
+
+class EventBus(QObject):
+    """
+    Application-wide publish/subscribe bus for data change events.
+
+    Events are collected and delivered in batches: each subscriber is called once per
+    topic with every event published since the last delivery. Delivery waits until no
+    new event arrived for EVENT_DEBOUNCE_MS, but never longer than EVENT_MAX_DELAY_MS
+    after the first pending event, so a burst of changes causes one refresh.
+    """
+
+    _published = Signal(object)
+
+    def __init__(self, debounce_ms=EVENT_DEBOUNCE_MS, max_delay_ms=EVENT_MAX_DELAY_MS, parent=None):
+        super().__init__(parent)
+        self.debounce_ms = debounce_ms
+        self.max_delay_ms = max_delay_ms
+        self._subscribers = defaultdict(list)
+        self._pending = []
+        self._first_pending_at = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        # publish() may be called from worker threads; the timer is only touched on the GUI thread
+        self._published.connect(self._enqueue, Qt.QueuedConnection)
+
+    def subscribe(self, topic, callback):
+        """Call callback(events) with each batch of events published on topic."""
+        if callback not in self._subscribers[topic]:
+            self._subscribers[topic].append(callback)
+
+    def unsubscribe(self, topic, callback):
+        """Stop delivering events on topic to callback."""
+        if callback in self._subscribers[topic]:
+            self._subscribers[topic].remove(callback)
+
+    def publish(self, event):
+        """Queue a change event for the next batch; safe to call from any thread."""
+        logger.debug(f"Published {event}.")
+        self._published.emit(event)
+
+    def _enqueue(self, event):
+        now = time.monotonic()
+        if not self._pending:
+            self._first_pending_at = now
+        self._pending.append(event)
+        remaining_ms = self.max_delay_ms - (now - self._first_pending_at) * 1000
+        self._timer.start(max(0, int(min(self.debounce_ms, remaining_ms))))
+
+    def flush(self):
+        """Deliver all pending events now."""
+        self._timer.stop()
+        events, self._pending = self._pending, []
+        if not events:
+            return
+        by_topic = defaultdict(list)
+        for event in events:
+            by_topic[event.topic].append(event)
+        for topic, topic_events in by_topic.items():
+            logger.debug(f"Delivering {len(topic_events)} '{topic}' event(s) to "
+                         f"{len(self._subscribers[topic])} subscriber(s).")
+            for callback in list(self._subscribers[topic]):
+                try:
+                    callback(topic_events)
+                except Exception:
+                    logger.exception(f"Subscriber {callback} failed to handle '{topic}' events.")
+
+    def discard_pending(self):
+        """Drop undelivered events, e.g. on logout."""
+        self._timer.stop()
+        self._pending = []
+
+
+_event_bus = None
+
+
+def get_event_bus():
+    """Return the application-wide event bus, creating it on first use."""
+    global _event_bus
+    if _event_bus is None:
+        _event_bus = EventBus()
+    return _event_bus
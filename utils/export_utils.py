@@ -0,0 +1,138 @@
+import csv
+import json
+import logging
+import os
+
+import requests
+
+from services.transaction_service import iter_user_transactions
+
+logger = logging.getLogger(__name__)
+
+TRANSACTION_EXPORT_FIELDS = ("id", "date", "transactionType", "category", "amount", "description")
+PROGRESS_EVERY = 200  # rows written between progress callbacks
+
+
+class ExportCancelled(Exception):
+    """Raised inside write_rows when the caller asked the export to stop."""
+
+
+def export_format(path):
+    """"json" for .json, "jsonl" for .jsonl/.ndjson files, otherwise "csv"."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".json":
+        return "json"
+    return "jsonl" if extension in (".jsonl", ".ndjson") else "csv"
+
+
+def write_rows(rows, path, fields, on_progress=None, cancelled=None):
+    """
+    Stream rows to a CSV, JSON (one array) or JSON Lines file, chosen by the file extension.
+
+    Rows are consumed one at a time from any iterable, so memory does not grow with the
+    number of rows. The file is written under a temporary name and moved into place at
+    the end, so a failed or cancelled export never leaves a truncated file behind.
+
+    Args:
+        rows (iterable): Dicts to write; keys outside fields are dropped.
+        fields (tuple): Column names, in output order.
+        on_progress (callable): Called as on_progress(rows written) every PROGRESS_EVERY rows.
+        cancelled (callable): Returns True once the export should stop.
+
+    Returns:
+        int: Number of rows written, or None if the export was cancelled.
+    """
+    temp_path = f"{path}.part"
+    file_format = export_format(path)
+    written = 0
+    try:
+        with open(temp_path, "w", newline="", encoding="utf-8") as f:
+            if file_format == "csv":
+                writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+                writer.writeheader()
+                write = writer.writerow
+            elif file_format == "jsonl":
+                def write(row):
+                    f.write(json.dumps({field: row.get(field) for field in fields}) + "\n")
+            else:
+                # The array is written an item at a time, like the other formats
+                f.write("[")
+
+                def write(row):
+                    f.write(("," if written else "") + "\n" + json.dumps({field: row.get(field) for field in fields}))
+            for row in rows:
+                write(row)
+                written += 1
+                if written % PROGRESS_EVERY == 0:
+                    if cancelled and cancelled():
+                        raise ExportCancelled()
+                    if on_progress:
+                        on_progress(written)
+            if file_format == "json":
+                f.write("\n]\n" if written else "]\n")
+        os.replace(temp_path, path)
+    except ExportCancelled:
+        os.remove(temp_path)
+        logger.info(f"Export to {path} cancelled after {written} rows.")
+        return None
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    if on_progress:
+        on_progress(written)
+    logger.info(f"Exported {written} rows to {path}.")
+    return written
+
+
+def _export_row(transaction):
+    return dict(transaction, date=str(transaction.get("date", ""))[:10])
+
+
+def export_transactions(path, user_id, jwt_token, subscription_key, on_progress=None, cancelled=None):
+    """
+    Export the full transaction history of a user, streamed page by page from the server.
+
+    Args:
+        on_progress (callable): Called as on_progress(rows written, total rows or 0).
+
+    Returns:
+        tuple: (success: bool, rows written: int | message: str)
+    """
+    total = 0
+
+    def set_total(count):
+        nonlocal total
+        total = count
+
+    def report(written):
+        if on_progress:
+            on_progress(written, total)
+
+    pages = iter_user_transactions(user_id, jwt_token, subscription_key, on_total=set_total)
+    try:
+        written = write_rows(map(_export_row, pages), path, TRANSACTION_EXPORT_FIELDS, report, cancelled)
+    except (requests.exceptions.RequestException, OSError) as e:
+        logger.error(f"Exporting transactions to {path} failed: {e}")
+        return False, f"Export failed: {e}"
+    if written is None:
+        return False, "Export cancelled."
+    return True, written
+
+
+def export_report(path, rows, fields, on_progress=None, cancelled=None):
+    """
+    Export the rows of a report, e.g. its category breakdown.
+
+    Returns:
+        tuple: (success: bool, rows written: int | message: str)
+    """
+    report = (lambda written: on_progress(written, 0)) if on_progress else None
+    try:
+        written = write_rows(rows, path, fields, report, cancelled)
+    except OSError as e:
+        logger.error(f"Exporting report to {path} failed: {e}")
+        return False, f"Export failed: {e}"
+    if written is None:
+        return False, "Export cancelled."
+    return True, written
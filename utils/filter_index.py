@@ -0,0 +1,176 @@
+import bisect
+import logging
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = ("transactionType", "category", "month")
+SORT_KEYS = {
+    "transactionType": lambda txn: str(txn.get("transactionType") or ""),
+    "amount": lambda txn: float(txn.get("amount") or 0),
+    "date": lambda txn: str(txn.get("date") or "")[:10],
+}
+
+
+def popcount(bits):
+    """Number of set bits (int.bit_count needs Python 3.10)."""
+    return bin(bits).count("1")
+
+
+class FilterIndex:
+    """
+    Bitmap indexes for combining dashboard filters without rescanning the transactions.
+
+    Every transaction gets a slot number; each category, type and month ("YYYY-MM")
+    has a bitmap (a Python int) with the bits of its slots set, and amounts are kept
+    in a sorted list for range lookups. A combined filter is the AND of a few bitmaps,
+    and match counts are bit counts. Bitmaps are built from per-value slot sets on first
+    use and then updated in place, so a bulk load stays linear.
+
+    For sorting, each column in SORT_KEYS keeps a permutation: (value, slot) pairs in
+    ascending order, sorted once after a load and then maintained by binary insertion.
+    Descending order walks the same list backwards, so no records are copied or re-sorted.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Empty the index before a bulk load."""
+        self._rows = []  # slot -> transaction, None for a free slot
+        self._free_slots = []
+        self._slots = {}  # transaction id -> slot
+        self._members = {dimension: {} for dimension in DIMENSIONS}  # dimension -> value -> set of slots
+        self._bitmaps = {}  # (dimension, value) -> bitmap, built on demand
+        self._all = None  # bitmap of all occupied slots, built on demand
+        self._orders = dict.fromkeys(SORT_KEYS)  # sort key -> sorted (value, slot) pairs, built on demand
+
+    @staticmethod
+    def _values(transaction):
+        return {
+            "transactionType": transaction.get("transactionType"),
+            "category": transaction.get("category"),
+            "month": str(transaction.get("date") or "")[:7],
+        }
+
+    def update(self, transaction, sign):
+        """Add (sign=1) or remove (sign=-1) a transaction."""
+        if sign > 0:
+            slot = self._free_slots.pop() if self._free_slots else len(self._rows)
+            if slot == len(self._rows):
+                self._rows.append(transaction)
+            else:
+                self._rows[slot] = transaction
+            self._slots[transaction.get("id")] = slot
+        else:
+            slot = self._slots.pop(transaction.get("id"), None)
+            if slot is None:
+                return
+            transaction = self._rows[slot]
+            self._rows[slot] = None
+            self._free_slots.append(slot)
+
+        bit = 1 << slot
+        for dimension, value in self._values(transaction).items():
+            members = self._members[dimension].setdefault(value, set())
+            key = (dimension, value)
+            if sign > 0:
+                members.add(slot)
+                if key in self._bitmaps:
+                    self._bitmaps[key] |= bit
+            else:
+                members.discard(slot)
+                if not members:
+                    del self._members[dimension][value]
+                    self._bitmaps.pop(key, None)
+                elif key in self._bitmaps:
+                    self._bitmaps[key] &= ~bit
+        if self._all is not None:
+            self._all = self._all | bit if sign > 0 else self._all & ~bit
+        for key, order in self._orders.items():
+            if order is None:
+                continue
+            entry = (SORT_KEYS[key](transaction), slot)
+            if sign > 0:
+                bisect.insort(order, entry)
+            else:
+                del order[bisect.bisect_left(order, entry)]
+
+    def _to_bitmap(self, slots):
+        buffer = bytearray(len(self._rows) // 8 + 1)
+        for slot in slots:
+            buffer[slot >> 3] |= 1 << (slot & 7)
+        return int.from_bytes(buffer, "little")
+
+    def values(self, dimension):
+        """Values of a dimension that occur in the index, sorted."""
+        return sorted(value for value in self._members[dimension] if value is not None)
+
+    def bitmap(self, dimension, value):
+        """Bitmap of the transactions whose dimension equals value."""
+        key = (dimension, value)
+        if key not in self._bitmaps:
+            self._bitmaps[key] = self._to_bitmap(self._members[dimension].get(value, ()))
+        return self._bitmaps[key]
+
+    def all(self):
+        """Bitmap of every indexed transaction."""
+        if self._all is None:
+            self._all = self._to_bitmap(self._slots.values())
+        return self._all
+
+    def _order(self, key):
+        if self._orders[key] is None:
+            value = SORT_KEYS[key]
+            self._orders[key] = sorted((value(txn), slot) for slot, txn in enumerate(self._rows) if txn is not None)
+        return self._orders[key]
+
+    def amount_range(self, minimum=None, maximum=None):
+        """Bitmap of the transactions with minimum <= amount <= maximum."""
+        amounts = self._order("amount")
+        start = 0 if minimum is None else bisect.bisect_left(amounts, (minimum, -1))
+        end = len(amounts) if maximum is None else bisect.bisect_right(amounts, (maximum, len(self._rows)))
+        return self._to_bitmap(slot for _, slot in amounts[start:end])
+
+    def ids(self, transaction_ids):
+        """Bitmap of the given transaction ids, e.g. search results."""
+        return self._to_bitmap(self._slots[i] for i in transaction_ids if i in self._slots)
+
+    def query(self, transaction_type=None, category=None, month=None, min_amount=None, max_amount=None):
+        """
+        Bitmap of the transactions matching every given filter.
+
+        Args:
+            transaction_type, category (str): Exact value, or None for any.
+            month (str): "YYYY-MM", or None for any.
+            min_amount, max_amount (float): Inclusive amount bounds, or None.
+        """
+        bits = self.all()
+        for dimension, value in (("transactionType", transaction_type), ("category", category), ("month", month)):
+            if value is not None:
+                bits &= self.bitmap(dimension, value)
+        if min_amount is not None or max_amount is not None:
+            bits &= self.amount_range(min_amount, max_amount)
+        return bits
+
+    def rows(self, bits):
+        """Transactions of the set bits, in slot order."""
+        rows = []
+        for index, byte in enumerate(bits.to_bytes(bits.bit_length() // 8 + 1, "little")):
+            if byte:
+                base = index * 8
+                rows.extend(self._rows[base + bit] for bit in range(8) if byte >> bit & 1)
+        return rows
+
+    def sorted_rows(self, key, descending=False, bits=None):
+        """
+        Transactions ordered by a SORT_KEYS column, optionally only those of a bitmap.
+
+        Returns:
+            list: References to the indexed transactions, in sort order.
+        """
+        order = self._order(key)
+        entries = reversed(order) if descending else iter(order)
+        if bits is None:
+            return [self._rows[slot] for _, slot in entries]
+        mask = bits.to_bytes(len(self._rows) // 8 + 1, "little")
+        return [self._rows[slot] for _, slot in entries if mask[slot >> 3] >> (slot & 7) & 1]
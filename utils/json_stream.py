@@ -0,0 +1,108 @@
+import codecs
+import json
+import re
+
+NON_WHITESPACE = re.compile(r"\S")
+NUMBER_CHARS = frozenset("0123456789.eE+-")
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    """Text cursor over a JSON document that arrives as a sequence of byte chunks."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decode = codecs.getincrementaldecoder("utf-8")().decode
+        self._text = ""
+        self._pos = 0
+
+    def _fill(self):
+        """Append the next chunk, dropping the consumed text; False at the end of the input."""
+        for chunk in self._chunks:
+            if chunk:
+                self._text = self._text[self._pos:] + self._decode(chunk)
+                self._pos = 0
+                return True
+        return False
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            match = NON_WHITESPACE.search(self._text, self._pos)
+            if match:
+                self._pos = match.start()
+                return self._text[self._pos]
+            self._pos = len(self._text)
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document")
+
+    def take(self):
+        """Consume and return the next non-whitespace character."""
+        char = self.peek()
+        self._pos += 1
+        return char
+
+    def expect(self, char):
+        """Consume the next non-whitespace character, which must be char."""
+        found = self.take()
+        if found != char:
+            raise ValueError(f"Expected '{char}' in JSON document, found '{found}'")
+
+    def value(self):
+        """Decode the next complete JSON value, reading more chunks until it is whole."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._text, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number cut by a chunk boundary decodes early ("12." as 12): read on while
+            # the buffer ends at it or the next character could continue it
+            if isinstance(value, (int, float)) and not isinstance(value, bool) \
+                    and (end == len(self._text) or self._text[end] in NUMBER_CHARS) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def iter_array_items(chunks, key):
+    """
+    Yield the items of the array stored under key in a JSON object, as its bytes arrive.
+
+    Only the unparsed tail of the document and the item being decoded are buffered, so
+    the caller can use the first items while the rest is still downloading.
+
+    Args:
+        chunks (iterable): Byte chunks of the document, e.g. response.iter_content().
+        key (str): Top-level key of the array; nothing is yielded if it is missing.
+
+    Raises:
+        ValueError: The document is not valid JSON or ends early.
+    """
+    reader = _Reader(chunks)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        name = reader.value()
+        reader.expect(":")
+        if name != key:
+            reader.value()
+        else:
+            reader.expect("[")
+            if reader.peek() == "]":
+                return
+            while True:
+                yield reader.value()
+                separator = reader.take()
+                if separator == "]":
+                    return
+                if separator != ",":
+                    raise ValueError(f"Expected ',' or ']' in JSON array, found '{separator}'")
+        separator = reader.take()
+        if separator == "}":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or '}}' in JSON object, found '{separator}'")
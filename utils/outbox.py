@@ -0,0 +1,205 @@
+import json
+import logging
+import os
+import time
+import uuid
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+import appconfig
+from services.transaction_service import submit_transaction
+from utils.event_bus import get_event_bus, ChangeEvent, month_of
+from utils.task_executor import get_executor, TaskPriority
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_PATH = getattr(appconfig, "OUTBOX_PATH", "outbox.jsonl")
+OUTBOX_BATCH_SIZE = getattr(appconfig, "OUTBOX_BATCH_SIZE", 10)
+OUTBOX_RETRY_SECONDS = getattr(appconfig, "OUTBOX_RETRY_SECONDS", 5)
+OUTBOX_MAX_RETRY_SECONDS = getattr(appconfig, "OUTBOX_MAX_RETRY_SECONDS", 300)
+DUPLICATE_SUBMIT_SECONDS = 2  # an identical transaction queued this recently is a double submit
+
+
+def send_batch(entries, jwt_token, subscription_key):
+    """
+    Send queued transactions in order; runs on a worker thread.
+
+    Stops at the first transaction that has to be retried, so later entries are never
+    stored before earlier ones. The entry id is sent as the idempotency key, so an entry
+    resent after a lost response or a restart is only stored once.
+
+    Returns:
+        list: (entry_id, outcome, payload) for each entry that was attempted.
+    """
+    results = []
+    for entry in entries:
+        outcome, payload = submit_transaction(entry["transaction"], jwt_token, subscription_key,
+                                              idempotency_key=entry["entry_id"])
+        results.append((entry["entry_id"], outcome, payload))
+        if outcome == "retry":
+            break
+    return results
+
+
+class Outbox(QObject):
+    """
+    Durable write-behind queue for new transactions.
+
+    Each transaction is appended to a JSON-lines journal on disk before anything is
+    sent, shown in the TransactionStore as pending, and flushed to the server in order,
+    in batches, from the background. When the service is unreachable the queue is kept
+    and retried with exponential backoff, or as soon as its circuit breaker closes.
+    Entries left from an earlier session are sent when their user logs in again.
+    """
+
+    rejected = Signal(str)  # message of a queued transaction the server refused
+    pending_changed = Signal(int)  # number of queued transactions of the current user
+
+    def __init__(self, store, path=OUTBOX_PATH, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.path = path
+        self.entries = self._replay()
+        self.user_id = None
+        self.jwt_token = None
+        self.subscription_key = None
+        self._temp_ids = {}  # entry id -> temporary id of its pending row in the store
+        self._flushing = False
+        self._retry_delay = OUTBOX_RETRY_SECONDS
+        self._retry_timer = QTimer(self)
+        self._retry_timer.setSingleShot(True)
+        self._retry_timer.timeout.connect(self.flush)
+        if self.entries:
+            logger.info(f"Outbox holds {len(self.entries)} unsent transaction(s) from an earlier session.")
+
+    def start(self, user_id, jwt_token, subscription_key):
+        """Show the user's queued transactions as pending and start sending them."""
+        self.user_id = user_id
+        self.jwt_token = jwt_token
+        self.subscription_key = subscription_key
+        for entry in self._user_entries():
+            if entry["entry_id"] not in self._temp_ids:
+                self._temp_ids[entry["entry_id"]] = self.store.add_pending(entry["transaction"])
+        self.pending_changed.emit(len(self._user_entries()))
+        self.flush()
+
+    def stop(self):
+        """Stop sending, e.g. on logout; queued entries stay in the journal."""
+        self.user_id = None
+        self.jwt_token = None
+        self._retry_timer.stop()
+        self._temp_ids.clear()
+        self._retry_delay = OUTBOX_RETRY_SECONDS
+        self.pending_changed.emit(0)
+
+    def enqueue(self, transaction):
+        """
+        Journal a new transaction, show it as pending and try to send it.
+
+        Returns:
+            bool: False if the same transaction was queued moments ago and this one was dropped.
+        """
+        now = time.time()
+        if any(entry["transaction"] == transaction and now - entry["queued_at"] < DUPLICATE_SUBMIT_SECONDS
+               for entry in self._user_entries()):
+            logger.warning("Ignoring duplicate submission of a transaction that is still queued.")
+            return False
+        entry = {
+            "entry_id": uuid.uuid4().hex,
+            "user_id": self.user_id,
+            "queued_at": now,
+            "transaction": transaction,
+        }
+        with open(self.path, "a", encoding="utf-8") as journal:
+            journal.write(json.dumps(entry) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+        self.entries.append(entry)
+        self._temp_ids[entry["entry_id"]] = self.store.add_pending(transaction)
+        self.pending_changed.emit(len(self._user_entries()))
+        self.flush()
+        return True
+
+    def flush(self):
+        """Send the next batch of the current user's queued transactions."""
+        batch = self._user_entries()[:OUTBOX_BATCH_SIZE]
+        if self._flushing or not self.user_id or not batch:
+            return
+        self._flushing = True
+        self._retry_timer.stop()
+        logger.debug(f"Flushing {len(batch)} queued transaction(s).")
+        get_executor().submit(
+            "outbox_flush", send_batch, batch, self.jwt_token, self.subscription_key,
+            priority=TaskPriority.NORMAL,
+            on_result=self._on_flushed,
+            on_error=lambda error: self._on_flushed([]),
+        )
+
+    def _on_flushed(self, results):
+        """Apply the outcome of a batch, then continue or schedule a retry."""
+        self._flushing = False
+        retry = not results
+        finished = 0
+        confirmed, rolled_back, events, rejections = [], [], [], []
+        for entry_id, outcome, payload in results:
+            if outcome == "retry":
+                retry = True
+                break
+            entry = next(e for e in self.entries if e["entry_id"] == entry_id)
+            self.entries.remove(entry)
+            finished += 1
+            temp_id = self._temp_ids.pop(entry_id, None)
+            if temp_id is None:
+                continue  # the user logged out while the batch was in flight
+            if outcome == "created":
+                confirmed.append((temp_id, payload))
+                events.append(ChangeEvent(
+                    "transactions", "added", payload.get("id"), month_of(entry["transaction"]["date"]),
+                    local="id" in payload,
+                ))
+            else:
+                rolled_back.append(temp_id)
+                rejections.append(payload)
+        if finished:
+            self._compact()
+            # The whole batch lands in the store at once, so the views repaint once
+            self.store.settle_adds(confirmed, rolled_back)
+            for event in events:
+                get_event_bus().publish(event)
+            for message in rejections:
+                self.rejected.emit(message)
+        self.pending_changed.emit(len(self._user_entries()))
+
+        if retry:
+            logger.info(f"{len(self._user_entries())} transaction(s) still queued; retrying in {self._retry_delay}s.")
+            self._retry_timer.start(int(self._retry_delay * 1000))
+            self._retry_delay = min(self._retry_delay * 2, OUTBOX_MAX_RETRY_SECONDS)
+        else:
+            self._retry_delay = OUTBOX_RETRY_SECONDS
+            self.flush()
+
+    def _user_entries(self):
+        return [entry for entry in self.entries if entry["user_id"] == self.user_id]
+
+    def _replay(self):
+        """Load the entries that were journaled but not yet sent."""
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path, encoding="utf-8") as journal:
+            for line in journal:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    logger.warning("Skipping incomplete outbox journal line.")
+        return entries
+
+    def _compact(self):
+        """Atomically rewrite the journal with only the entries still queued."""
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as journal:
+            for entry in self.entries:
+                journal.write(json.dumps(entry) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+        os.replace(temp_path, self.path)
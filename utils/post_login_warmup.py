@@ -0,0 +1,106 @@
+import functools
+import logging
+from datetime import date
+
+from PySide6.QtCore import QObject, Signal
+
+from services.report_service import fetch_monthly_summary
+from services.transaction_service import (
+    fetch_user_transactions, fetch_month_transactions, stream_user_transactions,
+    FETCH_TRANSACTIONS_BY_MONTH, STREAM_TRANSACTIONS
+)
+from services.user_service import fetch_user_profile
+from utils.cache_utils import data_cache, month_cache
+from utils.task_executor import get_executor, RequestScope, TaskPriority
+
+logger = logging.getLogger(__name__)
+
+
+class PostLoginWarmup(QObject):
+    """
+    Load the dashboard transactions, the user profile and the current-month summary
+    concurrently right after login.
+
+    Each result is emitted as soon as it arrives, so the dashboard renders first; the
+    profile and summary are kept in the shared data cache so their screens open from it.
+    """
+
+    transactions_ready = Signal(list)
+    transactions_streamed = Signal(object, list, bool, bool)  # stream token, rows, first, last chunk
+    profile_ready = Signal(dict)
+    summary_ready = Signal(int, int, list)  # year, month, report data
+    load_failed = Signal(str, str)  # resource name, error message
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.request_scope = RequestScope("PostLoginWarmup")
+
+    def start(self, user_id, username, jwt_token, subscription_key):
+        """Submit all warm-up fetches; results are delivered through the signals."""
+        today = date.today()
+        executor = get_executor()
+        # A new login supersedes the warm-up of the previous session
+        token = self.request_scope.begin()
+        logger.info("Starting post-login warm-up.")
+        # The dashboard is on screen and waiting; profile and report data are speculative
+        streamed = False
+        if FETCH_TRANSACTIONS_BY_MONTH:
+            # The dashboard opens on the current month, so only that month is fetched
+            month = today.strftime("%Y-%m")
+            fn, args = fetch_month_transactions, (month,)
+        else:
+            month = None
+            fn, args = fetch_user_transactions, ()
+            if STREAM_TRANSACTIONS:
+                # The first rows are shown while the rest of the history downloads
+                streamed = True
+                fn = functools.partial(
+                    stream_user_transactions, cancelled=lambda: token.cancelled,
+                    on_rows=lambda rows, first, last: self.transactions_streamed.emit(token, rows, first, last),
+                )
+        executor.submit(
+            "warmup_transactions", fn, user_id, jwt_token, subscription_key, *args,
+            priority=TaskPriority.NORMAL, token=token,
+            on_result=lambda result: self._on_transactions(user_id, month, result, streamed),
+        )
+        executor.submit(
+            "warmup_profile", fetch_user_profile, username, jwt_token,
+            priority=TaskPriority.BACKGROUND, token=token,
+            on_result=lambda result: self._on_profile(username, result),
+        )
+        executor.submit(
+            "warmup_summary", fetch_monthly_summary, user_id, jwt_token, subscription_key, today.year, today.month,
+            priority=TaskPriority.BACKGROUND, token=token,
+            on_result=lambda result: self._on_summary(user_id, today.year, today.month, result),
+        )
+
+    def _on_transactions(self, user_id, month, result, streamed):
+        success, data = result
+        if success:
+            # The full history is not cached; the dashboard store keeps it
+            if month:
+                month_cache.set(user_id, month, data)
+            if not streamed:
+                self.transactions_ready.emit(data)
+        else:
+            self.load_failed.emit("transactions", data)
+
+    def _on_profile(self, username, result):
+        success, data = result
+        if success:
+            data_cache.set(("profile", username), data)
+            self.profile_ready.emit(data)
+        else:
+            self.load_failed.emit("profile", data)
+
+    def _on_summary(self, user_id, year, month, result):
+        success, data = result
+        if success:
+            data_cache.set(("monthly_summary", user_id, year, month), data)
+            self.summary_ready.emit(year, month, data)
+        else:
+            self.load_failed.emit("monthly_summary", data)
+
+    def cancel(self):
+        """Drop any warm-up still in flight, e.g. on logout."""
+        self.request_scope.cancel_all()
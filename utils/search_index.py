@@ -0,0 +1,89 @@
+import bisect
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(str(text or "").lower())
+
+
+class SearchIndex:
+    """
+    Inverted index from description and category tokens to transaction ids.
+
+    Every query token is matched as a prefix, so results update while a word is being
+    typed; a prefix is resolved with a binary search over the sorted vocabulary instead
+    of scanning descriptions. The index is updated per transaction, and the sorted
+    vocabulary is rebuilt lazily after a bulk load.
+    """
+
+    def __init__(self):
+        self._postings = {}  # token -> set of transaction ids
+        self._documents = {}  # transaction id -> transaction
+        self._vocabulary = []  # sorted tokens; None until the next query after a bulk load
+
+    def update(self, transaction, sign):
+        """Add (sign=1) or remove (sign=-1) a transaction."""
+        transaction_id = transaction.get("id")
+        tokens = set(tokenize(transaction.get("description")) + tokenize(transaction.get("category")))
+        if sign > 0:
+            self._documents[transaction_id] = transaction
+            for token in tokens:
+                ids = self._postings.get(token)
+                if ids is None:
+                    ids = self._postings[token] = set()
+                    if self._vocabulary is not None:
+                        bisect.insort(self._vocabulary, token)
+                ids.add(transaction_id)
+        else:
+            self._documents.pop(transaction_id, None)
+            for token in tokens:
+                ids = self._postings.get(token)
+                if ids is None:
+                    continue
+                ids.discard(transaction_id)
+                if not ids:
+                    del self._postings[token]
+                    if self._vocabulary is not None:
+                        del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+
+    def clear(self):
+        """Empty the index before a bulk load."""
+        self._postings.clear()
+        self._documents.clear()
+        self._vocabulary = None
+
+    def _prefix_ids(self, prefix):
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        ids = set()
+        index = bisect.bisect_left(self._vocabulary, prefix)
+        while index < len(self._vocabulary) and self._vocabulary[index].startswith(prefix):
+            ids |= self._postings[self._vocabulary[index]]
+            index += 1
+        return ids
+
+    def search(self, query):
+        """
+        Return the transactions matching every word of query as a prefix, newest first.
+
+        Returns:
+            list: Matching transactions, or None if the query has no words.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return None
+        matches = None
+        for token in sorted(set(tokens), key=len, reverse=True):  # longer prefixes match fewer ids
+            ids = self._prefix_ids(token)
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return []
+        results = [self._documents[transaction_id] for transaction_id in matches]
+        results.sort(key=lambda txn: txn["date"][:10], reverse=True)
+        return results
@@ -0,0 +1,164 @@
+import csv
+import logging
+import os
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+TRANSACTION_FIELDS = ("transactionType", "amount", "date", "category", "description")
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%m/%d/%y", "%d.%m.%Y", "%Y/%m/%d", "%Y%m%d")
+# Type values (CSV words and OFX TRNTYPE codes) that say which way the money went; any
+# other type (XFER, OTHER, ...) leaves it to the sign of the amount
+INCOME_TYPES = {"income", "credit", "cr", "deposit", "dep", "directdep", "int", "div", "refund"}
+EXPENSE_TYPES = {"expense", "debit", "dr", "withdrawal", "directdebit", "fee", "srvchg", "atm", "pos", "check",
+                 "payment", "repeatpmt", "cash"}
+DEFAULT_CATEGORIES = {"Income": "Other Income", "Expense": "Miscellaneous"}
+OFX_CHUNK_SIZE = 64 * 1024
+
+
+def is_ofx(path):
+    """Return True for OFX/QFX statements (by file extension)."""
+    return os.path.splitext(path)[1].lower() in (".ofx", ".qfx")
+
+
+def csv_headers(path):
+    """Return the column names in the first row of a CSV file."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return next(csv.reader(f), [])
+
+
+def guess_mapping(headers):
+    """Guess which CSV column holds each transaction field from the column names."""
+    hints = {
+        "transactionType": ("type", "transaction type", "credit/debit", "dr/cr"),
+        "amount": ("amount", "value", "sum"),
+        "date": ("date", "posted", "posting date", "transaction date"),
+        "category": ("category",),
+        "description": ("description", "memo", "details", "payee", "name", "narrative"),
+    }
+    mapping = {}
+    for field, names in hints.items():
+        for header in headers:
+            if header.strip().lower() in names or any(name in header.strip().lower() for name in names[:1]):
+                mapping[field] = header
+                break
+    return mapping
+
+
+def count_rows(path):
+    """Count the transactions in a statement without loading it into memory."""
+    if is_ofx(path):
+        return sum(1 for _ in _iter_ofx_records(path))
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        # Blank lines are skipped the way csv.DictReader skips them when importing
+        return sum(1 for row in reader if row)
+
+
+def iter_statement(path, mapping=None):
+    """
+    Stream the transactions of a CSV or OFX statement with constant memory.
+
+    Args:
+        path (str): Statement file.
+        mapping (dict): For CSV files, transaction field -> column name.
+
+    Yields:
+        tuple: (row index, transaction dict or None, error message or None)
+    """
+    records = _iter_ofx_records(path) if is_ofx(path) else _iter_csv_records(path, mapping or {})
+    for index, record in enumerate(records):
+        try:
+            yield index, normalize_transaction(record, signed=is_ofx(path)), None
+        except (ValueError, KeyError) as e:
+            yield index, None, str(e)
+
+
+def _iter_csv_records(path, mapping):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            yield {field: row.get(column, "") for field, column in mapping.items() if column}
+
+
+def _iter_ofx_records(path):
+    """Yield the STMTTRN blocks of an OFX file (SGML or XML flavour) as field dicts."""
+    fields = {"TRNTYPE": "transactionType", "TRNAMT": "amount", "DTPOSTED": "date", "NAME": "description",
+              "MEMO": "memo"}
+    current = None
+    pending = ""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        while True:
+            chunk = f.read(OFX_CHUNK_SIZE)
+            tokens = (pending + chunk).split("<")
+            # The last token may continue in the next chunk
+            pending = tokens.pop() if chunk else ""
+            for token in tokens:
+                tag, _, value = token.partition(">")
+                tag = tag.strip().upper()
+                if tag == "STMTTRN":
+                    current = {}
+                elif tag == "/STMTTRN" and current is not None:
+                    if current.get("memo") and not current.get("description"):
+                        current["description"] = current["memo"]
+                    current.pop("memo", None)
+                    yield current
+                    current = None
+                elif current is not None and tag in fields:
+                    current[fields[tag]] = value.strip()
+            if not chunk:
+                break
+
+
+def parse_amount(text):
+    """Parse amounts such as "1,234.56", "$-12" or "(12.00)"."""
+    text = str(text).strip().replace(",", "").replace("$", "").replace(" ", "")
+    negative = text.startswith("(") and text.endswith(")")
+    value = float(text.strip("()"))
+    return -value if negative else value
+
+
+def parse_date(text):
+    """Parse a statement date into YYYY-MM-DD; OFX dates like 20240115120000[-5:EST] are supported."""
+    text = str(text).strip()
+    if text[:8].isdigit() and (len(text) == 8 or not text[8:9].isdigit() or len(text) >= 14):
+        text = text[:8]
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    raise ValueError(f"unrecognised date '{text}'")
+
+
+def normalize_transaction(record, signed=False):
+    """
+    Turn a raw statement record into the transaction fields the API expects.
+
+    A type that clearly names a credit or a debit decides the transaction type; without
+    one the sign of the amount does: negative amounts are expenses.
+
+    Args:
+        record (dict): Raw statement fields.
+        signed (bool): The amount always carries its direction, as TRNAMT does in OFX,
+            so its sign decides whatever the type says.
+    """
+    if not record.get("amount"):
+        raise ValueError("missing amount")
+    if not record.get("date"):
+        raise ValueError("missing date")
+    amount = parse_amount(record["amount"])
+    raw_type = str(record.get("transactionType") or "").strip().lower()
+    if not signed and (raw_type in INCOME_TYPES or raw_type.startswith("inc")):
+        transaction_type = "Income"
+    elif not signed and (raw_type in EXPENSE_TYPES or raw_type.startswith("exp")):
+        transaction_type = "Expense"
+    else:
+        transaction_type = "Income" if amount > 0 else "Expense"
+    return {
+        "transactionType": transaction_type,
+        "amount": abs(amount),
+        "date": parse_date(record["date"]),
+        "category": (record.get("category") or "").strip() or DEFAULT_CATEGORIES[transaction_type],
+        "description": (record.get("description") or "").strip(),
+    }
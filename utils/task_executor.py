@@ -0,0 +1,237 @@
+import logging
+import threading
+import time
+from enum import IntEnum
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Qt, Signal
+
+import appconfig
+from services import request_scheduler
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKER_THREADS = getattr(appconfig, "MAX_WORKER_THREADS", 6)
+
+
+class TaskPriority(IntEnum):
+    """Scheduling priority of a background task; higher values start first."""
+    BACKGROUND = 0
+    NORMAL = 5
+    INTERACTIVE = 10
+
+
+def request_lane(priority):
+    """Request scheduler lane used for HTTP calls made by a task of the given priority."""
+    if priority >= TaskPriority.INTERACTIVE:
+        return request_scheduler.INTERACTIVE
+    if priority >= TaskPriority.NORMAL:
+        return request_scheduler.NORMAL
+    return request_scheduler.BACKGROUND
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task that notices its cancellation token was triggered."""
+
+
+class CancellationToken:
+    """Cooperative cancellation flag shared between the GUI thread and a task."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        """Request cancellation; the task stops at its next check."""
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        """Raise TaskCancelled if cancellation was requested."""
+        if self._event.is_set():
+            raise TaskCancelled()
+
+
+class RequestScope:
+    """
+    Per-view request generations.
+
+    Starting a request on a channel cancels the previous one on that channel, so only
+    the newest response is rendered; cancel_all() drops everything when the view is left.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.generation = 0
+        self._tokens = {}
+
+    def begin(self, channel="default"):
+        """Cancel the in-flight request on channel and return a token for the new one."""
+        previous = self._tokens.get(channel)
+        if previous is not None and not previous.cancelled:
+            logger.debug(f"{self.name}: superseding in-flight '{channel}' request.")
+            previous.cancel()
+        self.generation += 1
+        token = CancellationToken()
+        self._tokens[channel] = token
+        return token
+
+    def is_current(self, token, channel="default"):
+        """Return True if token belongs to the newest, non-cancelled request on channel."""
+        return self._tokens.get(channel) is token and not token.cancelled
+
+    def cancel_all(self):
+        """Cancel every in-flight request of this scope."""
+        for token in self._tokens.values():
+            token.cancel()
+        self._tokens.clear()
+
+
+class TaskHandle:
+    """Reference to a submitted task, used to cancel it or check its state."""
+
+    def __init__(self, name, priority, token, key, on_result, on_error, on_cancelled):
+        self.name = name
+        self.priority = priority
+        self.key = key
+        self.token = token
+        self.on_result = on_result
+        self.on_error = on_error
+        self.on_cancelled = on_cancelled
+        self.submitted_at = time.monotonic()
+        self.done = False
+
+    def cancel(self):
+        """Cancel the task; queued tasks never run and running tasks drop their result."""
+        self.token.cancel()
+
+
+class _TaskRunnable(QRunnable):
+    """QRunnable that runs one task function and reports the outcome to the executor."""
+
+    def __init__(self, executor, handle, fn, args):
+        super().__init__()
+        self.executor = executor
+        self.handle = handle
+        self.fn = fn
+        self.args = args
+
+    def run(self):
+        handle = self.handle
+        if handle.token.cancelled:
+            self.executor._task_done.emit(handle, "cancelled", None)
+            return
+        try:
+            with request_scheduler.lane_context(request_lane(handle.priority)):
+                result = self.fn(*self.args)
+        except TaskCancelled:
+            self.executor._task_done.emit(handle, "cancelled", None)
+            return
+        except Exception as e:
+            logger.exception(f"Task '{handle.name}' failed.")
+            self.executor._task_done.emit(handle, "failed", e)
+            return
+        outcome = "cancelled" if handle.token.cancelled else "finished"
+        self.executor._task_done.emit(handle, outcome, result)
+
+
+class TaskExecutor(QObject):
+    """
+    Bounded, prioritised thread pool shared by all background work in the app.
+
+    Completion callbacks always run on the GUI thread, so they may touch widgets.
+    """
+
+    task_finished = Signal(str, str)  # task name, outcome ("finished", "failed", "cancelled")
+    _task_done = Signal(object, str, object)  # handle, outcome, result or exception
+
+    def __init__(self, max_threads=MAX_WORKER_THREADS, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._keyed = {}
+        self._task_done.connect(self._deliver, Qt.QueuedConnection)
+
+    def submit(self, name, fn, *args, priority=TaskPriority.NORMAL, token=None, key=None,
+               on_result=None, on_error=None, on_cancelled=None):
+        """
+        Run fn(*args) on the pool.
+
+        Args:
+            name (str): Task name used in logs and the task_finished signal.
+            fn (callable): Function to run on a worker thread.
+            priority (TaskPriority): Queue priority relative to other tasks.
+            token (CancellationToken): Token to cancel the task; one is created if omitted.
+            key (str): Single-flight key; while a task with the same key is pending,
+                its handle is returned instead of starting a duplicate.
+            on_result, on_error, on_cancelled (callable): GUI-thread completion callbacks.
+
+        Returns:
+            TaskHandle: Handle of the submitted (or already running) task.
+        """
+        with self._lock:
+            if key is not None and key in self._keyed:
+                logger.debug(f"Task '{name}' already pending under key '{key}'; not starting a duplicate.")
+                return self._keyed[key]
+            handle = TaskHandle(name, priority, token or CancellationToken(), key, on_result, on_error, on_cancelled)
+            self._pending.add(handle)
+            if key is not None:
+                self._keyed[key] = handle
+        self.pool.start(_TaskRunnable(self, handle, fn, args), int(priority))
+        logger.debug(f"Submitted task '{name}' (priority={priority.name}, pending={len(self._pending)}, "
+                     f"active threads={self.pool.activeThreadCount()}/{self.pool.maxThreadCount()})")
+        return handle
+
+    def _deliver(self, handle, outcome, payload):
+        """Dispatch a task outcome to its callbacks on the GUI thread."""
+        if outcome == "finished" and handle.token.cancelled:
+            # Cancelled after the worker finished but before delivery: the result is stale
+            outcome = "cancelled"
+        with self._lock:
+            handle.done = True
+            self._pending.discard(handle)
+            if handle.key is not None and self._keyed.get(handle.key) is handle:
+                del self._keyed[handle.key]
+        elapsed = time.monotonic() - handle.submitted_at
+        logger.debug(f"Task '{handle.name}' {outcome} after {elapsed:.3f}s.")
+
+        if outcome == "finished" and handle.on_result:
+            handle.on_result(payload)
+        elif outcome == "failed" and handle.on_error:
+            handle.on_error(payload)
+        elif outcome == "cancelled" and handle.on_cancelled:
+            handle.on_cancelled()
+        self.task_finished.emit(handle.name, outcome)
+
+    def pending_count(self):
+        """Number of submitted tasks that have not completed yet."""
+        with self._lock:
+            return len(self._pending)
+
+    def cancel_all(self):
+        """Cancel every pending task."""
+        with self._lock:
+            handles = list(self._pending)
+        for handle in handles:
+            handle.cancel()
+
+    def shutdown(self, timeout_ms=3000):
+        """Cancel outstanding work and wait briefly for running tasks to finish."""
+        logger.info(f"Shutting down task executor with {self.pending_count()} pending task(s).")
+        self.cancel_all()
+        self.pool.clear()
+        self.pool.waitForDone(timeout_ms)
+
+
+_executor = None
+
+
+def get_executor():
+    """Return the application-wide task executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = TaskExecutor()
+    return _executor
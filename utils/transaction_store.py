@@ -0,0 +1,510 @@
+import heapq
+import itertools
+import logging
+from datetime import datetime
+
+from PySide6.QtCore import QObject, Signal
+
+import appconfig
+from utils.duplicate_index import DuplicateIndex
+from utils.filter_index import FilterIndex
+from utils.search_index import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+# Above this share of changed rows a refresh rebuilds the store instead of patching it
+DIFF_REBUILD_RATIO = 0.25
+STORE_MAX_ROWS = getattr(appconfig, "STORE_MAX_ROWS", 50000)
+
+
+def month_label(date_str):
+    """Return the "Month YYYY" group label of an ISO date string."""
+    return datetime.strptime(date_str[:10], "%Y-%m-%d").strftime("%B %Y")
+
+
+def month_key(label):
+    """Return the "YYYY-MM" month of a "Month YYYY" group label."""
+    return datetime.strptime(label, "%B %Y").strftime("%Y-%m")
+
+
+def _date(txn):
+    return txn["date"][:10]
+
+
+def _position(rows, date):
+    """Index of the first row dated on or before date in a newest-first list (binary search)."""
+    low, high = 0, len(rows)
+    while low < high:
+        middle = (low + high) // 2
+        if rows[middle]["date"][:10] > date:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def _month_totals(transactions, totals=None):
+    """Add transactions to per-month totals (label -> totals) without keeping the rows."""
+    totals = {} if totals is None else totals
+    labels = {}  # "YYYY-MM" -> label, so each month's date is parsed once
+    for txn in transactions:
+        month = txn["date"][:7]
+        label = labels.get(month) or labels.setdefault(month, month_label(txn["date"]))
+        month_totals = totals.setdefault(label, {"income": 0.0, "expense": 0.0, "count": 0})
+        month_totals["income" if txn.get("transactionType") == "Income" else "expense"] += float(txn.get("amount") or 0)
+        month_totals["count"] += 1
+    return totals
+
+
+def diff_transactions(old, new):
+    """
+    Compare two transaction lists by id.
+
+    Returns:
+        tuple: (inserted: list, removed: list, changed: list of (old, new) pairs)
+    """
+    old_by_id = {txn.get("id"): txn for txn in old}
+    new_by_id = {txn.get("id"): txn for txn in new}
+    inserted = [txn for key, txn in new_by_id.items() if key not in old_by_id]
+    removed = [txn for key, txn in old_by_id.items() if key not in new_by_id]
+    changed = [(old_by_id[key], txn) for key, txn in new_by_id.items()
+               if key in old_by_id and old_by_id[key] != txn]
+    return inserted, removed, changed
+
+
+class TransactionStore(QObject):
+    """
+    Local copy of the user's transactions with their month groups and per-month totals.
+
+    Adds and deletes are applied here immediately and marked pending until the server
+    confirms them; a failed request is rolled back. Pending changes survive a reload
+    from the server, so a refresh that races a mutation does not undo it on screen.
+    Must only be used from the GUI thread.
+
+    Only the newest whole months up to max_rows rows are kept. Older months of a fetched
+    history are counted into trimmed and their rows dropped; restore_month brings one
+    of them back when it is selected.
+    """
+
+    changed = Signal()
+
+    def __init__(self, parent=None, max_rows=STORE_MAX_ROWS):
+        super().__init__(parent)
+        self.max_rows = max_rows
+        self.transactions = []  # newest first, like the API returns them
+        self.groups = {"All": self.transactions}
+        self.totals = {}  # month label -> {"income": float, "expense": float, "count": int}
+        self.trimmed = {}  # month label -> totals of a month beyond max_rows, whose rows are not kept
+        self._restored = None  # label of the trimmed month brought back by restore_month
+        # Indexes kept in step with the list by _index, pending adds included
+        self.duplicates = DuplicateIndex()
+        self.search_index = SearchIndex()
+        self.filter_index = FilterIndex()
+        self._by_id = {}  # transaction id -> transaction, pending adds included
+        self._pending_deletes = {}  # transaction id -> removed transaction
+        self._temp_ids = itertools.count(-1, -1)
+        # Download being merged by merge_chunk, the oldest date it has merged so far and
+        # its rows of that date, which may continue in the next chunk
+        self._stream = None
+        self._stream_until = None
+        self._stream_carry = []
+        # Rows it has kept, the month of the last one, and whether it reached max_rows and
+        # only counts the older months
+        self._stream_kept = 0
+        self._stream_month = None
+        self._stream_counting = False
+
+    def load(self, transactions):
+        """
+        Replace the contents with a list fetched from the server, keeping pending changes.
+
+        A refresh is diffed against the current rows by id and only the inserted, removed
+        and changed rows are applied; nothing is emitted if the list is unchanged. A large
+        difference, such as the first load, rebuilds the store instead.
+
+        Returns:
+            bool: False if the list was unchanged.
+        """
+        # A list loaded in full supersedes a download still being merged
+        self._stream = None
+        transactions = [txn for txn in transactions if txn.get("id") not in self._pending_deletes]
+        cut = self._budget_cut(transactions)
+        trimmed = {} if cut is None else _month_totals(transactions[cut:])
+        trimmed_changed = trimmed != self.trimmed
+        self.trimmed, self._restored = trimmed, None
+        if cut is not None:
+            logger.debug(f"Keeping the newest {cut} of {len(transactions)} transactions; "
+                         f"{len(trimmed)} older month(s) are only counted.")
+            transactions = transactions[:cut]
+        confirmed = [txn for txn in self.transactions if not txn.get("pending")]
+        inserted, removed, changed = diff_transactions(confirmed, transactions)
+        patch_size = len(inserted) + len(removed) + len(changed)
+        if not patch_size:
+            if trimmed_changed:
+                self.changed.emit()
+                return True
+            logger.debug("Fetched transactions are unchanged.")
+            return False
+        if confirmed and patch_size <= DIFF_REBUILD_RATIO * max(len(confirmed), len(transactions)):
+            logger.debug(f"Applying transaction diff: {len(inserted)} inserted, {len(removed)} removed, "
+                         f"{len(changed)} changed.")
+            self._apply(removed + [old for old, _ in changed], inserted + [txn for _, txn in changed])
+            self.changed.emit()
+            return True
+        self._rebuild(transactions)
+        return True
+
+    def _rebuild(self, transactions):
+        """Re-create the list, groups and indexes from scratch, keeping pending adds."""
+        pending_adds = [txn for txn in self.transactions if txn.get("pending")]
+        self.transactions.clear()
+        self.groups.clear()
+        self.groups["All"] = self.transactions
+        self.totals.clear()
+        self._by_id.clear()
+        self.duplicates.clear()
+        self.search_index.clear()
+        self.filter_index.clear()
+        for txn in transactions:
+            self.transactions.append(txn)
+            self.groups.setdefault(month_label(txn["date"]), []).append(txn)
+            self._by_id[txn.get("id")] = txn
+            self._index(txn, 1)
+        for txn in pending_adds:
+            self._insert(txn)
+        self.changed.emit()
+
+    def merge_chunk(self, stream, transactions, first, last):
+        """
+        Apply the next chunk of a list that is being streamed from the server, newest first.
+
+        Each chunk is diffed against the stored rows of the dates it covers, so a refresh
+        only touches what changed and the full list is never held a second time. Rows of
+        the chunk's oldest date are kept back until the next chunk, which may hold more of
+        that date; the last chunk also drops the stored rows older than anything streamed.
+        Once max_rows rows are kept, the stored rows of older months are dropped the same
+        way and the rest of the download is only counted into trimmed.
+
+        Args:
+            stream: Identifies the download; chunks of an older one are ignored once a
+                newer download or a full load started.
+            transactions (list): The chunk.
+            first, last (bool): Whether this is the first or the last chunk.
+
+        Returns:
+            bool: False if the chunk changed nothing.
+        """
+        if first:
+            self._stream, self._stream_until, self._stream_carry = stream, None, []
+            self._stream_kept, self._stream_month, self._stream_counting = 0, None, False
+        elif stream is not self._stream or stream is None:
+            return False
+        rows = self._stream_carry + [txn for txn in transactions if txn.get("id") not in self._pending_deletes]
+        if last:
+            self._stream = None
+        if self._stream_counting:
+            self._stream_carry = []
+            if not rows:
+                return False
+            _month_totals(rows, self.trimmed)
+            self.changed.emit()
+            return True
+
+        # Beyond max_rows the older months are only counted; the rows kept end on a month boundary
+        cut = self._budget_cut(rows, self._stream_kept, self._stream_month)
+        trimmed_changed = cut is not None or (last and bool(self.trimmed))
+        if trimmed_changed:
+            self.trimmed, self._restored = {} if cut is None else _month_totals(rows[cut:]), None
+        if cut is not None:
+            logger.debug(f"Keeping the newest {self._stream_kept + cut} streamed transactions; "
+                         f"older months are only counted.")
+            rows, self._stream_carry, self._stream_counting = rows[:cut], [], True
+        oldest = None
+        if not (last or self._stream_counting):
+            if not rows:
+                return False
+            oldest = _date(rows[-1])
+            split = len(rows)
+            while split and _date(rows[split - 1]) == oldest:
+                split -= 1
+            rows, self._stream_carry = rows[:split], rows[split:]
+        self._stream_kept += len(rows)
+        if rows:
+            self._stream_month = rows[-1]["date"][:7]
+
+        # Stored rows dated from the previous chunk's kept-back date down to, but not including, this one's
+        start = 0 if self._stream_until is None else _position(self.transactions, self._stream_until)
+        end = len(self.transactions) if oldest is None else _position(self.transactions, oldest)
+        self._stream_until = oldest
+        window = [txn for txn in self.transactions[start:end] if not txn.get("pending")]
+        if not window and end == len(self.transactions):
+            # Nothing stored this old, e.g. on the first load: the rows are simply appended
+            if rows:
+                self.extend(rows)
+            elif trimmed_changed:
+                self.changed.emit()
+            return bool(rows) or trimmed_changed
+
+        inserted, removed, changed = diff_transactions(window, rows)
+        # A row moved here from a date the download has not reached yet is replaced now, so
+        # no id is stored twice
+        removed += [self._by_id[txn.get("id")] for txn in inserted if txn.get("id") in self._by_id]
+        if not (inserted or removed or changed):
+            if trimmed_changed:
+                self.changed.emit()
+            return trimmed_changed
+        self._apply(removed + [old for old, _ in changed], inserted + [txn for _, txn in changed])
+        self.changed.emit()
+        return True
+
+    def extend(self, transactions):
+        """Append the next, older chunk of a list that is being streamed from the server."""
+        for txn in transactions:
+            if txn.get("id") in self._pending_deletes:
+                continue
+            if self.transactions and self.transactions[-1]["date"][:10] < txn["date"][:10]:
+                # Only a pending add can be older than rows still arriving
+                self._insert(txn)
+                continue
+            self.transactions.append(txn)
+            self.groups.setdefault(month_label(txn["date"]), []).append(txn)
+            self._by_id[txn.get("id")] = txn
+            self._index(txn, 1)
+        self.changed.emit()
+
+    def restore_month(self, label, transactions):
+        """
+        Show the rows of a trimmed month, fetched on its own, until release_month.
+
+        One trimmed month is restored at a time; the one restored before is trimmed again.
+        """
+        if self._restored not in (None, label):
+            self._trim_month(self._restored)
+        rows = [txn for txn in transactions if txn.get("id") not in self._pending_deletes]
+        current = [txn for txn in self.groups.get(label, []) if not txn.get("pending")]
+        inserted, removed, changed = diff_transactions(current, rows)
+        self.trimmed.pop(label, None)
+        self._restored = label
+        self._apply(removed + [old for old, _ in changed], inserted + [txn for _, txn in changed])
+        self.changed.emit()
+
+    def release_month(self):
+        """Trim the restored month again, e.g. once another month is selected."""
+        if self._restored is not None:
+            self._trim_month(self._restored)
+            self._restored = None
+            self.changed.emit()
+
+    def _trim_month(self, label):
+        """Count a month's rows into trimmed and drop them; pending rows stay."""
+        rows = [txn for txn in self.groups.get(label, []) if not txn.get("pending")]
+        if rows:
+            self.trimmed.update(_month_totals(rows))
+            self._apply(rows, [])
+
+    def _budget_cut(self, rows, kept=0, kept_month=None):
+        """
+        Index of the first row of a newest-first list beyond max_rows, or None.
+
+        The cut falls on a month boundary, so every month that is kept is complete.
+
+        Args:
+            kept (int): Rows of the same list already kept, e.g. by earlier chunks.
+            kept_month (str): "YYYY-MM" of the last row kept.
+        """
+        for index in range(max(0, self.max_rows - kept), len(rows)):
+            previous = rows[index - 1]["date"][:7] if index else kept_month
+            if rows[index]["date"][:7] != previous:
+                return index
+        return None
+
+    def clear(self):
+        """Forget all transactions, e.g. on logout."""
+        self._pending_deletes.clear()
+        self._stream, self._stream_until, self._stream_carry = None, None, []
+        self.trimmed, self._restored = {}, None
+        self.transactions.clear()
+        self._rebuild([])
+
+    def months(self):
+        """Month labels that have transactions, trimmed months included, newest first."""
+        return sorted(self.totals.keys() | self.trimmed.keys(), key=lambda label: datetime.strptime(label, "%B %Y"),
+                      reverse=True)
+
+    def month_totals(self, label=None):
+        """Income, expense and count of one month, or of all months if None, trimmed months included."""
+        result = {"income": 0.0, "expense": 0.0, "count": 0}
+        for totals in (self.totals, self.trimmed):
+            for month in [label] if label else totals:
+                for key, value in totals.get(month, {}).items():
+                    result[key] += value
+        return result
+
+    def find(self, transaction_id):
+        """Return the transaction with the given id, or None."""
+        return self._by_id.get(transaction_id)
+
+    def add_pending(self, transaction):
+        """
+        Show a new transaction before the server has stored it.
+
+        Returns:
+            int: Temporary (negative) id of the pending row, used to confirm or roll it back.
+        """
+        temp_id = next(self._temp_ids)
+        self._insert(dict(transaction, id=temp_id, pending=True))
+        self.changed.emit()
+        return temp_id
+
+    def confirm_add(self, temp_id, created):
+        """Replace a pending row with the transaction the server created."""
+        self.settle_adds(confirmed=[(temp_id, created)])
+
+    def rollback_add(self, temp_id):
+        """Remove a pending row whose create request failed."""
+        self.settle_adds(rolled_back=[temp_id])
+
+    def settle_adds(self, confirmed=(), rolled_back=()):
+        """
+        Confirm and roll back many pending rows in one update, repainting once.
+
+        Args:
+            confirmed (list): (temporary id, transaction the server created) pairs.
+            rolled_back (list): Temporary ids of rows whose create request failed.
+        """
+        removed, added, added_ids = [], [], set()
+        for temp_id, created in confirmed:
+            row = self._by_id.get(temp_id)
+            if row is None:
+                logger.debug(f"Pending transaction {temp_id} is gone; nothing to confirm.")
+                continue
+            removed.append(row)
+            row = {k: v for k, v in row.items() if k != "pending"}
+            row.update(created or {})
+            # A refresh may already have brought the stored row
+            if row["id"] == temp_id or (self.find(row["id"]) is None and row["id"] not in added_ids):
+                added.append(row)
+                added_ids.add(row["id"])
+        removed += [self._by_id[temp_id] for temp_id in rolled_back if temp_id in self._by_id]
+        if removed:
+            self._apply(removed, added)
+            self.changed.emit()
+
+    def delete_pending(self, transaction_id):
+        """
+        Hide a transaction before the server has deleted it.
+
+        Returns:
+            dict: The removed transaction, or None if it is not in the store.
+        """
+        row = self._remove(transaction_id)
+        if row is not None:
+            self._pending_deletes[transaction_id] = row
+            self.changed.emit()
+        return row
+
+    def remove_many(self, transaction_ids):
+        """Remove transactions the server has already deleted, repainting once."""
+        removed = [self._by_id[i] for i in set(transaction_ids) if i in self._by_id]
+        if removed:
+            self._apply(removed, [])
+            self.changed.emit()
+        return removed
+
+    def is_delete_pending(self, transaction_id):
+        """Return True while a delete of the transaction is waiting for the server."""
+        return transaction_id in self._pending_deletes
+
+    def confirm_delete(self, transaction_id):
+        """Forget a delete the server has completed."""
+        self._pending_deletes.pop(transaction_id, None)
+
+    def rollback_delete(self, transaction_id):
+        """Put back a transaction whose delete request failed."""
+        row = self._pending_deletes.pop(transaction_id, None)
+        if row is not None and self.find(transaction_id) is None:
+            self._insert(row)
+            self.changed.emit()
+
+    def _insert(self, txn):
+        """Insert a transaction in date order into the list, its month group and totals."""
+        group = self.groups.setdefault(month_label(txn["date"]), [])
+        for rows in (self.transactions, group):
+            rows.insert(_position(rows, _date(txn)), txn)
+        self._by_id[txn.get("id")] = txn
+        self._index(txn, 1)
+
+    def _remove(self, transaction_id):
+        """Remove a transaction from the list, its month group and totals."""
+        txn = self._by_id.pop(transaction_id, None)
+        if txn is None:
+            return None
+        label = month_label(txn["date"])
+        group = self.groups.get(label, [])
+        for rows in (self.transactions, group):
+            # Rows of the same date follow the binary search position
+            index = _position(rows, _date(txn))
+            while index < len(rows) and rows[index] is not txn:
+                index += 1
+            if index < len(rows):
+                del rows[index]
+        if not group:
+            self.groups.pop(label, None)
+        self._index(txn, -1)
+        return txn
+
+    def _apply(self, removed, added):
+        """
+        Remove and insert many transactions in one pass over the list and the month groups
+        they touch, then recount the totals of those months once.
+        """
+        gone = {id(txn) for txn in removed}
+        added = sorted(added, key=_date, reverse=True)
+        by_label = {}
+        for txn in removed:
+            by_label.setdefault(month_label(txn["date"]), ([], []))[0].append(txn)
+        for txn in added:
+            by_label.setdefault(month_label(txn["date"]), ([], []))[1].append(txn)
+
+        for rows, new_rows in [(self.transactions, added)] + [
+                (self.groups.setdefault(label, []), label_added) for label, (_, label_added) in by_label.items()]:
+            if gone:
+                rows[:] = [txn for txn in rows if id(txn) not in gone]
+            if new_rows:
+                # New rows go before existing rows of the same date, as _insert places them
+                rows[:] = list(heapq.merge(new_rows, rows, key=_date, reverse=True))
+
+        for txn in removed:
+            self._by_id.pop(txn.get("id"), None)
+            self._index(txn, -1, totals=False)
+        for txn in added:
+            self._by_id[txn.get("id")] = txn
+            self._index(txn, 1, totals=False)
+        for label in by_label:
+            self._recount(label)
+
+    def _recount(self, label):
+        """Recompute the totals of one month from its group."""
+        rows = self.groups.get(label)
+        if not rows:
+            self.groups.pop(label, None)
+            self.totals.pop(label, None)
+            return
+        totals = self.totals[label] = {"income": 0.0, "expense": 0.0, "count": len(rows)}
+        for txn in rows:
+            kind = "income" if txn.get("transactionType") == "Income" else "expense"
+            totals[kind] += float(txn.get("amount") or 0)
+
+    def _index(self, txn, sign, totals=True):
+        """Add (sign=1) or remove (sign=-1) a transaction in the month totals and the indexes."""
+        if totals:
+            label = month_label(txn["date"])
+            month = self.totals.setdefault(label, {"income": 0.0, "expense": 0.0, "count": 0})
+            kind = "income" if txn.get("transactionType") == "Income" else "expense"
+            month[kind] += sign * float(txn.get("amount") or 0)
+            month["count"] += sign
+            if month["count"] <= 0:
+                del self.totals[label]
+        self.duplicates.update(txn, sign)
+        self.search_index.update(txn, sign)
+        self.filter_index.update(txn, sign)
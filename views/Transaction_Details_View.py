@@ -1,7 +1,8 @@
+import functools
 import os
 import logging
-import requests
-from PySide6.QtCore import Qt, QSize, Signal
+import uuid
+from PySide6.QtCore import Qt, QSize
 from PySide6.QtGui import QIcon, QFont
 from PySide6.QtWidgets import (
     QVBoxLayout, QLabel, QPushButton, QDialog,
@@ -9,7 +10,10 @@ from PySide6.QtWidgets import (
     QScrollArea, QGridLayout, QWidget
 )
 
-import appconfig
+from services.transaction_service import delete_transaction, fetch_transaction
+from utils.cache_utils import data_cache
+from utils.event_bus import get_event_bus, ChangeEvent, month_of
+from utils.task_executor import get_executor, RequestScope, TaskPriority
 
 logger = logging.getLogger(__name__)
 
@@ -17,13 +21,13 @@ logger = logging.getLogger(__name__)
 class TransactionDetailsView(QWidget):
     """View to display detailed information about a single transaction."""
 
-    transaction_deleted = Signal(int)  # Signal emitted when a transaction is deleted
-
     def __init__(self, parent, transaction_data):
         super().__init__()
         self.parent = parent
         self.transaction_data = transaction_data
+        self.request_scope = RequestScope("TransactionDetailsView")
         self.init_ui()
+        self.load_details()
 
     def init_ui(self):
         """Initialize the user interface components."""
@@ -122,8 +126,8 @@ class TransactionDetailsView(QWidget):
 
     def add_delete_button(self):
         """Add a button to delete the current transaction."""
-        delete_button = QPushButton("Delete Transaction")
-        delete_button.setStyleSheet("""
+        self.delete_button = QPushButton("Delete Transaction")
+        self.delete_button.setStyleSheet("""
             QPushButton {
                 background-color: #ff4d4d;
                 color: white;
@@ -135,8 +139,8 @@ class TransactionDetailsView(QWidget):
                 background-color: #e60000;
             }
         """)
-        delete_button.clicked.connect(self.confirm_delete_transaction)
-        self.main_layout.addWidget(delete_button, alignment=Qt.AlignCenter)
+        self.delete_button.clicked.connect(self.confirm_delete_transaction)
+        self.main_layout.addWidget(self.delete_button, alignment=Qt.AlignCenter)
 
     def confirm_delete_transaction(self):
         """Display a confirmation dialog before deleting the transaction."""
@@ -182,58 +186,36 @@ class TransactionDetailsView(QWidget):
             self.delete_transaction(self.transaction_data.get('id'))
 
     def delete_transaction(self, transaction_id):
-        """Send a DELETE request to remove the transaction."""
-        url = f"{appconfig.TRANSACTION_DELETE_URL}/{transaction_id}"
-        headers = {
-            "Authorization": f"Bearer {self.parent.jwt_token}",
-            "Ocp-Apim-Subscription-Key": self.parent.subscription_key
-        }
-        try:
-            response = requests.delete(url, headers=headers)
-            if response.status_code == 200:
-                self.show_success_dialog("Transaction deleted successfully.")
-                self.transaction_deleted.emit(transaction_id)
-                self.parent.show_content_view()
-            else:
-                self.show_error_dialog(f"Failed to delete transaction: {response.text}")
-        except requests.RequestException as e:
-            self.show_error_dialog(f"An error occurred: {str(e)}")
-
-    def show_success_dialog(self, message):
-        """Display a success message to the user."""
-        dialog = QDialog(self)
-        dialog.setWindowTitle("Success")
-        dialog.setStyleSheet("""
-            QDialog {
-                background-color: #fefefe;
-                border-radius: 10px;
-                padding: 20px;
-            }
-            QLabel {
-                font-size: 14px;
-                color: #333;
-            }
-            QPushButton {
-                background-color: #4caf50;
-                color: white;
-                border-radius: 5px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-        """)
-
-        layout = QVBoxLayout(dialog)
-        label = QLabel(message)
-        label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(label)
-
-        ok_button = QPushButton("OK")
-        ok_button.clicked.connect(dialog.accept)
-        layout.addWidget(ok_button, alignment=Qt.AlignCenter)
-
-        dialog.exec()
+        """Remove the transaction from the dashboard at once and delete it on the server."""
+        store = self.parent.transaction_store
+        if store.is_delete_pending(transaction_id):
+            logger.warning(f"Delete of transaction {transaction_id} is already in progress.")
+            return
+        self.delete_button.setDisabled(True)
+        removed = store.delete_pending(transaction_id)
+        month = month_of((removed or self.transaction_data).get('date'))
+        self.parent.show_content_view()
+        get_executor().submit(
+            "delete_transaction",
+            functools.partial(delete_transaction, idempotency_key=uuid.uuid4().hex),
+            transaction_id, self.parent.jwt_token, self.parent.subscription_key,
+            priority=TaskPriority.INTERACTIVE, key=f"delete_transaction:{transaction_id}",
+            on_result=lambda result: self.on_delete_result(transaction_id, month, result),
+            on_error=lambda error: self.on_delete_result(transaction_id, month, (False, f"An error occurred: {error}")),
+        )
+
+    def on_delete_result(self, transaction_id, month, result):
+        """Finish the delete, or put the transaction back if the server refused it."""
+        success, message = result
+        store = self.parent.transaction_store
+        if success:
+            store.confirm_delete(transaction_id)
+            get_event_bus().publish(ChangeEvent("transactions", "deleted", transaction_id, month, local=True))
+        else:
+            store.rollback_delete(transaction_id)
+            if self.transaction_data.get('id') == transaction_id:
+                self.delete_button.setDisabled(False)
+            self.show_error_dialog(message)
 
     def show_error_dialog(self, message):
         """Display an error message to the user."""
@@ -280,7 +262,15 @@ class TransactionDetailsView(QWidget):
         """
         logger.debug("Updating transaction data.")
         self.transaction_data = new_transaction_data
+        self.delete_button.setDisabled(
+            self.parent.transaction_store.is_delete_pending(new_transaction_data.get('id'))
+        )
 
+        self.refresh_values()
+        self.load_details()
+
+    def refresh_values(self):
+        """Show the current transaction data in the value labels."""
         formatted_date = self.format_date(self.transaction_data.get('date', ''))
         formatted_amount = self.format_amount(self.transaction_data.get('amount', 0))
 
@@ -303,6 +293,40 @@ class TransactionDetailsView(QWidget):
                 widget.setText(new_value)
                 logger.debug(f"Updated {label_text}: {new_value}")
 
+    def load_details(self):
+        """Fetch the fields a lean transaction list leaves out, such as the description."""
+        # A fetch for the previously shown transaction is no longer wanted
+        self.request_scope.cancel_all()
+        transaction_id = self.transaction_data.get('id')
+        if "description" in self.transaction_data or transaction_id is None:
+            return
+        cached = data_cache.get(("transaction", transaction_id))
+        if cached is not None:
+            self.transaction_data = {**cached, **self.transaction_data}
+            self.refresh_values()
+            return
+        self.widgets["Description"].widget().setText("Loading...")
+        token = self.request_scope.begin("details")
+        get_executor().submit(
+            "fetch_transaction", fetch_transaction, transaction_id, self.parent.jwt_token,
+            self.parent.subscription_key, priority=TaskPriority.INTERACTIVE, token=token,
+            on_result=lambda result: self.on_details_fetched(token, transaction_id, result),
+            on_error=lambda error: self.on_details_fetched(token, transaction_id, (False, f"Error: {error}")),
+        )
+
+    def on_details_fetched(self, token, transaction_id, result):
+        """Fill in the fetched fields unless another transaction was opened meanwhile."""
+        if not self.request_scope.is_current(token, "details"):
+            return
+        success, data = result
+        if not success:
+            logger.warning(f"Could not load details of transaction {transaction_id}: {data}")
+            self.widgets["Description"].widget().setText("Description unavailable.")
+            return
+        data_cache.set(("transaction", transaction_id), data)
+        self.transaction_data = {**data, **self.transaction_data}
+        self.refresh_values()
+
     def format_date(self, raw_date):
         """Format the raw date string to YYYY/MM/DD."""
         if 'T' in raw_date:
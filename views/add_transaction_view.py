@@ -1,17 +1,14 @@
 import logging
-import requests
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox, QPushButton, QDateEdit, \
-    QMessageBox, QTextEdit, QDialog
-from PySide6.QtCore import Qt, QDate, QLocale, Signal
+    QMessageBox, QTextEdit
+from PySide6.QtCore import Qt, QDate, QLocale
 
-import appconfig
+from services.transaction_service import LIST_HAS_DESCRIPTIONS
 
 logger = logging.getLogger(__name__)
 
 
 class AddTransactionView(QWidget):
-    transaction_added = Signal()
-
     def __init__(self, parent):
         super().__init__()
         self.parent = parent
@@ -121,6 +118,22 @@ class AddTransactionView(QWidget):
         self.add_button.clicked.connect(self.add_transaction)
         self.buttons_layout.addWidget(self.add_button)
 
+        self.import_button = QPushButton("Import from File...")
+        self.import_button.setStyleSheet("""
+            QPushButton {
+                padding: 5px;
+                font-size: 14px;
+                background-color: #0275d8;
+                color: white;
+                border-radius: 4px;
+            }
+            QPushButton:hover {
+                background-color: #025aa5;
+            }
+        """)
+        self.import_button.clicked.connect(self.parent.show_import_view)
+        self.buttons_layout.addWidget(self.import_button)
+
         self.cancel_button = QPushButton("Cancel")
         self.cancel_button.setStyleSheet("""
             QPushButton {
@@ -152,7 +165,7 @@ class AddTransactionView(QWidget):
         self.category_combobox.addItems(categories)
 
     def add_transaction(self):
-        """Send the transaction data to the API and handle the response."""
+        """Queue the transaction for the API and show it on the dashboard."""
         try:
             amount = float(self.amount_input.text())
         except ValueError:
@@ -169,82 +182,27 @@ class AddTransactionView(QWidget):
             "category": self.category_combobox.currentText()
         }
 
-        api_url = appconfig.TRANSACTION_ADD_URL
-        headers = {
-            "Authorization": f"Bearer {self.parent.jwt_token}",
-            "Ocp-Apim-Subscription-Key": self.parent.subscription_key
-        }
-
-        logger.debug(f"Sending transaction data to {api_url}: {transaction_data}")
-
-        try:
-            response = requests.post(api_url, json=transaction_data, headers=headers)
-            if response.status_code == 200:
-                logger.info("Transaction added successfully.")
-                self.show_success_message()
-                self.transaction_added.emit()
-                self.parent.show_content_view()
-            else:
-                logger.warning(f"Failed to add transaction: {response.status_code} - {response.text}")
-                QMessageBox.warning(self, "Error", f"Failed to add transaction: {response.status_code}")
-        except requests.exceptions.RequestException as e:
-            logger.error(f"An error occurred while adding transaction: {e}")
-            QMessageBox.critical(self, "Error", f"An error occurred: {str(e)}")
-
-    def show_success_message(self):
-        """Display a success message dialog."""
-        dialog = QDialog(self)
-        dialog.setWindowTitle("Success")
-        dialog.setStyleSheet("""
-            QDialog {
-                background-color: #f4f4f4;
-                border: 1px solid #ccc;
-                border-radius: 8px;
-            }
-            QLabel {
-                font-size: 14px;
-                color: #333;
-            }
-            QPushButton {
-                background-color: #28a745;
-                color: white;
-                font-size: 14px;
-                padding: 6px 12px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #218838;
-            }
-        """)
+        # Without descriptions in the list a match would ignore the description, so no check is made
+        if LIST_HAS_DESCRIPTIONS and self.parent.transaction_store.duplicates.contains(transaction_data):
+            answer = QMessageBox.question(
+                self, "Possible Duplicate",
+                "A transaction with the same date, amount, type, category and description "
+                "already exists.\nAdd it anyway?"
+            )
+            if answer != QMessageBox.Yes:
+                logger.info("Possible duplicate transaction not added.")
+                return
+
+        # Journal the transaction and show it right away; the outbox sends it in the background.
+        # The button stays disabled until the form is opened again, so a double click adds one row.
+        self.add_button.setDisabled(True)
+        self.parent.outbox.enqueue(transaction_data)
+        self.parent.show_content_view()
 
-        layout = QVBoxLayout(dialog)
-        layout.setContentsMargins(20, 20, 20, 20)
-        layout.setSpacing(20)
-
-        message_label = QLabel("Transaction added successfully!")
-        message_label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(message_label)
-
-        ok_button = QPushButton("OK")
-        ok_button.setFixedSize(100, 40)
-        ok_button.clicked.connect(dialog.accept)
-        ok_button.setStyleSheet("""
-             QPushButton {
-                 background-color: #28a745;
-                 color: white;
-                 font-size: 14px;
-                 padding: 6px 12px;
-                 border-radius: 4px;
-             }
-             QPushButton:hover {
-                 background-color: #218838;
-             }
-         """)
-        layout.addWidget(ok_button, alignment=Qt.AlignCenter)
-
-        logger.debug("Displaying success message dialog.")
-        dialog.setLayout(layout)
-        dialog.exec()
+    def showEvent(self, event):
+        """Re-enable the Add button each time the form is shown."""
+        super().showEvent(event)
+        self.add_button.setDisabled(False)
 
     def cancel(self):
         """Handle the cancel action and redirect to the content view."""
@@ -1,28 +1,47 @@
 import logging
-import requests
-from PySide6.QtCore import Qt, QSize
-from PySide6.QtGui import QIcon, QPixmap
+from PySide6.QtCore import Qt, QSize, QTimer, Signal
+from PySide6.QtGui import QIcon, QPixmap, QDoubleValidator
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QPushButton, QLabel, QHBoxLayout, QFrame,
-    QListWidget, QListWidgetItem, QComboBox
+    QListWidget, QListWidgetItem, QComboBox, QGraphicsOpacityEffect, QAbstractItemView,
+    QMessageBox, QProgressDialog, QFileDialog, QLineEdit
 )
+from datetime import date
+import functools
 import os
 import locale
-from datetime import datetime
 
-import appconfig
+from services.transaction_service import (
+    fetch_user_transactions, fetch_month_transactions, stream_user_transactions, delete_transactions,
+    FETCH_TRANSACTIONS_BY_MONTH, LIST_HAS_DESCRIPTIONS, STREAM_TRANSACTIONS
+)
+from utils.cache_utils import month_cache
+from utils.event_bus import get_event_bus, ChangeEvent, month_of
+from utils.export_utils import export_transactions
+from utils.filter_index import popcount
+from utils.task_executor import get_executor, RequestScope, TaskPriority
+from utils.transaction_store import month_label, month_key
 
 logger = logging.getLogger(__name__)
 
+FILTER_DEBOUNCE_MS = 200  # typing pause before a search query or amount bound is applied
+MONTH_FILTER_MONTHS = 24  # recent months offered by the month filter when fetching by month
+SORT_COLUMNS = {"transactionType": "Transaction Type", "amount": "Amount", "date": "Date"}  # sort key -> title
+
 
 class ContentView(QWidget):
     """Dashboard view displaying user transactions and navigation options."""
 
+    bulk_delete_progress = Signal(int, int)  # done, total; emitted from the bulk delete worker
+    export_progress = Signal(int, int)  # rows written, total rows or 0; emitted from the export worker
+    transactions_streamed = Signal(object, str, list, bool, bool)  # request token, month label, rows, first, last
+
     def __init__(self, parent, user_id=None, username=None):
         super().__init__()
         self.parent = parent
         self.user_id = user_id
         self.username = username
+        self.jwt_token = None
 
         # Ensure subscription_key is available
         if not hasattr(self.parent, 'subscription_key'):
@@ -32,9 +51,22 @@ class ContentView(QWidget):
 
         self.current_page = 1
         self.current_month = "All"
-        self.all_transactions = []
-        self.grouped_transactions = {}
+        # The shared store is updated in place, optimistically on add/delete and on every fetch
+        self.store = self.parent.transaction_store
+        self.all_transactions = self.store.transactions
+        self.grouped_transactions = self.store.groups
+        self.visible_transactions = self.all_transactions  # month filter and search applied
+        self._reset_view_state()
+        self.store.changed.connect(self.on_store_changed)
+        self.selected_ids = set()
+        self.bulk_delete_dialog = None
+        self.bulk_delete_progress.connect(self.on_bulk_delete_progress)
+        self.export_dialog = None
+        self.export_progress.connect(self.on_export_progress)
+        self.transactions_streamed.connect(self.on_transactions_streamed)
         self.transactions_per_page = 8
+        self.request_scope = RequestScope("ContentView")
+        self.fetching_month = None  # trimmed month label being fetched on its own
 
         self.layout = QVBoxLayout(self)
         self.layout.setSpacing(10)
@@ -47,6 +79,13 @@ class ContentView(QWidget):
         self.setup_pagination()
         self.setup_placeholder()
 
+    def _reset_view_state(self):
+        """Forget the search, filters and sort order, e.g. for the next user."""
+        self.search_query = ""
+        self.filters = {}  # FilterIndex.query arguments of the type, category and amount filters
+        self.sort_key = "date"  # FilterIndex.SORT_KEYS column; newest first is the server order
+        self.sort_descending = True
+
     def setup_title(self):
         """Add the dashboard title to the layout."""
         self.title_label = QLabel("Expense Tracker Dashboard")
@@ -141,6 +180,100 @@ class ContentView(QWidget):
         self.month_filter.currentTextChanged.connect(self.update_month_filter)
         self.layout.addWidget(self.month_filter)
 
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText(
+            "Search descriptions and categories" if LIST_HAS_DESCRIPTIONS else "Search categories")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setStyleSheet("padding: 5px; font-size: 14px;")
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DEBOUNCE_MS)
+        self.filter_timer.timeout.connect(self.apply_filters)
+        self.search_input.textChanged.connect(self.filter_timer.start)
+        self.layout.addWidget(self.search_input)
+        self.setup_filter_bar()
+        self.setup_selection_bar()
+
+        self.summary_label = QLabel("")
+        self.summary_label.setAlignment(Qt.AlignCenter)
+        self.summary_label.setStyleSheet("font-size: 13px; color: #555;")
+        self.layout.addWidget(self.summary_label)
+
+        self.outbox_label = QLabel("")
+        self.outbox_label.setAlignment(Qt.AlignCenter)
+        self.outbox_label.setStyleSheet("font-size: 12px; color: #f0ad4e;")
+        self.outbox_label.hide()
+        self.layout.addWidget(self.outbox_label)
+
+    def setup_filter_bar(self):
+        """Add the type, category and amount range filters; their items show live match counts."""
+        filter_layout = QHBoxLayout()
+        style = "padding: 4px; font-size: 12px;"
+
+        self.type_filter = QComboBox()
+        self.type_filter.addItem("All types", None)
+        self.type_filter.addItem("Income", "Income")
+        self.type_filter.addItem("Expense", "Expense")
+        self.type_filter.setStyleSheet(style)
+        self.type_filter.currentIndexChanged.connect(self.apply_filters)
+        filter_layout.addWidget(self.type_filter)
+
+        self.category_filter = QComboBox()
+        self.category_filter.addItem("All categories", None)
+        self.category_filter.setStyleSheet(style)
+        self.category_filter.currentIndexChanged.connect(self.apply_filters)
+        filter_layout.addWidget(self.category_filter)
+
+        self.min_amount_input = QLineEdit()
+        self.max_amount_input = QLineEdit()
+        for amount_input, placeholder in ((self.min_amount_input, "Min $"), (self.max_amount_input, "Max $")):
+            amount_input.setPlaceholderText(placeholder)
+            amount_input.setValidator(QDoubleValidator(0, 1e12, 2, amount_input))
+            amount_input.setFixedWidth(80)
+            amount_input.setStyleSheet(style)
+            amount_input.textChanged.connect(self.filter_timer.start)
+            filter_layout.addWidget(amount_input)
+
+        self.clear_filters_button = QPushButton("Clear")
+        self.clear_filters_button.setStyleSheet(style)
+        self.clear_filters_button.clicked.connect(self.clear_filters)
+        filter_layout.addWidget(self.clear_filters_button)
+
+        self.layout.addLayout(filter_layout)
+
+    def setup_selection_bar(self):
+        """Add the controls for selecting several transactions and deleting them at once."""
+        selection_layout = QHBoxLayout()
+        button_style = "padding: 4px 8px; font-size: 12px;"
+
+        self.select_button = QPushButton("Select")
+        self.select_button.setCheckable(True)
+        self.select_button.setStyleSheet(button_style)
+        self.select_button.toggled.connect(self.set_select_mode)
+        selection_layout.addWidget(self.select_button)
+
+        self.select_all_button = QPushButton("Select All")
+        self.select_all_button.setStyleSheet(button_style)
+        self.select_all_button.clicked.connect(self.select_all)
+        self.select_all_button.hide()
+        selection_layout.addWidget(self.select_all_button)
+
+        self.delete_selected_button = QPushButton("Delete (0)")
+        self.delete_selected_button.setStyleSheet(button_style + " background-color: #ff4d4d; color: white;")
+        self.delete_selected_button.clicked.connect(self.delete_selected)
+        self.delete_selected_button.setEnabled(False)
+        self.delete_selected_button.hide()
+        selection_layout.addWidget(self.delete_selected_button)
+
+        selection_layout.addStretch()
+
+        self.export_button = QPushButton("Export...")
+        self.export_button.setStyleSheet(button_style)
+        self.export_button.clicked.connect(self.export_transactions)
+        selection_layout.addWidget(self.export_button)
+
+        self.layout.addLayout(selection_layout)
+
     def setup_transaction_list(self):
         """Set up the transaction list and header."""
         transaction_container = QWidget()
@@ -155,22 +288,26 @@ class ContentView(QWidget):
         header_layout.setContentsMargins(0, 0, 0, 0)
         header_layout.setSpacing(0)
 
-        # Column titles
-        titles = ["Transaction Type", "Amount", "Date"]
-        for title in titles:
-            lbl = QLabel(title)
-            lbl.setStyleSheet("font-size: 16px; font-weight: bold;")
-            lbl.setAlignment(Qt.AlignCenter)
-            header_layout.addWidget(lbl)
+        # Column titles; clicking one sorts by it, clicking it again reverses the order
+        self.sort_buttons = {}
+        for key, title in SORT_COLUMNS.items():
+            button = QPushButton(title)
+            button.setFlat(True)
+            button.setCursor(Qt.PointingHandCursor)
+            button.setStyleSheet("font-size: 16px; font-weight: bold; border: none;")
+            button.clicked.connect(functools.partial(self.sort_by, key))
+            self.sort_buttons[key] = button
+            header_layout.addWidget(button)
 
             # Add vertical separator except after the last title
-            if title != titles[-1]:
+            if key != "date":
                 vline = QFrame()
                 vline.setFrameShape(QFrame.VLine)
                 vline.setFrameShadow(QFrame.Sunken)
                 header_layout.addWidget(vline)
 
         header_widget.setLayout(header_layout)
+        self.update_sort_indicator()
 
         # Horizontal line under header
         hline_header = QFrame()
@@ -187,6 +324,8 @@ class ContentView(QWidget):
             border: none;
             background-color: transparent;
         """)
+        self.transaction_list.itemClicked.connect(self.display_transaction_details)
+        self.transaction_list.itemSelectionChanged.connect(self.on_selection_changed)
         transaction_layout.addWidget(self.transaction_list)
 
         self.layout.addWidget(transaction_container)
@@ -266,113 +405,370 @@ class ContentView(QWidget):
         """)
         self.layout.addWidget(self.fetch_transactions_placeholder)
 
-    def update_user_info(self, user_id, jwt_token):
-        """Update user-related information and refresh the view."""
+    def update_user_info(self, user_id, jwt_token, fetch=True):
+        """Update user-related information and optionally refresh the view."""
         self.user_id = user_id
         self.jwt_token = jwt_token
         logger.debug(f"Updated user info: user_id={self.user_id}, jwt_token={self.jwt_token[:10]}...")
-        self.fetch_all_transactions()
+        if fetch:
+            self.fetch_all_transactions()
+        else:
+            self.show_loading()
 
     def fetch_all_transactions(self):
-        """Fetch all transaction records for the logged-in user."""
-        logger.debug("Fetching all transactions.")
+        """
+        Fetch the transactions shown by the month filter.
+
+        Normally this is the full history, merged into the store chunk by chunk while it
+        downloads when STREAM_TRANSACTIONS is set. With FETCH_TRANSACTIONS_BY_MONTH, a selected month is
+        fetched on its own, and the server applies the date range and paging.
+        """
         logger.debug(f"Fetching transactions for user_id={self.user_id}")
         logger.debug(f"JWT token available: {'yes' if self.jwt_token else 'no'}")
-        logger.debug(f"Subscription key: {self.parent.subscription_key}")
         if not self.user_id or not self.jwt_token:
             self.transaction_list.clear()
             self.transaction_list.addItem("Error: User information is missing.")
             logger.error("User information is missing.")
             return
 
-        api_url = appconfig.TRANSACTION_USER_URL.format(user_id=self.user_id)
-
-        headers = {
-            "Authorization": f"Bearer {self.jwt_token}",
-            "Ocp-Apim-Subscription-Key": self.parent.subscription_key
-        }
-        params = {
-            "page": 1,
-            "pageSize": 10000,
-            "sortBy": "date",
-            "sortOrder": "desc"
-        }
-
-        logger.debug(f"Sending GET request to {api_url} with headers {headers} and params {params}")
-        try:
-            response = requests.get(api_url, headers=headers, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                self.all_transactions = data.get('transactions', [])
-                logger.debug(f"Fetched {len(self.all_transactions)} transactions.")
-                self.group_by_month()
-                self.current_month = "All"
-                index = self.month_filter.findText("All")
-                if index != -1:
-                    self.month_filter.setCurrentIndex(index)
-
-                self.display_transactions_for_current_month()
-                self.fetch_transactions_placeholder.hide()
-                logger.info("Transactions fetched and displayed successfully.")
-            else:
-                self.transaction_list.clear()
-                self.transaction_list.addItem(f"Error fetching transactions: {response.status_code}")
-                self.fetch_transactions_placeholder.show()
-                logger.warning(f"Failed to fetch transactions: {response.status_code}")
-        except requests.exceptions.RequestException as e:
-            self.transaction_list.clear()
-            self.transaction_list.addItem(f"Error: {str(e)}")
-            self.fetch_transactions_placeholder.show()
-            logger.error(f"An error occurred while fetching transactions: {e}")
+        # A newer fetch supersedes any still in flight, so only the latest data is rendered
+        token = self.request_scope.begin("transactions")
+        user_id = self.user_id
+        label = self.current_month
+        streamed = False
+        if FETCH_TRANSACTIONS_BY_MONTH and label != "All":
+            fn, args = fetch_month_transactions, (month_key(label),)
+        elif STREAM_TRANSACTIONS:
+            streamed = True
+            fn = functools.partial(
+                stream_user_transactions, cancelled=lambda: token.cancelled,
+                on_rows=lambda rows, first, last: self.transactions_streamed.emit(token, label, rows, first, last),
+            )
+            args = ()
+        else:
+            fn, args = fetch_user_transactions, ()
+        get_executor().submit(
+            "fetch_transactions", fn, user_id, self.jwt_token, self.parent.subscription_key, *args,
+            priority=TaskPriority.NORMAL, token=token,
+            on_result=lambda result: self.on_transactions_fetched(token, user_id, label, result, streamed),
+            on_error=lambda error: self.on_transactions_fetched(token, user_id, label, (False, f"Error: {error}")),
+        )
 
-    def group_by_month(self):
-        """Group all transactions by month and year."""
-        self.grouped_transactions.clear()
-        self.grouped_transactions["All"] = self.all_transactions
+    def on_transactions_changed(self, events):
+        """Refresh the dashboard once for a batch of changes not already applied to the store."""
+        # Months fetched earlier no longer match the server once they changed
+        months = {event.month for event in events}
+        if None in months:
+            month_cache.clear()
+        for month in months - {None}:
+            month_cache.delete(self.user_id, month)
+        remote = [event for event in events if not event.local]
+        if remote:
+            logger.debug(f"{len(remote)} transaction change(s): {remote}; refreshing once.")
+            self.fetch_all_transactions()
+
+    def on_transactions_fetched(self, token, user_id, label, result, streamed=False):
+        """Apply a finished transaction fetch unless it was superseded."""
+        if not self.request_scope.is_current(token, "transactions"):
+            logger.debug("Discarding stale transaction fetch result.")
+            return
+        success, data = result
+        if not success:
+            self.show_fetch_error(data)
+        elif not streamed:
+            # A streamed fetch only reports its row count; its chunks are already in the store
+            self.cache_transactions(user_id, label, data)
+            self.load_transactions(data, label)
+
+    def on_transactions_streamed(self, token, label, rows, first, last):
+        """Merge a chunk of a streamed fetch unless the fetch was superseded."""
+        if self.request_scope.is_current(token, "transactions"):
+            self.append_transactions(token, rows, first, last, label)
+
+    def append_transactions(self, stream, rows, first, last, label=None):
+        """Merge a chunk of a transaction list that is still downloading into the store."""
+        repaint = first and self.select_month(label)
+        if not self.store.merge_chunk(stream, rows, first, last) and repaint:
+            self.on_store_changed()
+
+    @staticmethod
+    def cache_transactions(user_id, label, transactions):
+        """Keep the transactions of a month fetched on its own for later use."""
+        if FETCH_TRANSACTIONS_BY_MONTH and label != "All":
+            month_cache.set(user_id, month_key(label), transactions)
+        # The full history is not cached: the store is its only resident copy
+
+    def cached_transactions(self, label):
+        """Return the resident transactions of a month label when fetching by month, or None."""
+        if label == "All":
+            return None
+        return month_cache.get(self.user_id, month_key(label))
+
+    def fetch_trimmed_month(self, label):
+        """Fetch a month the store keeps only the totals of, and show its rows."""
+        cached = month_cache.get(self.user_id, month_key(label))
+        if cached is not None:
+            self.store.restore_month(label, cached)
+            return
+        if self.fetching_month == label:
+            return
+        self.fetching_month = label
+        token = self.request_scope.begin("trimmed_month")
+        user_id = self.user_id
+        self.show_loading()
+        get_executor().submit(
+            "fetch_month_transactions", fetch_month_transactions, user_id, self.jwt_token,
+            self.parent.subscription_key, month_key(label),
+            priority=TaskPriority.NORMAL, token=token,
+            on_result=lambda result: self.on_trimmed_month_fetched(token, user_id, label, result),
+            on_error=lambda error: self.on_trimmed_month_fetched(token, user_id, label, (False, f"Error: {error}")),
+        )
 
-        for txn in self.all_transactions:
-            date_str = txn['date'][:10]
-            date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-            month_year = date_obj.strftime("%B %Y")
+    def on_trimmed_month_fetched(self, token, user_id, label, result):
+        """Show a fetched trimmed month if it is still selected."""
+        if not self.request_scope.is_current(token, "trimmed_month"):
+            return
+        self.fetching_month = None
+        success, data = result
+        if not success:
+            self.show_fetch_error(data)
+            return
+        month_cache.set(user_id, month_key(label), data)
+        if label == self.current_month and label in self.store.trimmed:
+            self.store.restore_month(label, data)
 
-            if month_year not in self.grouped_transactions:
-                self.grouped_transactions[month_year] = []
-            self.grouped_transactions[month_year].append(txn)
+    def show_loading(self):
+        """Show a loading hint while transactions are fetched in the background."""
+        self.transaction_list.clear()
+        self.fetch_transactions_placeholder.setText("Loading transactions...")
+        self.fetch_transactions_placeholder.show()
+
+    def default_month(self):
+        """Month filter selected after login: the current month when fetching by month."""
+        return month_label(date.today().isoformat()) if FETCH_TRANSACTIONS_BY_MONTH else "All"
+
+    def load_transactions(self, transactions, label=None):
+        """Group and display a freshly fetched transaction list."""
+        repaint = self.select_month(label)
+        if not self.store.load(transactions) and repaint:
+            # The data is unchanged, but the list was cleared while loading or shows another month
+            self.on_store_changed()
+        logger.info("Transactions fetched and displayed successfully.")
+
+    def select_month(self, label=None):
+        """
+        Show the month filter label of fetched transactions (the default month if None).
+
+        Returns:
+            bool: True if the list must be repainted even when the store is unchanged,
+            because it shows another month or was cleared while loading.
+        """
+        month = label or self.default_month()
+        repaint = month != self.current_month or not self.fetch_transactions_placeholder.isHidden()
+        if month != self.current_month:
+            self.current_month = month
+            self.current_page = 1
+        if FETCH_TRANSACTIONS_BY_MONTH:
+            month_cache.set_active(self.user_id, None if month == "All" else month_key(month))
+        return repaint
+
+    def on_store_changed(self):
+        """Repaint the list, month filter and totals after the store changed."""
+        self.group_by_month()
+        if self.current_month in self.store.trimmed and not FETCH_TRANSACTIONS_BY_MONTH:
+            # A refresh trimmed the month on screen again
+            self.fetch_trimmed_month(self.current_month)
+            return
+        if self.current_month not in self.grouped_transactions and not FETCH_TRANSACTIONS_BY_MONTH:
+            self.current_month = "All"
+            self.current_page = 1
+        self.update_visible_transactions()
+        last_page = max(1, -(-len(self.visible_transactions) // self.transactions_per_page))
+        self.current_page = min(self.current_page, last_page)
+        self.display_transactions_for_current_month()
+        self.fetch_transactions_placeholder.hide()
 
-        # Update the month_filter ComboBox
-        self.month_filter.blockSignals(True)
-        self.month_filter.clear()
-        self.month_filter.addItem("All")
+    def show_fetch_error(self, message):
+        """Display a transaction fetch error in the list."""
+        self.transaction_list.clear()
+        self.transaction_list.addItem(message)
+        self.fetch_transactions_placeholder.setText("Please log in to view transactions.")
+        self.fetch_transactions_placeholder.show()
 
-        sorted_month_year = sorted(
-            [k for k in self.grouped_transactions.keys() if k != "All"],
-            key=lambda x: datetime.strptime(x, "%B %Y"),
-            reverse=True
-        )
-        self.month_filter.addItems(sorted_month_year)
+    def group_by_month(self):
+        """Update the month filter with the store's month groups, keeping the selection."""
+        months = self.store.months()
+        if FETCH_TRANSACTIONS_BY_MONTH:
+            # The store only holds the fetched month, so offer recent months as well
+            year, month = date.today().year, date.today().month
+            recent = set()
+            for _ in range(MONTH_FILTER_MONTHS):
+                recent.add(date(year, month, 1).strftime("%B %Y"))
+                year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+            labels = recent.union(months, [self.current_month]) - {"All"}
+            months = sorted(labels, key=month_key, reverse=True)
+        items = ["All"] + months
+        self.month_filter.blockSignals(True)
+        # Rebuilding the combo box is skipped when a refresh did not add or drop a month
+        if items != [self.month_filter.itemText(i) for i in range(self.month_filter.count())]:
+            self.month_filter.clear()
+            self.month_filter.addItems(items)
+            logger.debug("Updated month filter from grouped transactions.")
+        index = self.month_filter.findText(self.current_month)
+        self.month_filter.setCurrentIndex(index if index != -1 else 0)
         self.month_filter.blockSignals(False)
-        logger.debug("Grouped transactions by month and updated month filter.")
 
-    def display_transactions_for_current_month(self):
-        """Display transactions for the currently selected month with pagination."""
-        self.transaction_list.clear()
+    def show_outbox_count(self, count):
+        """Show how many new transactions are still waiting to be sent."""
+        self.outbox_label.setText(f"{count} transaction(s) waiting to sync")
+        self.outbox_label.setVisible(count > 0)
+
+    def read_filters(self):
+        """Collect the type, category and amount filters as FilterIndex.query arguments."""
+        filters = {}
+        if self.type_filter.currentData():
+            filters["transaction_type"] = self.type_filter.currentData()
+        if self.category_filter.currentData():
+            filters["category"] = self.category_filter.currentData()
+        for key, amount_input in (("min_amount", self.min_amount_input), ("max_amount", self.max_amount_input)):
+            try:
+                filters[key] = float(amount_input.text())
+            except ValueError:
+                pass
+        return filters
+
+    def update_visible_transactions(self):
+        """Apply the month filter, search query and filter bar to the store's transactions."""
+        matches = self.store.search_index.search(self.search_query)
+        month = None if self.current_month == "All" else month_key(self.current_month)
+        index = self.store.filter_index
+        search_bits = None if matches is None else index.ids(txn["id"] for txn in matches)
+
+        server_order = self.sort_key == "date" and self.sort_descending
+        if server_order and not self.filters and matches is None:
+            self.visible_transactions = self.grouped_transactions.get(self.current_month, [])
+        elif server_order and not self.filters and month is None:
+            self.visible_transactions = matches
+        elif not self.filters and matches is None and month is None:
+            self.visible_transactions = index.sorted_rows(self.sort_key, self.sort_descending)
+        else:
+            bits = index.query(month=month, **self.filters)
+            if search_bits is not None:
+                bits &= search_bits
+            self.visible_transactions = index.sorted_rows(self.sort_key, self.sort_descending, bits)
+        self.update_filter_counts(month, search_bits)
+
+    def sort_by(self, key):
+        """Sort the list by a column; a second click on the same column reverses the order."""
+        if key == self.sort_key:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_key = key
+            self.sort_descending = key != "transactionType"  # largest amount and newest date first
+        self.update_sort_indicator()
+        self.current_page = 1
+        self.update_visible_transactions()
+        self.display_transactions_for_current_month()
+        logger.debug(f"Sorted by {key} ({'descending' if self.sort_descending else 'ascending'}).")
+
+    def update_sort_indicator(self):
+        """Mark the sorted column title with an arrow."""
+        for key, button in self.sort_buttons.items():
+            arrow = (" \u25bc" if self.sort_descending else " \u25b2") if key == self.sort_key else ""
+            button.setText(SORT_COLUMNS[key] + arrow)
+
+    def update_filter_counts(self, month, search_bits):
+        """Show how many transactions each type and category would match with the other filters kept."""
+        index = self.store.filter_index
+
+        def facet_base(dimension_filter):
+            bits = index.query(month=month, **{k: v for k, v in self.filters.items() if k != dimension_filter})
+            return bits if search_bits is None else bits & search_bits
+
+        categories = index.values("category")
+        if categories != [self.category_filter.itemData(i) for i in range(1, self.category_filter.count())]:
+            selected = self.category_filter.currentData()
+            self.category_filter.blockSignals(True)
+            self.category_filter.clear()
+            self.category_filter.addItem("All categories", None)
+            for category in categories:
+                self.category_filter.addItem(category, category)
+            self.category_filter.setCurrentIndex(max(0, self.category_filter.findData(selected)))
+            self.category_filter.blockSignals(False)
+
+        for combo, dimension, dimension_filter in ((self.type_filter, "transactionType", "transaction_type"),
+                                                   (self.category_filter, "category", "category")):
+            base = facet_base(dimension_filter)
+            for i in range(1, combo.count()):
+                value = combo.itemData(i)
+                combo.setItemText(i, f"{value} ({popcount(base & index.bitmap(dimension, value))})")
+
+    def apply_filters(self):
+        """Show the transactions matching the search box and filter bar."""
+        query = self.search_input.text().strip()
+        filters = self.read_filters()
+        if query == self.search_query and filters == self.filters:
+            return
+        self.search_query = query
+        self.filters = filters
+        self.current_page = 1
+        self.update_visible_transactions()
+        self.display_transactions_for_current_month()
+        logger.debug(f"Search '{query}' with filters {filters} matched {len(self.visible_transactions)} "
+                     f"transaction(s).")
+
+    def clear_filters(self):
+        """Reset the search box and the filter bar."""
+        for widget in (self.search_input, self.type_filter, self.category_filter,
+                       self.min_amount_input, self.max_amount_input):
+            widget.blockSignals(True)
+        self.search_input.clear()
+        self.type_filter.setCurrentIndex(0)
+        self.category_filter.setCurrentIndex(0)
+        self.min_amount_input.clear()
+        self.max_amount_input.clear()
+        for widget in (self.search_input, self.type_filter, self.category_filter,
+                       self.min_amount_input, self.max_amount_input):
+            widget.blockSignals(False)
+        self.filter_timer.stop()
+        self.apply_filters()
+
+    def update_summary(self):
+        """Show income and expense totals of the displayed transactions."""
+        if self.search_query or self.filters:
+            income = sum(float(t["amount"]) for t in self.visible_transactions if t["transactionType"] == "Income")
+            expense = sum(float(t["amount"]) for t in self.visible_transactions if t["transactionType"] != "Income")
+            self.summary_label.setText(f"Income: ${income:,.2f}   Expenses: ${expense:,.2f}   "
+                                       f"({len(self.visible_transactions)} matching)")
+            return
+        totals = self.store.month_totals(None if self.current_month == "All" else self.current_month)
+        self.summary_label.setText(f"Income: ${totals['income']:,.2f}   Expenses: ${totals['expense']:,.2f}")
 
-        transactions = self.grouped_transactions.get(self.current_month, [])
+    def display_transactions_for_current_month(self):
+        """Display the filtered transactions with pagination."""
+        transactions = self.visible_transactions
 
         start_idx = (self.current_page - 1) * self.transactions_per_page
         end_idx = start_idx + self.transactions_per_page
         page_transactions = transactions[start_idx:end_idx]
 
         self.populate_transaction_list(page_transactions)
+        if self.current_month == "All" and self.store.trimmed and len(page_transactions) < self.transactions_per_page:
+            hint = QListWidgetItem("Older months are loaded when picked in the month filter.")
+            hint.setFlags(Qt.NoItemFlags)
+            self.transaction_list.addItem(hint)
 
         self.prev_button.setEnabled(self.current_page > 1)
         self.next_button.setEnabled(len(page_transactions) == self.transactions_per_page)
         self.page_label.setText(f"{self.current_page}")
+        self.update_summary()
 
         logger.debug(f"Displaying page {self.current_page} with {len(page_transactions)} transactions.")
 
     def populate_transaction_list(self, transactions):
         """Populate the transaction list widget with styled data."""
+        # Selection changes caused by re-rendering must not alter the selected ids
+        self.transaction_list.blockSignals(True)
         self.transaction_list.clear()
 
         for transaction in transactions:
@@ -434,12 +830,20 @@ class ContentView(QWidget):
             item_widget.setFixedHeight(50)
             list_item.setSizeHint(item_widget.sizeHint())
 
+            if transaction.get("pending"):
+                # Not confirmed by the server yet
+                opacity = QGraphicsOpacityEffect(item_widget)
+                opacity.setOpacity(0.5)
+                item_widget.setGraphicsEffect(opacity)
+
             list_item.setData(Qt.UserRole, transaction)
             self.transaction_list.addItem(list_item)
             self.transaction_list.setItemWidget(list_item, item_widget)
+            if transaction.get("id") in self.selected_ids:
+                list_item.setSelected(True)
 
+        self.transaction_list.blockSignals(False)
         logger.debug(f"Populated transaction list with {len(transactions)} transactions.")
-        self.transaction_list.itemClicked.connect(self.display_transaction_details)
 
     def prev_page(self):
         """Navigate to the previous page of transactions."""
@@ -458,21 +862,178 @@ class ContentView(QWidget):
         """Update the displayed transactions based on the selected month and year."""
         self.current_month = month
         self.current_page = 1
+        if FETCH_TRANSACTIONS_BY_MONTH:
+            month_cache.set_active(self.user_id, None if month == "All" else month_key(month))
+            cached = self.cached_transactions(month)
+            if cached is None:
+                self.show_loading()
+                self.fetch_all_transactions()
+            elif not self.store.load(cached):
+                self.on_store_changed()
+            logger.debug(f"Month filter updated to: {self.current_month}")
+            return
+        if month in self.store.trimmed:
+            self.fetch_trimmed_month(month)
+            logger.debug(f"Month filter updated to trimmed month: {self.current_month}")
+            return
+        # Keeps "All" down to one unbroken run of months; repainted by on_store_changed
+        self.request_scope.begin("trimmed_month")
+        self.fetching_month = None
+        self.store.release_month()
+        self.update_visible_transactions()
         self.display_transactions_for_current_month()
+        self.fetch_transactions_placeholder.hide()
         logger.debug(f"Month filter updated to: {self.current_month}")
 
     def display_transaction_details(self, item):
         """Display detailed info for a selected transaction."""
         transaction = item.data(Qt.UserRole)
+        if self.select_button.isChecked() or not isinstance(transaction, dict) or transaction.get("pending"):
+            return
         logger.debug(f"Displaying details for transaction ID: {transaction.get('id')}")
         self.parent.show_transaction_details_view(transaction)
 
+    def set_select_mode(self, enabled):
+        """Switch the list between opening transactions and selecting them for deletion."""
+        self.selected_ids.clear()
+        self.transaction_list.setSelectionMode(
+            QAbstractItemView.MultiSelection if enabled else QAbstractItemView.SingleSelection
+        )
+        self.select_button.setText("Done" if enabled else "Select")
+        self.select_all_button.setVisible(enabled)
+        self.delete_selected_button.setVisible(enabled)
+        self.display_transactions_for_current_month()
+        self.update_selection_count()
+
+    def on_selection_changed(self):
+        """Track selected transactions by id, so the selection survives paging."""
+        if not self.select_button.isChecked():
+            return
+        for index in range(self.transaction_list.count()):
+            item = self.transaction_list.item(index)
+            transaction = item.data(Qt.UserRole)
+            if not isinstance(transaction, dict) or transaction.get("pending"):
+                continue
+            if item.isSelected():
+                self.selected_ids.add(transaction["id"])
+            else:
+                self.selected_ids.discard(transaction["id"])
+        self.update_selection_count()
+
+    def select_all(self):
+        """Select every confirmed transaction matching the month filter and search."""
+        self.selected_ids = {txn["id"] for txn in self.visible_transactions if not txn.get("pending")}
+        self.display_transactions_for_current_month()
+        self.update_selection_count()
+
+    def update_selection_count(self):
+        """Show the number of selected transactions on the delete button."""
+        self.delete_selected_button.setText(f"Delete ({len(self.selected_ids)})")
+        self.delete_selected_button.setEnabled(bool(self.selected_ids))
+
+    def delete_selected(self):
+        """Delete the selected transactions concurrently, with a progress dialog."""
+        ids = sorted(self.selected_ids)
+        answer = QMessageBox.question(
+            self, "Delete Confirmation", f"Are you sure you want to delete {len(ids)} transaction(s)?"
+        )
+        if answer != QMessageBox.Yes:
+            return
+
+        token = self.request_scope.begin("bulk_delete")
+        self.bulk_delete_dialog = QProgressDialog("Deleting transactions...", "Cancel", 0, len(ids), self)
+        self.bulk_delete_dialog.setWindowTitle("Delete Transactions")
+        self.bulk_delete_dialog.setWindowModality(Qt.WindowModal)
+        self.bulk_delete_dialog.setMinimumDuration(0)
+        self.bulk_delete_dialog.canceled.connect(token.cancel)
+        self.bulk_delete_dialog.setValue(0)
+        # The token only stops deletes that have not started; finished ones are always applied
+        get_executor().submit(
+            "bulk_delete",
+            functools.partial(delete_transactions, on_progress=self.bulk_delete_progress.emit,
+                              cancelled=lambda: token.cancelled),
+            ids, self.jwt_token, self.parent.subscription_key,
+            priority=TaskPriority.NORMAL, key="bulk_delete",
+            on_result=lambda result: self.on_bulk_delete_finished(*result),
+            on_error=lambda error: self.on_bulk_delete_finished([], {i: str(error) for i in ids}),
+        )
+
+    def on_bulk_delete_progress(self, done, total):
+        """Advance the progress dialog of a running bulk delete."""
+        if self.bulk_delete_dialog is not None:
+            self.bulk_delete_dialog.setLabelText(f"Deleted {done} of {total} transaction(s)...")
+            self.bulk_delete_dialog.setValue(done)
+
+    def on_bulk_delete_finished(self, deleted, failures):
+        """Apply all successful deletes in one repaint and report the failures."""
+        if self.bulk_delete_dialog is not None:
+            self.bulk_delete_dialog.close()
+            self.bulk_delete_dialog = None
+        removed = self.store.remove_many(deleted)
+        for txn in removed:
+            get_event_bus().publish(ChangeEvent("transactions", "deleted", txn["id"], month_of(txn["date"]), local=True))
+        self.select_button.setChecked(False)
+        if failures:
+            details = "\n".join(f"#{tid}: {message}" for tid, message in list(failures.items())[:10])
+            more = f"\n... and {len(failures) - 10} more" if len(failures) > 10 else ""
+            QMessageBox.warning(
+                self, "Delete Transactions",
+                f"Deleted {len(deleted)} transaction(s); {len(failures)} could not be deleted:\n{details}{more}",
+            )
+
+    def export_transactions(self):
+        """Write the full transaction history to a CSV, JSON or JSON Lines file on a worker thread."""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Transactions", "transactions.csv", "CSV (*.csv);;JSON (*.json);;JSON Lines (*.jsonl)"
+        )
+        if not path:
+            return
+
+        token = self.request_scope.begin("export")
+        self.export_dialog = QProgressDialog("Exporting transactions...", "Cancel", 0, 0, self)
+        self.export_dialog.setWindowTitle("Export Transactions")
+        self.export_dialog.setWindowModality(Qt.WindowModal)
+        self.export_dialog.setMinimumDuration(0)
+        self.export_dialog.canceled.connect(token.cancel)
+        self.export_dialog.setValue(0)
+        get_executor().submit(
+            "export_transactions",
+            functools.partial(export_transactions, on_progress=self.export_progress.emit,
+                              cancelled=lambda: token.cancelled),
+            path, self.user_id, self.jwt_token, self.parent.subscription_key,
+            priority=TaskPriority.BACKGROUND, key="export_transactions",
+            on_result=lambda result: self.on_export_finished(token, path, *result),
+            on_error=lambda error: self.on_export_finished(token, path, False, f"Export failed: {error}"),
+        )
+
+    def on_export_progress(self, written, total):
+        """Advance the export progress dialog; without a known total it stays a busy indicator."""
+        if self.export_dialog is not None:
+            self.export_dialog.setMaximum(total)
+            self.export_dialog.setLabelText(f"Exported {written} transaction(s)...")
+            self.export_dialog.setValue(min(written, total))
+
+    def on_export_finished(self, token, path, success, result):
+        """Close the progress dialog and report the outcome of an export."""
+        cancelled = token.cancelled
+        if self.export_dialog is not None:
+            self.export_dialog.close()
+            self.export_dialog = None
+        if success:
+            QMessageBox.information(self, "Export Transactions",
+                                    f"Exported {result} transaction(s) to {os.path.basename(path)}.")
+        elif not cancelled:
+            QMessageBox.warning(self, "Export Transactions", result)
+
     def logout(self):
         """Handle logout functionality."""
         logger.info("User is logging out.")
-        self.parent.jwt_token = None
+        self.request_scope.cancel_all()
+        self.fetching_month = None
+        self.clear_filters()
+        self._reset_view_state()
         self.parent.user_id = None
-        self.parent.show_main_page()
+        self.parent.logout_user()
 
     def show_user_profile(self):
         """Navigate to the user profile view."""
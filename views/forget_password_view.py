@@ -1,50 +1,15 @@
 import logging
-import requests
-from PySide6.QtCore import Qt, QThread, Signal, QSize
+from PySide6.QtCore import Qt, QSize
 from PySide6.QtGui import QMovie, QIcon
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QHBoxLayout, QDialog, QMessageBox
-from appconfig import USER_BASE_API_URL, USER_SERVICE_SUBSCRIPTION_KEY
+from services.user_service import request_password_reset
+from utils.task_executor import get_executor, TaskPriority
 import os
 
 
 logger = logging.getLogger(__name__)
 
 
-class PasswordResetThread(QThread):
-    """Thread for handling the password reset API call."""
-    reset_result = Signal(bool, str)
-
-    def __init__(self, username, email):
-        super().__init__()
-        self.username = username
-        self.email = email
-
-    def run(self):
-        """Send username and email to the password reset API."""
-        api_url = f"{USER_BASE_API_URL}/Users/request-password-reset"
-        headers = {
-            "Content-Type": "application/json",
-            "Ocp-Apim-Subscription-Key": USER_SERVICE_SUBSCRIPTION_KEY
-        }
-        payload = {
-            "username": self.username,
-            "email": self.email
-        }
-
-        logger.debug(f"Sending password reset request to {api_url} with payload: {payload}")
-        try:
-            response = requests.post(api_url, headers=headers, json=payload)
-            if response.status_code == 200:
-                logger.info("Password reset request successful.")
-                self.reset_result.emit(True, "Password reset request successful. Please check your email.")
-            else:
-                logger.warning(f"Password reset request failed with status code {response.status_code}: {response.text}")
-                self.reset_result.emit(False, f"Error: {response.text}")
-        except requests.exceptions.RequestException as e:
-            logger.error(f"An error occurred during password reset request: {e}")
-            self.reset_result.emit(False, f"Error: {e}")
-
-
 class ForgotPasswordView(QWidget):
     """View for handling password reset functionality."""
     def __init__(self, parent):
@@ -120,9 +85,12 @@ class ForgotPasswordView(QWidget):
 
         self.show_loading_animation_on_button()
 
-        self.reset_thread = PasswordResetThread(username, email)
-        self.reset_thread.reset_result.connect(self.on_reset_result)
-        self.reset_thread.start()
+        get_executor().submit(
+            "password_reset", request_password_reset, username, email,
+            priority=TaskPriority.INTERACTIVE, key="password_reset",
+            on_result=lambda result: self.on_reset_result(*result),
+            on_error=lambda error: self.on_reset_result(False, f"Error: {error}"),
+        )
 
     def on_reset_result(self, success, message):
         """Handle the result of the password reset API call."""
@@ -0,0 +1,251 @@
+import functools
+import logging
+import os
+
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QPushButton, QComboBox, QCheckBox,
+    QFileDialog, QProgressBar, QMessageBox
+)
+
+from services.import_service import import_statement, resume_count
+from services.transaction_service import LIST_HAS_DESCRIPTIONS
+from utils.event_bus import get_event_bus, ChangeEvent
+from utils.statement_parser import TRANSACTION_FIELDS, csv_headers, guess_mapping, is_ofx
+from utils.task_executor import get_executor, RequestScope, TaskPriority
+
+logger = logging.getLogger(__name__)
+
+NOT_MAPPED = "(not in file)"
+FIELD_LABELS = {
+    "transactionType": "Type:",
+    "amount": "Amount:",
+    "date": "Date:",
+    "category": "Category:",
+    "description": "Description:",
+}
+
+
+class ImportTransactionsView(QWidget):
+    """Import a CSV or OFX bank statement as transactions."""
+
+    import_progress = Signal(int, int)  # rows done, total rows; emitted from the import thread
+
+    def __init__(self, parent):
+        super().__init__()
+        self.parent = parent
+        self.file_path = None
+        self.importing = False
+        self.request_scope = RequestScope("ImportTransactionsView")
+        self.import_progress.connect(self.on_import_progress)
+
+        self.layout = QVBoxLayout(self)
+        self.layout.setSpacing(10)
+        self.layout.setContentsMargins(20, 20, 20, 20)
+
+        self.title_label = QLabel("Import Transactions")
+        self.title_label.setAlignment(Qt.AlignCenter)
+        self.title_label.setStyleSheet("""
+            QLabel {
+                font-size: 20px;
+                font-family: 'Comic Sans MS', sans-serif;
+                font-weight: 600;
+                color: #222;
+                margin-bottom: 10px;
+            }
+        """)
+        self.layout.addWidget(self.title_label)
+
+        # File selection
+        file_layout = QHBoxLayout()
+        self.file_label = QLabel("No file selected.")
+        self.file_label.setStyleSheet("font-size: 14px;")
+        file_layout.addWidget(self.file_label, stretch=1)
+        self.choose_button = QPushButton("Choose File...")
+        self.choose_button.setStyleSheet("padding: 5px; font-size: 14px;")
+        self.choose_button.clicked.connect(self.choose_file)
+        file_layout.addWidget(self.choose_button)
+        self.layout.addLayout(file_layout)
+
+        # Column mapping, shown for CSV files
+        self.mapping_widget = QWidget()
+        mapping_layout = QFormLayout(self.mapping_widget)
+        self.column_comboboxes = {}
+        for field in TRANSACTION_FIELDS:
+            combobox = QComboBox()
+            combobox.setStyleSheet("padding: 5px; font-size: 14px;")
+            self.column_comboboxes[field] = combobox
+            mapping_layout.addRow(FIELD_LABELS[field], combobox)
+        self.mapping_hint = QLabel("Without a type column, negative amounts are imported as expenses.")
+        self.mapping_hint.setStyleSheet("font-size: 12px; color: #666;")
+        mapping_layout.addRow(self.mapping_hint)
+        self.mapping_widget.setVisible(False)
+        self.layout.addWidget(self.mapping_widget)
+
+        self.skip_duplicates_checkbox = QCheckBox("Skip rows that match existing transactions")
+        self.skip_duplicates_checkbox.setChecked(LIST_HAS_DESCRIPTIONS)
+        if not LIST_HAS_DESCRIPTIONS:
+            # Existing rows have no descriptions to compare, so rows would be skipped wrongly
+            self.skip_duplicates_checkbox.setEnabled(False)
+            self.skip_duplicates_checkbox.setToolTip("Unavailable with the lean transaction list.")
+        self.skip_duplicates_checkbox.setStyleSheet("font-size: 14px;")
+        self.layout.addWidget(self.skip_duplicates_checkbox)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        self.layout.addWidget(self.progress_bar)
+
+        self.status_label = QLabel("")
+        self.status_label.setWordWrap(True)
+        self.status_label.setStyleSheet("font-size: 14px; color: #555;")
+        self.layout.addWidget(self.status_label)
+        self.layout.addStretch()
+
+        # Buttons
+        self.buttons_layout = QHBoxLayout()
+
+        self.import_button = QPushButton("Import")
+        self.import_button.setStyleSheet("""
+            QPushButton {
+                padding: 5px;
+                font-size: 14px;
+                background-color: green;
+                color: white;
+                border-radius: 4px;
+            }
+            QPushButton:hover {
+                background-color: #28a745;
+            }
+        """)
+        self.import_button.setDisabled(True)
+        self.import_button.clicked.connect(self.start_import)
+        self.buttons_layout.addWidget(self.import_button)
+
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setStyleSheet("""
+            QPushButton {
+                padding: 5px;
+                font-size: 14px;
+                background-color: red;
+                color: white;
+                border-radius: 4px;
+            }
+            QPushButton:hover {
+                background-color: #dc3545;
+            }
+        """)
+        self.cancel_button.clicked.connect(self.cancel)
+        self.buttons_layout.addWidget(self.cancel_button)
+
+        self.layout.addLayout(self.buttons_layout)
+
+    def choose_file(self):
+        """Pick a statement file and prepare its column mapping."""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Statement", "", "Bank statements (*.csv *.ofx *.qfx);;All files (*)"
+        )
+        if path:
+            self.load_file(path)
+
+    def load_file(self, path):
+        """Show the mapping for a statement and whether an earlier import of it can be resumed."""
+        try:
+            headers = [] if is_ofx(path) else csv_headers(path)
+            already_sent = resume_count(path, self.parent.user_id)
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f"Could not read statement {path}: {e}")
+            QMessageBox.warning(self, "Import Error", f"Could not read the file: {e}")
+            return
+        self.file_path = path
+        self.file_label.setText(os.path.basename(path))
+        self.mapping_widget.setVisible(not is_ofx(path))
+        mapping = guess_mapping(headers)
+        for field, combobox in self.column_comboboxes.items():
+            combobox.clear()
+            combobox.addItems([NOT_MAPPED] + headers)
+            combobox.setCurrentText(mapping.get(field, NOT_MAPPED))
+        self.progress_bar.setVisible(False)
+        self.status_label.setText(
+            f"{already_sent} row(s) were imported before; the import will resume after them." if already_sent else ""
+        )
+        self.import_button.setText("Resume Import" if already_sent else "Import")
+        self.import_button.setDisabled(False)
+
+    def column_mapping(self):
+        """Transaction field -> CSV column chosen by the user."""
+        return {field: combobox.currentText() for field, combobox in self.column_comboboxes.items()
+                if combobox.currentText() != NOT_MAPPED}
+
+    def start_import(self):
+        """Upload the statement on the executor; progress is reported through import_progress."""
+        mapping = self.column_mapping()
+        if not is_ofx(self.file_path) and not {"amount", "date"} <= mapping.keys():
+            QMessageBox.warning(self, "Input Error", "Please choose the amount and date columns.")
+            return
+
+        # Checked on the import thread against the dashboard's index, without copying it
+        duplicates = self.parent.transaction_store.duplicates
+        is_duplicate = duplicates.contains if self.skip_duplicates_checkbox.isChecked() else None
+
+        token = self.request_scope.begin("import")
+        self.importing = True
+        self.import_button.setDisabled(True)
+        self.choose_button.setDisabled(True)
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(True)
+        self.status_label.setText("Importing...")
+        get_executor().submit(
+            "import_statement",
+            functools.partial(import_statement, is_duplicate=is_duplicate, on_progress=self.import_progress.emit,
+                              cancelled=lambda: token.cancelled),
+            self.file_path, mapping, self.parent.user_id, self.parent.jwt_token, self.parent.subscription_key,
+            priority=TaskPriority.BACKGROUND, key="import_statement",
+            on_result=self.on_import_finished,
+            on_error=self.on_import_error,
+        )
+
+    def on_import_progress(self, done, total):
+        """Advance the progress bar after each uploaded batch."""
+        self.progress_bar.setRange(0, max(total, 1))
+        self.progress_bar.setValue(done)
+        self.status_label.setText(f"Imported {done} of {total} row(s)...")
+
+    def on_import_finished(self, summary):
+        """Report the outcome and refresh the dashboard once."""
+        self.importing = False
+        self.choose_button.setDisabled(False)
+        if summary["imported"]:
+            get_event_bus().publish(ChangeEvent("transactions", "imported"))
+        lines = [f"Imported {summary['imported']} transaction(s)."]
+        if summary["skipped"]:
+            lines.append(f"{summary['skipped']} row(s) had been imported before.")
+        if summary["duplicates"]:
+            lines.append(f"{summary['duplicates']} row(s) matched existing transactions and were skipped.")
+        if summary["failed"]:
+            failed = sorted(summary["failed"].items())
+            details = "\n".join(f"Row {row}: {message}" for row, message in failed[:10])
+            more = f"\n... and {len(failed) - 10} more" if len(failed) > 10 else ""
+            lines.append(f"{len(failed)} row(s) could not be imported:\n{details}{more}")
+        if summary["pending"]:
+            lines.append(f"{summary['pending']} row(s) were not sent; import the file again to resume.")
+            self.import_button.setText("Resume Import")
+            self.import_button.setDisabled(False)
+        self.status_label.setText("\n".join(lines))
+        logger.info(f"Statement import finished: {summary['imported']} imported, {summary['pending']} pending.")
+
+    def on_import_error(self, error):
+        """Handle an unexpected failure of the import task; the checkpoint allows a resume."""
+        self.importing = False
+        self.choose_button.setDisabled(False)
+        self.import_button.setText("Resume Import")
+        self.import_button.setDisabled(False)
+        self.status_label.setText(f"Import failed: {error}")
+
+    def cancel(self):
+        """Stop a running import (it can be resumed later) or go back to the dashboard."""
+        if self.importing:
+            logger.info("Cancelling statement import after the batches in flight.")
+            self.request_scope.cancel_all()
+            self.status_label.setText("Stopping after the batches in flight...")
+            return
+        self.parent.show_content_view()
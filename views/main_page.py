@@ -2,10 +2,12 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLineEdit, QPushButton, QHBoxLayout, QCheckBox, QFormLayout
 )
 from services.auth_service import login_user
-from PySide6.QtCore import Qt, QThread, Signal
+from utils.task_executor import get_executor, TaskPriority
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QLabel
 from PySide6.QtGui import QMovie, QPixmap
 import os
+import json
 import jwt
 import logging
 
@@ -13,31 +15,23 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class LoginThread(QThread):
-    login_result = Signal(bool, dict, str)  # Signal to send (success, message, token)
-
-    def __init__(self, username, password):
-        super().__init__()
-        self.username = username
-        self.password = password
-
-    def run(self):
-        """Run the API call in a separate thread."""
-        logger.debug("LoginThread: Starting API call...")
-        success, response_data, token = login_user(self.username, self.password)
-        logger.debug(
-            f"LoginThread: API call result - success: {success}, response_data: {response_data}, token: {token}"
-        )
-        # Ensure response_data is parsed as a dictionary
-        if isinstance(response_data, str):
-            try:
-                import json
-
-                response_data = json.loads(response_data)
-            except json.JSONDecodeError:
-                response_data = {"message": response_data}  # Fallback for non-JSON responses
+def perform_login(username, password):
+    """Run the login API call; executed on a worker thread."""
+    logger.debug("Login task: Starting API call...")
+    success, response_data, token = login_user(username, password)
+    logger.debug(
+        f"Login task: API call result - success: {success}, response_data: {response_data}, token: {token}"
+    )
+    # Ensure response_data is parsed as a dictionary
+    if isinstance(response_data, str):
+        try:
+            response_data = json.loads(response_data)
+        except json.JSONDecodeError:
+            response_data = {"message": response_data}  # Fallback for non-JSON responses
+        if not isinstance(response_data, dict):
+            response_data = {"message": str(response_data)}
 
-        self.login_result.emit(success, response_data, token)
+    return success, response_data, token or ""
 
 
 class MainPage(QWidget):
@@ -173,10 +167,13 @@ class MainPage(QWidget):
         # Show spinner on the Login button
         self.show_loading_animation_on_button()
 
-        # Start the login thread
-        self.login_thread = LoginThread(username, password)
-        self.login_thread.login_result.connect(self.on_login_result)  # Connect the result signal
-        self.login_thread.start()
+        # Run the login call on the shared executor; a second submit while it runs is ignored
+        get_executor().submit(
+            "login", perform_login, username, password,
+            priority=TaskPriority.INTERACTIVE, key="login",
+            on_result=lambda result: self.on_login_result(*result),
+            on_error=self.on_login_error,
+        )
 
     def on_login_result(self, success, response_data, token):
         """Handle the result of the login API call."""
@@ -195,6 +192,11 @@ class MainPage(QWidget):
             error_message = response_data.get("message", "Invalid Username or password")
             self.feedback_label.setText(error_message)
 
+    def on_login_error(self, error):
+        """Handle an unexpected failure of the login task."""
+        self.hide_loading_animation_on_button()
+        self.feedback_label.setText(f"Error: {error}")
+
     def get_user_details_from_token(self, token):
         """Decode JWT token to extract user details."""
         try:
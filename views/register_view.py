@@ -1,29 +1,18 @@
 import re
 import os
 import logging
-from PySide6.QtCore import Qt, QThread, Signal, QSize
+from PySide6.QtCore import Qt, QSize
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton,
     QHBoxLayout, QScrollArea
 )
 from PySide6.QtGui import QMovie, QIcon
 from services.user_service import register_user
+from utils.task_executor import get_executor, TaskPriority
 
 logger = logging.getLogger(__name__)
 
 
-class RegisterThread(QThread):
-    """Thread for handling the registration API call."""
-    register_result = Signal(bool, str)
-
-    def __init__(self, data):
-        super().__init__()
-        self.data = data
-
-    def run(self):
-        success, message = register_user(self.data)
-        self.register_result.emit(success, message)
-
 class RegisterView(QWidget):
     """View for user registration."""
     def __init__(self, parent):
@@ -232,9 +221,12 @@ class RegisterView(QWidget):
 
         # Show loading spinner and start the registration thread
         self.show_loading_animation_on_button()
-        self.register_thread = RegisterThread(data)
-        self.register_thread.register_result.connect(self.on_register_result)
-        self.register_thread.start()
+        get_executor().submit(
+            "register", register_user, data,
+            priority=TaskPriority.INTERACTIVE, key="register",
+            on_result=lambda result: self.on_register_result(*result),
+            on_error=lambda error: self.on_register_result(False, f"Error: {error}"),
+        )
 
     def on_register_result(self, success, message):
         """Process the result of the registration attempt."""
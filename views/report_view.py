@@ -1,13 +1,17 @@
 import logging
-import requests
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout,
-                               QDialog, QDialogButtonBox, QFormLayout, QComboBox, QTextEdit)
+                               QDialog, QDialogButtonBox, QFormLayout, QComboBox, QTextEdit,
+                               QFileDialog, QMessageBox)
 from PySide6.QtCore import Qt, QDate, QSize
 from PySide6.QtCharts import QChart, QChartView, QLegend, QBarCategoryAxis, QBarSeries, QBarSet, QValueAxis
 from PySide6.QtGui import QPainter, QColor, QFont, QIcon
 import calendar
+import os
 
-import appconfig
+from services.report_service import fetch_monthly_summary, fetch_custom_range_report
+from utils.cache_utils import data_cache
+from utils.export_utils import export_report
+from utils.task_executor import get_executor, RequestScope, TaskPriority
 
 logger = logging.getLogger(__name__)
 
@@ -74,11 +78,18 @@ class ReportView(QWidget):
         """)
         buttons_layout.addWidget(self.custom_report_button, alignment=Qt.AlignCenter)
 
+        self.export_button = QPushButton("Export...")
+        self.export_button.clicked.connect(self.export_report)
+        self.export_button.setStyleSheet("padding: 6px 16px; font-size: 14px;")
+        self.export_button.setVisible(False)
+        buttons_layout.addWidget(self.export_button, alignment=Qt.AlignCenter)
+
         self.layout.addLayout(buttons_layout)
         self.layout.addStretch()
 
         self.chart_selector = QComboBox()
         self.chart_selector.setVisible(False)
+        self.chart_selector.currentIndexChanged.connect(self.switch_chart)
         self.layout.addWidget(self.chart_selector)
 
         self.chart_view = QChartView()
@@ -99,12 +110,22 @@ class ReportView(QWidget):
         self.monthly_diff_label.setVisible(False)
         self.layout.addWidget(self.monthly_diff_label)
 
+        self.loading_label = QLabel("Loading report...")
+        self.loading_label.setAlignment(Qt.AlignCenter)
+        self.loading_label.setStyleSheet("font-size: 14px; color: #888;")
+        self.loading_label.setVisible(False)
+        self.layout.addWidget(self.loading_label)
+
+        self.request_scope = RequestScope("ReportView")
+
         self.category_chart = None
         self.type_chart = None
         self.monthly_chart = None
         self.income_chart = None
         self.expense_chart = None
         self.all_categories_text = None
+        self.export_rows = []  # rows of the displayed report, as written by export_report
+        self.export_fields = ()
 
     def add_back_button(self, main_layout):
         """Add a back button to return to the content view."""
@@ -144,54 +165,74 @@ class ReportView(QWidget):
             self.fetch_custom_report(start_date, end_date)
 
     def fetch_monthly_report(self, year, month):
-        """Fetch and display the monthly report data."""
-        api_url = appconfig.REPORT_MONTHLY_SUMMARY_URL
-
-        headers = {
-            "Authorization": f"Bearer {self.parent.jwt_token}",
-            "Ocp-Apim-Subscription-Key": self.parent.subscription_key
-        }
-        params = {
-            "userId": self.parent.user_id,
-            "year": year,
-            "month": month
-        }
-
-        logger.debug(f"Fetching monthly report for user_id={self.parent.user_id}, year={year}, month={month}")
-        try:
-            response = requests.get(api_url, headers=headers, params=params)
-            if response.status_code == 200:
-                report_data = response.json()
-                self.display_report_data(report_data, report_type="monthly")
-            else:
-                self.show_error(f"Error fetching monthly report: {response.status_code}\n{response.text}")
-        except Exception as e:
-            self.show_error(f"Error: {str(e)}")
+        """Fetch and display the monthly report data, using the warm-up cache when available."""
+        cache_key = ("monthly_summary", self.parent.user_id, year, month)
+        report_data = data_cache.get(cache_key)
+        if report_data is not None:
+            logger.debug(f"Using cached monthly report for year={year}, month={month}")
+            self.request_scope.begin("report")  # A cached answer supersedes any slower request
+            self.display_report_data(report_data, report_type="monthly")
+            return
+
+        token = self.request_scope.begin("report")
+        self.show_loading()
+        get_executor().submit(
+            "monthly_report", fetch_monthly_summary,
+            self.parent.user_id, self.parent.jwt_token, self.parent.subscription_key, year, month,
+            priority=TaskPriority.INTERACTIVE, token=token,
+            on_result=lambda result: self.on_report_result(token, result, "monthly", cache_key),
+            on_error=lambda error: self.on_report_result(token, (False, f"Error: {error}"), "monthly"),
+        )
 
     def fetch_custom_report(self, start_date, end_date):
         """Fetch and display the custom date range report data."""
-        api_url = appconfig.REPORT_CUSTOM_RANGE_URL
-
-        headers = {
-            "Authorization": f"Bearer {self.parent.jwt_token}",
-            "Ocp-Apim-Subscription-Key": self.parent.subscription_key
-        }
-        params = {
-            "userId": self.parent.user_id,
-            "startDate": start_date.toString("yyyy-MM-dd"),
-            "endDate": end_date.toString("yyyy-MM-dd")
-        }
-
-        logger.debug(f"Fetching custom report from {start_date.toString('yyyy-MM-dd')} to {end_date.toString('yyyy-MM-dd')}")
-        try:
-            response = requests.get(api_url, headers=headers, params=params)
-            if response.status_code == 200:
-                report_data = response.json()
-                self.display_report_data(report_data, report_type="custom")
-            else:
-                self.show_error(f"Error fetching custom report: {response.status_code}\n{response.text}")
-        except Exception as e:
-            self.show_error(f"Error: {str(e)}")
+        token = self.request_scope.begin("report")
+        self.show_loading()
+        get_executor().submit(
+            "custom_report", fetch_custom_range_report,
+            self.parent.user_id, self.parent.jwt_token, self.parent.subscription_key,
+            start_date.toString("yyyy-MM-dd"), end_date.toString("yyyy-MM-dd"),
+            priority=TaskPriority.INTERACTIVE, token=token,
+            on_result=lambda result: self.on_report_result(token, result, "custom"),
+            on_error=lambda error: self.on_report_result(token, (False, f"Error: {error}"), "custom"),
+        )
+
+    def on_transactions_changed(self, events):
+        """Drop cached monthly summaries of the months touched by a batch of changes."""
+        months = {event.month for event in events}
+        if None in months:
+            data_cache.invalidate("monthly_summary")
+            return
+        for month in months:
+            year, month_number = (int(part) for part in month.split("-"))
+            data_cache.delete(("monthly_summary", self.parent.user_id, year, month_number))
+        logger.debug(f"Invalidated cached monthly summaries for {sorted(months)}.")
+
+    def on_report_result(self, token, result, report_type, cache_key=None):
+        """Render a finished report request unless a newer request superseded it."""
+        if not self.request_scope.is_current(token, "report"):
+            logger.debug(f"Discarding stale {report_type} report response.")
+            return
+        self.loading_label.setVisible(False)
+        success, data = result
+        if success:
+            if cache_key is not None:
+                data_cache.set(cache_key, data)
+            self.display_report_data(data, report_type=report_type)
+        else:
+            self.show_error(data)
+
+    def show_loading(self):
+        """Hide the previous report and show a loading hint."""
+        self.clear_charts()
+        self.monthly_diff_label.setVisible(False)
+        self.loading_label.setVisible(True)
+
+    def hideEvent(self, event):
+        """Cancel in-flight report requests when the user navigates away."""
+        self.request_scope.cancel_all()
+        self.loading_label.setVisible(False)
+        super().hideEvent(event)
 
     def show_error(self, message):
         """Display an error message to the user."""
@@ -210,7 +251,8 @@ class ReportView(QWidget):
             if item is not None:
                 w = item.widget()
                 if w and w not in [self.title_label, self.monthly_report_button, self.custom_report_button,
-                                   self.chart_selector, self.chart_view, self.text_report, self.monthly_diff_label]:
+                                   self.chart_selector, self.chart_view, self.text_report, self.monthly_diff_label,
+                                   self.loading_label]:
                     w.setParent(None)
 
         self.layout.addWidget(error_label)
@@ -276,6 +318,11 @@ class ReportView(QWidget):
             self.chart_selector.setVisible(False)
             self.text_report.setVisible(False)
 
+            self.export_fields = ("transactionType", "totalAmount")
+            self.export_rows = [{"transactionType": "Income", "totalAmount": income_total},
+                                {"transactionType": "Expense", "totalAmount": expense_total}]
+            self.export_button.setVisible(True)
+
         elif report_type == "custom":
             self.monthly_diff_label.setVisible(False)
 
@@ -318,11 +365,42 @@ class ReportView(QWidget):
             self.chart_selector.addItem("Expense")
             self.chart_selector.addItem("All Categories")
             self.chart_selector.setVisible(True)
-            self.chart_selector.currentIndexChanged.connect(self.switch_chart)
             self.chart_selector.setCurrentIndex(0)
 
             self.text_report.setVisible(False)
 
+            self.export_fields = ("transactionType", "category", "totalAmount")
+            self.export_rows = (
+                [{"transactionType": "Income", "category": cat, "totalAmount": amt}
+                 for cat, amt in income_categories.items()]
+                + [{"transactionType": "Expense", "category": cat, "totalAmount": amt}
+                   for cat, amt in expense_categories.items()]
+            )
+            self.export_button.setVisible(True)
+
+    def export_report(self):
+        """Write the displayed report to a CSV, JSON or JSON Lines file on a worker thread."""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Report", "report.csv", "CSV (*.csv);;JSON (*.json);;JSON Lines (*.jsonl)"
+        )
+        if not path:
+            return
+        self.export_button.setDisabled(True)
+        get_executor().submit(
+            "export_report", export_report, path, iter(self.export_rows), self.export_fields,
+            priority=TaskPriority.BACKGROUND, key="export_report",
+            on_result=lambda result: self.on_export_finished(path, *result),
+            on_error=lambda error: self.on_export_finished(path, False, f"Export failed: {error}"),
+        )
+
+    def on_export_finished(self, path, success, result):
+        """Report the outcome of a report export."""
+        self.export_button.setDisabled(False)
+        if success:
+            QMessageBox.information(self, "Export Report", f"Exported {result} row(s) to {os.path.basename(path)}.")
+        else:
+            QMessageBox.warning(self, "Export Report", result)
+
     def top_n_dict(self, orig_dict, n):
         """Return the top n items from a dictionary based on values."""
         return dict(list(orig_dict.items())[:n])
@@ -400,6 +478,8 @@ class ReportView(QWidget):
         self.income_chart = None
         self.expense_chart = None
         self.all_categories_text = None
+        self.export_rows = []
+        self.export_button.setVisible(False)
         self.text_report.setVisible(False)
         self.chart_view.setVisible(False)
         self.chart_selector.setVisible(False)
@@ -1,6 +1,7 @@
+import functools
 import re
 import logging
-import requests
+import uuid
 from PySide6.QtCore import Qt, QSize
 from PySide6.QtGui import QIcon, QFont
 from PySide6.QtWidgets import (
@@ -9,7 +10,9 @@ from PySide6.QtWidgets import (
     QSpacerItem, QSizePolicy
 )
 
-import appconfig
+from services.user_service import fetch_user_profile, update_user_profile, change_password
+from utils.cache_utils import data_cache
+from utils.task_executor import get_executor, TaskPriority
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +38,7 @@ class UserProfileView(QWidget):
         self.setup_buttons()
         self.add_divider()
         self.setup_password_section()
-        self.fetch_user_profile()
+        self.load_profile()
 
     def reset_fields_state(self):
         """Disable all editable fields except Username and reset their styles."""
@@ -180,26 +183,37 @@ class UserProfileView(QWidget):
         self.password_button_layout.addWidget(self.submit_password_button)
         self.layout.addLayout(self.password_button_layout)
 
+    def load_profile(self):
+        """Show the cached profile if the post-login warm-up already loaded it, otherwise fetch it."""
+        profile = data_cache.get(("profile", self.parent.username))
+        if profile is not None:
+            logger.debug("Using cached user profile.")
+            self.reset_fields_state()
+            self.populate_fields(profile)
+        else:
+            self.fetch_user_profile()
+
     def fetch_user_profile(self):
-        """Retrieve and display the user's profile information."""
+        """Retrieve the user's profile information in the background."""
         self.reset_fields_state()
-        api_url = appconfig.USER_PROFILE_URL
-        headers = {"Authorization": f"Bearer {self.parent.jwt_token}"}
-        params = {"username": self.parent.username}
-
-        logger.debug(f"Fetching profile for username={self.parent.username}")
-        try:
-            response = requests.get(api_url, headers=headers, params=params)
-            if response.status_code == 200:
-                profile = response.json()
-                self.populate_fields(profile)
-                logger.info("User profile fetched successfully.")
-            else:
-                logger.error(f"Failed to fetch profile: {response.status_code} - {response.text}")
-                self.show_message("Error", f"Failed to fetch profile: {response.text}", is_error=True)
-        except requests.RequestException as e:
-            logger.exception("Exception occurred while fetching profile.")
-            self.show_message("Error", str(e), is_error=True)
+        # Editing waits for the profile, so the fields are not saved half-empty
+        self.edit_button.setDisabled(True)
+        username = self.parent.username
+        get_executor().submit(
+            "fetch_profile", fetch_user_profile, username, self.parent.jwt_token,
+            priority=TaskPriority.INTERACTIVE, key="fetch_profile",
+            on_result=lambda result: self.on_profile_fetched(username, *result),
+            on_error=lambda error: self.on_profile_fetched(username, False, str(error)),
+        )
+
+    def on_profile_fetched(self, username, success, result):
+        """Display the fetched profile, or the reason it could not be loaded."""
+        self.edit_button.setDisabled(False)
+        if success:
+            data_cache.set(("profile", username), result)
+            self.populate_fields(result)
+        else:
+            self.show_message("Error", result, is_error=True)
 
     def populate_fields(self, profile):
         """Fill input fields with fetched profile data."""
@@ -224,28 +238,30 @@ class UserProfileView(QWidget):
             self.show_message("Validation Error", "Password cannot be empty.", is_error=True)
             return
 
-        payload = {"username": self.fields["Username"].text(), "newPassword": new_password}
-        api_url = appconfig.USER_PASSWORD_CHANGE_URL
-        headers = {"Authorization": f"Bearer {self.parent.jwt_token}"}
-
-        logger.debug("Submitting password change.")
-        try:
-            response = requests.post(api_url, headers=headers, json=payload)
-            if response.status_code == 200:
-                logger.info("Password changed successfully.")
-                self.show_message("Success", "Password changed successfully!")
-                self.password_input.setDisabled(True)
-                self.password_input.setStyleSheet("background-color: #f0f0f0; border-radius: 5px;")
-                self.password_input.clear()
-                self.submit_password_button.hide()
-                self.change_password_button.show()
-                self.parent.show_content_view()
-            else:
-                logger.error(f"Failed to change password: {response.status_code} - {response.text}")
-                self.show_message("Error", f"Failed to change password: {response.text}", is_error=True)
-        except requests.RequestException as e:
-            logger.exception("Exception occurred while changing password.")
-            self.show_message("Error", str(e), is_error=True)
+        # Disabled until the request finishes, so repeated clicks send one request
+        self.submit_password_button.setDisabled(True)
+        get_executor().submit(
+            "change_password",
+            functools.partial(change_password, idempotency_key=uuid.uuid4().hex),
+            self.parent.jwt_token, self.fields["Username"].text(), new_password,
+            priority=TaskPriority.INTERACTIVE, key="change_password",
+            on_result=lambda result: self.on_password_changed(*result),
+            on_error=lambda error: self.on_password_changed(False, str(error)),
+        )
+
+    def on_password_changed(self, success, message):
+        """Handle the result of a password change request."""
+        self.submit_password_button.setDisabled(False)
+        if success:
+            self.show_message("Success", message)
+            self.password_input.setDisabled(True)
+            self.password_input.setStyleSheet("background-color: #f0f0f0; border-radius: 5px;")
+            self.password_input.clear()
+            self.submit_password_button.hide()
+            self.change_password_button.show()
+            self.parent.show_content_view()
+        else:
+            self.show_message("Error", message, is_error=True)
 
     def enable_editing(self):
         """Enable editing for all fields except Username."""
@@ -287,23 +303,27 @@ class UserProfileView(QWidget):
             "dateOfBirth": dob
         }
 
-        api_url = "https://expenseuserserviceapi.azure-api.net/api/Users/update-profile"
-        headers = {"Authorization": f"Bearer {self.parent.jwt_token}"}
-
-        logger.debug("Submitting profile changes.")
-        try:
-            response = requests.put(api_url, headers=headers, json=updated_data)
-            if response.status_code == 200:
-                logger.info("Profile updated successfully.")
-                self.show_message("Success", "Profile updated successfully!")
-                self.edit_button.setDisabled(False)
-                self.parent.show_content_view()
-            else:
-                logger.error(f"Failed to update profile: {response.status_code} - {response.text}")
-                self.show_message("Error", f"Failed to update profile: {response.text}", is_error=True)
-        except requests.RequestException as e:
-            logger.exception("Exception occurred while updating profile.")
-            self.show_message("Error", str(e), is_error=True)
+        self.save_button.setDisabled(True)
+        get_executor().submit(
+            "update_profile",
+            functools.partial(update_user_profile, idempotency_key=uuid.uuid4().hex),
+            self.parent.jwt_token, updated_data,
+            priority=TaskPriority.INTERACTIVE, key="update_profile",
+            on_result=lambda result: self.on_profile_updated(updated_data, *result),
+            on_error=lambda error: self.on_profile_updated(updated_data, False, str(error)),
+        )
+
+    def on_profile_updated(self, updated_data, success, message):
+        """Handle the result of a profile update request."""
+        if success:
+            cached_profile = data_cache.get(("profile", self.parent.username)) or {}
+            data_cache.set(("profile", self.parent.username), {**cached_profile, **updated_data})
+            self.show_message("Success", message)
+            self.edit_button.setDisabled(False)
+            self.parent.show_content_view()
+        else:
+            self.save_button.setDisabled(False)
+            self.show_message("Error", message, is_error=True)
 
     @staticmethod
     def format_phone(phone):